@@ -0,0 +1,72 @@
+"""
+Import-time benchmark for `import whatts`.
+
+Runs `python -X importtime -c "import whatts"` in fresh interpreters and
+reports the cumulative import cost of whatts and its slowest dependencies.
+Fails (exit code 1) if a module that should be lazily loaded is imported, or
+if the median cost exceeds --max-ms.
+
+Usage:
+    python scripts/benchmark_import_time.py [--repeat 5] [--max-ms 1500] [--top 10]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Heavy dependencies that `import whatts` must not load
+LAZY_MODULES = ("matplotlib", "statsmodels", "MannKS")
+
+
+def import_profile():
+    """
+    Returns {module: cumulative microseconds} for one fresh `import whatts`.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import whatts"],
+        capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to run (default 5).")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the median cost exceeds this.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list.")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.repeat)]
+    totals_ms = [p["whatts"] / 1000.0 for p in profiles]
+    median_ms = statistics.median(totals_ms)
+
+    print(f"import whatts: median {median_ms:.1f} ms "
+          f"(min {min(totals_ms):.1f}, max {max(totals_ms):.1f}, n={args.repeat})")
+
+    last = profiles[-1]
+    # Packages and their direct submodules (e.g. scipy.stats)
+    shallow = {name: us for name, us in last.items() if name.count(".") <= 1 and name != "whatts"}
+    print("\nSlowest imports (last run, cumulative):")
+    for name, us in sorted(shallow.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<24} {us / 1000.0:8.1f} ms")
+
+    failures = []
+    loaded = [m for m in LAZY_MODULES if any(name == m or name.startswith(m + ".") for name in last)]
+    if loaded:
+        failures.append(f"lazily loaded modules were imported: {', '.join(loaded)}")
+    if args.max_ms is not None and median_ms > args.max_ms:
+        failures.append(f"median import time {median_ms:.1f} ms exceeds {args.max_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Benchmark of the direct and FFT implementations of `calculate_neff_sum_corr`.
+
+The direct lag loop stops at the first negative autocorrelation, so its cost
+depends on the data: white noise stops after a lag or two, while trending or
+strongly autocorrelated series run all n/2 lags (O(n^2)). The FFT path is
+O(n log n) regardless. 'auto' tries a few direct lags first and falls back to
+the FFT for long persistent series. All three are timed on both kinds of
+series across n.
+
+Usage:
+    python scripts/benchmark_neff.py [--sizes 100 1000 10000] [--max-direct 20000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from whatts.stats import calculate_neff_sum_corr, NEFF_FFT_THRESHOLD, NEFF_DIRECT_LAGS
+
+
+def make_series(kind, n, rng):
+    noise = rng.normal(size=n)
+    if kind == "white":
+        return noise
+    # Persistent positive autocorrelation: a trend plus AR(1) noise
+    ar = np.empty(n)
+    ar[0] = noise[0]
+    for i in range(1, n):
+        ar[i] = 0.9 * ar[i - 1] + noise[i]
+    return 0.01 * np.arange(n) + ar
+
+
+def best_time(func, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 300, 1000, 3000, 10000, 30000, 50000])
+    parser.add_argument("--max-direct", type=int, default=20000,
+                        help="Largest n timed with the direct loop on autocorrelated data.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"auto: FFT from n >= {NEFF_FFT_THRESHOLD} if the first {NEFF_DIRECT_LAGS} lags are positive\n")
+    print(f"{'series':<8} {'n':>7} {'direct (ms)':>12} {'fft (ms)':>10} {'auto (ms)':>10} "
+          f"{'fft speed-up':>13} {'|diff|':>10}")
+    for kind in ["white", "trend"]:
+        for n in args.sizes:
+            data = make_series(kind, n, rng)
+            fft_time, fft_neff = best_time(lambda: calculate_neff_sum_corr(data, method="fft"), args.repeat)
+            auto_time, _ = best_time(lambda: calculate_neff_sum_corr(data), args.repeat)
+            if kind == "trend" and n > args.max_direct:
+                print(f"{kind:<8} {n:>7} {'skipped':>12} {fft_time * 1e3:>10.2f} {auto_time * 1e3:>10.2f}")
+                continue
+            direct_time, direct_neff = best_time(lambda: calculate_neff_sum_corr(data, method="direct"),
+                                                 args.repeat)
+            print(f"{kind:<8} {n:>7} {direct_time * 1e3:>12.2f} {fft_time * 1e3:>10.2f} {auto_time * 1e3:>10.2f} "
+                  f"{direct_time / fft_time:>12.1f}x {abs(direct_neff - fft_neff):>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
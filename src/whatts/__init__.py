@@ -1,4 +1,20 @@
-from .core import calculate_tolerance_limit, compare_compliance_methods
-from .plotting import plot_compliance_explainer
+# matplotlib, statsmodels and MannKS are imported on first use (plotting, the
+# quantile regression path and the trend test), not when whatts is imported.
+from .core import calculate_tolerance_limit, compare_compliance_methods, compliance_curve, tolerance_limit_arrays
+from .batch import calculate_tolerance_limits_batch
+from .parquet import calculate_tolerance_limits_parquet
+from .prepared import PreparedSeries
+from .result import ToleranceResult
+from .rolling import rolling_tolerance_limits
+from .streaming import StreamingSeries
 
-__all__ = ["calculate_tolerance_limit", "compare_compliance_methods", "plot_compliance_explainer"]
+__all__ = ["calculate_tolerance_limit", "compare_compliance_methods", "compliance_curve", "tolerance_limit_arrays",
+           "calculate_tolerance_limits_batch", "calculate_tolerance_limits_parquet", "PreparedSeries",
+           "ToleranceResult", "rolling_tolerance_limits", "StreamingSeries", "plot_compliance_explainer"]
+
+
+def __getattr__(name):
+    if name == "plot_compliance_explainer":
+        from .plotting import plot_compliance_explainer
+        return plot_compliance_explainer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
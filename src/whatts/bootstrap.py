@@ -1,21 +1,54 @@
+from functools import lru_cache
+
 import numpy as np
 
-def generate_block_bootstraps(values, dates, n_boot=2000, block_size=None, seasonal_period=None):
+# Default number of seeded index matrices kept (see `block_bootstrap_indices`;
+# change it with `set_bootstrap_cache_size`). Each takes n_boot * n * itemsize
+# bytes: 1,000 replicates of 1,000 points are 4 MB as int32, so the full cache
+# stays under ~64 MB for series of that size.
+INDEX_CACHE_SIZE = 16
+
+def generate_block_bootstraps(values, dates, n_boot=2000, block_size=None, seasonal_period=None, rng=None):
     """
     Generates synthetic datasets using Moving Block Bootstrap (MBB).
 
+    The replicates are rows of `block_bootstrap_indices`; the draws (and
+    hence the replicates) are the same as drawing one block start at a time.
+
     Args:
         values (np.array): The time series values.
         dates (np.array): The ordinal dates (X-axis).
         n_boot (int): Number of bootstrap iterations.
         block_size (int): Length of blocks. If None, uses n^(1/3) heuristic.
         seasonal_period (int): Optional minimum block size to respect seasonality.
+        rng (np.random.Generator, int or SeedSequence, optional): Source of the block
+            starts. None (default) draws from the global `np.random` state.
 
     Yields:
         tuple: (resampled_values, resampled_dates)
     """
-    n = len(values)
+    block_size = resolve_block_size(len(values), block_size, seasonal_period)
+    indices = block_bootstrap_indices(len(values), n_boot, block_size, rng=rng)
+
+    for row in indices:
+        # Return the data pairs (Y, X)
+        # Note: We must keep Y and X paired together!
+        # We are bootstrapping the *residuals* usually, but for QR
+        # paired bootstrapping (resampling rows) is robust.
+        yield values[row], dates[row]
+
+def resolve_block_size(n, block_size=None, seasonal_period=None):
+    """
+    Block length of the moving block bootstrap of a series of length n.
+
+    Args:
+        n (int): Series length.
+        block_size (int): Length of blocks. If None, uses n^(1/3) heuristic.
+        seasonal_period (int): Optional minimum block size to respect seasonality.
 
+    Returns:
+        int: Block length.
+    """
     # Heuristic for block size if not provided: cube root of N
     # (Common rule of thumb for preserving stationarity within blocks)
     if block_size is None:
@@ -26,29 +59,125 @@ def generate_block_bootstraps(values, dates, n_boot=2000, block_size=None, seaso
 
         block_size = max(2, block_size) # At least pairs
 
-    # We use Circular Block Bootstrap logic for simplicity (wrapping around)
-    # or just standard Moving Block. Let's use Standard Moving Block.
+    return block_size
+
+def block_bootstrap_indices(n, n_boot, block_size, rng=None, dtype=np.int32, chunk_size=None):
+    """
+    Row indices of `n_boot` moving block bootstrap replicates as one matrix.
+
+    Each replicate concatenates ceil(n / block_size) blocks of consecutive
+    indices with uniformly drawn starts in [0, n - block_size] (standard
+    moving blocks, no wrapping), trimmed to n. All starts are drawn in one
+    call and expanded with a broadcast offset.
+
+    Memory is n_boot * n * itemsize bytes (4 per index with the default
+    int32; pass dtype=np.int64 for series longer than 2**31 - 1).
+
+    Matrices drawn from an int or SeedSequence seed are deterministic and are
+    cached (up to `INDEX_CACHE_SIZE` matrices, see `set_bootstrap_cache_size`;
+    keyed by n, n_boot, block_size, seed, dtype and chunk_size), so sites of
+    the same length in a batch run share one matrix. The cached matrix is
+    read-only. Draws from the global state (rng=None) or a Generator are never
+    cached.
+
+    Args:
+        n (int): Series length.
+        n_boot (int): Number of replicates.
+        block_size (int): Block length (see `resolve_block_size`).
+        rng (np.random.Generator, int or SeedSequence, optional): Source of the block
+            starts. None (default) draws from the global `np.random` state.
+        dtype (np.dtype): Integer type of the indices (default np.int32).
+        chunk_size (int, optional): With an int or SeedSequence seed, draw the rows
+            in chunks of `chunk_size`, chunk i from the i-th child of `seed.spawn`
+            (the seed itself is not advanced). Each chunk is then independent of
+            the others, so the rows can be split between workers freely. Ignored
+            for Generators and the global state.
+
+    Returns:
+        np.array: (n_boot x n) index matrix.
+
+    Raises:
+        ValueError: If `dtype` cannot hold the indices of n points.
+    """
+    dtype = np.dtype(dtype)
+    if n > np.iinfo(dtype).max:
+        raise ValueError(f"{dtype} indices cannot address a series of {n} points; use np.int64.")
+
+    if isinstance(rng, (int, np.integer)):
+        return _cached_indices(n, n_boot, block_size, ("int", int(rng)), dtype.str, chunk_size)
+    if isinstance(rng, np.random.SeedSequence):
+        if isinstance(rng.entropy, list):
+            # Unhashable entropy: drawn without the cache
+            return _seeded_indices(n, n_boot, block_size, rng, dtype, chunk_size)
+        key = ("seed_sequence", rng.entropy, tuple(rng.spawn_key), rng.pool_size)
+        return _cached_indices(n, n_boot, block_size, key, dtype.str, chunk_size)
+    return _draw_indices(n, n_boot, block_size, rng, dtype)
+
+def _seeded_indices(n, n_boot, block_size, seed, dtype, chunk_size):
+    if chunk_size is None:
+        return _draw_indices(n, n_boot, block_size, np.random.default_rng(seed), dtype)
+
+    # Chunk i from the i-th child of a fresh `seed.spawn`
+    chunks = []
+    for i, start in enumerate(range(0, n_boot, chunk_size)):
+        child = np.random.SeedSequence(seed.entropy, spawn_key=tuple(seed.spawn_key) + (i,),
+                                       pool_size=seed.pool_size)
+        chunks.append(_draw_indices(n, min(chunk_size, n_boot - start), block_size,
+                                    np.random.default_rng(child), dtype))
+    return np.concatenate(chunks) if chunks else np.empty((0, n), dtype=dtype)
 
+def _cached_seeded_indices(n, n_boot, block_size, seed_key, dtype_str, chunk_size):
+    if seed_key[0] == "int":
+        seed = np.random.SeedSequence(seed_key[1])
+    else:
+        _, entropy, spawn_key, pool_size = seed_key
+        seed = np.random.SeedSequence(entropy, spawn_key=spawn_key, pool_size=pool_size)
+    indices = _seeded_indices(n, n_boot, block_size, seed, np.dtype(dtype_str), chunk_size)
+    indices.setflags(write=False)
+    return indices
+
+_cached_indices = lru_cache(maxsize=INDEX_CACHE_SIZE)(_cached_seeded_indices)
+
+def _draw_indices(n, n_boot, block_size, rng, dtype):
     # Indices of all possible blocks
     # If N=60, block=4, we have 57 starting positions.
     num_blocks = n - block_size + 1
+    # We need ceil(N / block_size) blocks per replicate
+    blocks_per_replicate = -(-n // block_size)
 
-    for _ in range(n_boot):
-        # We need to construct a new series of length N
-        # We need ceil(N / block_size) blocks
-        indices = []
+    if rng is None:
+        starts = np.random.randint(0, num_blocks, size=(n_boot, blocks_per_replicate))
+    else:
+        starts = np.random.default_rng(rng).integers(0, num_blocks, size=(n_boot, blocks_per_replicate))
 
-        while len(indices) < n:
-            # Pick a random start index
-            start_idx = np.random.randint(0, num_blocks)
-            # Add the block
-            indices.extend(range(start_idx, start_idx + block_size))
+    offsets = np.arange(block_size, dtype=dtype)
+    indices = (starts.astype(dtype)[:, :, None] + offsets).reshape(n_boot, -1)
+    # Trim to exact length N
+    return indices[:, :n]
 
-        # Trim to exact length N
-        indices = indices[:n]
+def bootstrap_cache_info():
+    """
+    Hit/miss counters of the seeded bootstrap index cache.
 
-        # Return the data pairs (Y, X)
-        # Note: We must keep Y and X paired together!
-        # We are bootstrapping the *residuals* usually, but for QR
-        # paired bootstrapping (resampling rows) is robust.
-        yield values[indices], dates[indices]
+    Returns:
+        dict: {'hits', 'misses', 'maxsize', 'currsize'}
+    """
+    return _cached_indices.cache_info()._asdict()
+
+def bootstrap_cache_clear():
+    """
+    Empties the seeded bootstrap index cache and resets its counters.
+    """
+    _cached_indices.cache_clear()
+
+def set_bootstrap_cache_size(maxsize):
+    """
+    Sets how many seeded index matrices are cached (and empties the cache).
+
+    Args:
+        maxsize (int or None): Number of matrices kept; 0 disables caching and
+            None removes the bound.
+    """
+    global INDEX_CACHE_SIZE, _cached_indices
+    INDEX_CACHE_SIZE = maxsize
+    _cached_indices = lru_cache(maxsize=maxsize)(_cached_seeded_indices)
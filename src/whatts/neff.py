@@ -0,0 +1,168 @@
+import numpy as np
+
+# Estimators accepted by `neff_batch`
+NEFF_METHODS = ("sum_corr", "ar1", "batch_means")
+
+# Upper bound on the elements of one FFT block (rows x padded length), to
+# bound the memory of the sum-of-correlations estimator on large networks.
+_FFT_BLOCK_ELEMENTS = 1 << 22
+
+
+def neff_batch(data, method="sum_corr", batch_size=None):
+    """
+    Effective sample size of many series at once.
+
+    Each row of `data` is one series. Rows may have different lengths or
+    gaps: missing entries (NaN, or masked entries of a masked array) are
+    dropped and the remaining values are treated as consecutive, exactly as
+    `calculate_tolerance_limit` does for a single series.
+
+    Estimators (all clipped to [2, n] like `calculate_neff_sum_corr`; rows
+    with n < 3 give n and constant rows give 1.0):
+        - 'sum_corr': Sum of Correlations (Bayley & Hammersley),
+          n / (1 + 2 * sum_k rho_k * (1 - k/n)) over lags k < n/2, truncated
+          per row at the first negative autocorrelation. Same estimator as
+          `calculate_neff_sum_corr` (agrees to floating-point rounding).
+        - 'ar1': AR(1) approximation, n * (1 - rho_1) / (1 + rho_1).
+        - 'batch_means': n * var(x) / (b * var(batch means)), using
+          floor(n / b) non-overlapping batches of b = floor(sqrt(n)) values
+          (or `batch_size`) per row.
+
+    Args:
+        data (np.array or np.ma.MaskedArray): 2-D array (series x time), NaN-padded.
+        method (str): 'sum_corr' (default), 'ar1' or 'batch_means'.
+        batch_size (int, optional): Batch length for 'batch_means'.
+
+    Returns:
+        np.array: n_eff for every row.
+    """
+    if method not in NEFF_METHODS:
+        raise ValueError(f"Unknown n_eff method: {method}. Choose from {NEFF_METHODS}.")
+
+    x, n = _pack_rows(data)
+    n_eff = n.astype(float)
+
+    # Rows too short for any lag keep n, as in the scalar function
+    long_rows = np.flatnonzero(n >= 3)
+    if len(long_rows) == 0:
+        return n_eff
+
+    x, n = x[long_rows], n[long_rows]
+    valid = np.arange(x.shape[1]) < n[:, None]
+
+    # Centre each row over its own values; padding stays exactly zero
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, x - x.sum(axis=1, keepdims=True) / n[:, None], 0.0)
+    var = np.einsum("ij,ij->i", y, y) / n
+
+    if method == "sum_corr":
+        estimate = _sum_corr(y, n, var)
+    elif method == "ar1":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rho_1 = np.einsum("ij,ij->i", y[:, :-1], y[:, 1:]) / (n * var)
+            estimate = n * (1 - rho_1) / (1 + rho_1)
+    else:
+        estimate = _batch_means(y, n, var, batch_size)
+
+    estimate = np.clip(estimate, 2.0, n.astype(float))
+    # FIX (as in the scalar function): constant data carry one observation's information
+    estimate[var == 0] = 1.0
+    n_eff[long_rows] = estimate
+    return n_eff
+
+
+def stack_series(series):
+    """
+    Stacks 1-D series of different lengths into a NaN-padded 2-D array for `neff_batch`.
+    """
+    series = [np.asarray(s, dtype=float) for s in series]
+    length = max((len(s) for s in series), default=0)
+    out = np.full((len(series), length), np.nan)
+    for i, s in enumerate(series):
+        out[i, :len(s)] = s
+    return out
+
+
+def _pack_rows(data):
+    """
+    Moves the observed values of each row to the front (order preserved).
+
+    Returns:
+        tuple: (packed values with NaN padding, number of values per row)
+    """
+    if np.ma.isMaskedArray(data):
+        data = data.astype(float).filled(np.nan)
+    x = np.atleast_2d(np.asarray(data, dtype=float))
+    if x.ndim != 2:
+        raise ValueError("data must be a 2-D array (series x time).")
+
+    missing = np.isnan(x)
+    n = x.shape[1] - missing.sum(axis=1)
+    if missing.any():
+        # A stable sort on the missing flag keeps the observed values in order
+        order = np.argsort(missing, axis=1, kind="stable")
+        x = np.take_along_axis(x, order, axis=1)
+        # Drop columns that are padding in every row
+        x = x[:, :n.max()]
+    return x, n
+
+
+def _sum_corr(y, n, var):
+    """
+    Sum-of-correlations n_eff for centred, zero-padded rows.
+    """
+    from scipy.fft import rfft, irfft, next_fast_len
+
+    rows, length = y.shape
+    max_lag = int(n.max() / 2)
+    n_fft = next_fast_len(2 * length - 1, real=True)
+
+    # Lag sums sum_i y_i * y_(i+k), in row blocks to bound the FFT memory
+    acov = np.empty((rows, max_lag))
+    block = max(1, _FFT_BLOCK_ELEMENTS // n_fft)
+    for start in range(0, rows, block):
+        spectrum = rfft(y[start:start + block], n_fft, axis=1)
+        acov[start:start + block] = irfft(spectrum.real**2 + spectrum.imag**2, n_fft, axis=1)[:, :max_lag]
+
+    k = np.arange(1, max_lag)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = acov[:, 1:] / (n * var)[:, None]
+
+    # Lags k = 1 .. int(n/2) - 1 of each row, up to (excluding) its first negative one
+    in_range = k[None, :] < (n // 2)[:, None]
+    stop = np.argmax((rho < 0) | ~in_range, axis=1)
+    stop[((rho >= 0) & in_range).all(axis=1)] = len(k)
+    used = k[None, :] <= stop[:, None]
+
+    sum_rho = np.where(used, rho * (1 - k[None, :] / n[:, None]), 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return n / (1 + 2 * sum_rho)
+
+
+def _batch_means(y, n, var, batch_size=None):
+    """
+    Batch-means n_eff for centred, zero-padded rows.
+    """
+    if batch_size is None:
+        b = np.floor(np.sqrt(n)).astype(int)
+    else:
+        b = np.full(len(n), int(batch_size))
+    b = np.maximum(b, 1)
+    n_batches = n // b
+
+    # Batch j of row i covers positions [j * b_i, (j + 1) * b_i)
+    cumulative = np.concatenate([np.zeros((len(n), 1)), np.cumsum(y, axis=1)], axis=1)
+    j = np.arange(n_batches.max() + 1)
+    edges = np.minimum(j[None, :] * b[:, None], y.shape[1])
+    batch_means = np.diff(np.take_along_axis(cumulative, edges, axis=1), axis=1) / b[:, None]
+    used = j[None, :-1] < n_batches[:, None]
+
+    # Variance of the batch means about their own mean
+    centre = np.where(used, batch_means, 0.0).sum(axis=1) / n_batches
+    spread = np.where(used, (batch_means - centre[:, None])**2, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var_batch_means = spread / (n_batches - 1)
+        estimate = n * var / (b * var_batch_means)
+    # Fewer than two batches: no information about the dependence
+    estimate[n_batches < 2] = n[n_batches < 2]
+    return estimate
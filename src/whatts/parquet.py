@@ -0,0 +1,118 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .batch import _evaluate_site, assemble_site_rows
+
+
+def iter_parquet_sites(path, site_cols, date_col, value_col):
+    """
+    Streams complete per-site series from a local Parquet file.
+
+    Only the site, date and value columns are read, one row group at a time.
+    A first pass over the site columns records the last row group in which
+    each site appears. Rows are then buffered per site, and each site is
+    yielded and released as soon as its last row group has been read.
+
+    Peak memory is therefore one row group plus the buffered sites whose rows
+    span the current row group. For exports written sorted or clustered by
+    site (the usual layout), this is bounded by the largest site rather than
+    the file. Files in which every site appears in every row group still work
+    but buffer everything.
+
+    Args:
+        path (str or os.PathLike): Local Parquet file.
+        site_cols (str or list): Column(s) identifying a site/parameter combination.
+        date_col (str): Column name for dates.
+        value_col (str): Column name for values.
+
+    Yields:
+        tuple: (site key, dates, values); the key is a tuple when several site
+            columns are given, and dates (datetime64 array) are sorted ascending
+            with values aligned. Sites are yielded in order of their last row group.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet ingestion requires pyarrow (pip install whatts[parquet]).") from exc
+
+    site_cols = [site_cols] if isinstance(site_cols, str) else list(site_cols)
+
+    with open(os.fspath(path), "rb") as handle:
+        parquet_file = pq.ParquetFile(handle)
+        n_groups = parquet_file.metadata.num_row_groups
+
+        # 1. Last row group of every site (site columns only)
+        last_group = {}
+        for i in range(n_groups):
+            sites = parquet_file.read_row_group(i, columns=site_cols).to_pandas()
+            for key in _group_positions(sites, site_cols):
+                last_group[key] = i
+
+        # 2. Buffer rows per site and release each site after its last row group
+        buffers = {}
+        for i in range(n_groups):
+            chunk = parquet_file.read_row_group(i, columns=site_cols + [date_col, value_col]).to_pandas()
+            dates = pd.to_datetime(chunk[date_col]).values
+            values = chunk[value_col].values
+            for key, positions in _group_positions(chunk, site_cols).items():
+                buffers.setdefault(key, []).append((dates[positions], values[positions]))
+            del chunk
+
+            for key in [key for key in buffers if last_group[key] == i]:
+                parts = buffers.pop(key)
+                site_dates = np.concatenate([part[0] for part in parts])
+                site_values = np.concatenate([part[1] for part in parts])
+                order = np.argsort(site_dates, kind="stable")
+                yield key, site_dates[order], site_values[order]
+
+
+def _group_positions(df, site_cols):
+    by = site_cols if len(site_cols) > 1 else site_cols[0]
+    return df.groupby(by, sort=False, dropna=False).indices
+
+
+def calculate_tolerance_limits_parquet(path, site_cols, date_col, value_col, n_jobs=1, **kwargs):
+    """
+    Runs `calculate_tolerance_limit` for every site in a local Parquet file
+    without loading the whole file (see `iter_parquet_sites`).
+
+    Args:
+        path (str or os.PathLike): Local Parquet file.
+        site_cols (str or list): Column(s) identifying a site/parameter combination.
+        date_col (str): Column name for dates.
+        value_col (str): Column name for values.
+        n_jobs (int): Number of worker processes. 1 (default) runs in-process,
+            -1 uses all available CPUs. At most two sites per worker are in flight.
+        **kwargs: Passed to `calculate_tolerance_limit`.
+
+    Returns:
+        pd.DataFrame: One row per site (per site and combination for grids),
+            as `calculate_tolerance_limits_batch`.
+    """
+    site_cols = [site_cols] if isinstance(site_cols, str) else list(site_cols)
+    sites = iter_parquet_sites(path, site_cols, date_col, value_col)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    keys, rows = [], []
+    if n_jobs is None or n_jobs <= 1:
+        for task in sites:
+            keys.append(task[0])
+            rows.append(_evaluate_site(task, kwargs))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            pending = deque()
+            for task in sites:
+                keys.append(task[0])
+                pending.append(executor.submit(_evaluate_site, task, kwargs))
+                # Bound the number of series held in the queue
+                if len(pending) >= 2 * n_jobs:
+                    rows.append(pending.popleft().result())
+            rows.extend(future.result() for future in pending)
+
+    return assemble_site_rows(rows, keys, site_cols)
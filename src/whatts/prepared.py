@@ -0,0 +1,446 @@
+import copy
+import warnings
+import numpy as np
+import pandas as pd
+from .stats import (
+    hazen_z_scores,
+    interpolate_sorted,
+    inverse_sorted,
+    calculate_neff_sum_corr,
+    wilson_score_interval,
+    score_test_probability
+)
+from .result import ToleranceResult
+from .utils import (
+    run_trend_test,
+    is_trend_significant,
+    apply_projection,
+    as_datetime64,
+    datetime64_to_seconds,
+    SECONDS_PER_YEAR
+)
+
+
+class PreparedSeries:
+    """
+    A monitoring series prepared once for repeated compliance queries.
+
+    Sorting, the Mann-Kendall / Sen's slope test, the projection, the effective
+    sample size and the sorted probit (Hazen Z-score) geometry are computed on
+    construction (or on first use) and cached. Views created with
+    `with_options` share the same cache. Queries that only change the
+    percentile, confidence, sides, Wilson thresholds, clamps or regulatory limit
+    then reuse that work.
+
+    The trend statistics do not depend on the significance level. Whether the
+    trend is significant, and hence whether the data are projected, is decided
+    per query from alpha = 1 - confidence, exactly as in
+    `calculate_tolerance_limit`. At most two analysis states (projected and
+    unprojected) are built per projection target date.
+
+    Attributes:
+        times (np.array): Sorted datetime64 dates (missing values removed).
+        values (np.array): Values aligned with `dates`.
+        n (int): Sample size after removing missing values.
+        trend (dict or None): {'slope', 'p_value', 'tau', 'z'} from the trend test
+            (slope in units per second), or None if projection is disabled.
+
+    Example:
+        >>> prepared = PreparedSeries(df["Date"], df["Value"])
+        >>> prepared.tolerance_limit(0.95, confidence=0.9, sides=1)["upper_tolerance_limit"]
+        >>> prepared.probability_of_compliance(540)
+    """
+
+    def __init__(self, dates, values, use_projection=True, use_neff=True, projection_target_date=None,
+                 trend_backend="mannks", seasonal_period=None):
+        """
+        Args:
+            dates (array-like): Dates of the observations.
+            values (array-like): Numeric values (NaNs are dropped).
+            use_projection (bool): Whether to project data to current state using trends (default True).
+            use_neff (bool): Whether to adjust for autocorrelation using effective sample size (default True).
+            projection_target_date (datetime-like or str, optional): Date to project the trend to.
+            trend_backend (str): 'mannks' (default), 'native' or 'seasonal' (see `run_trend_test`).
+            seasonal_period (int, optional): Seasons per year for the 'seasonal' backend.
+        """
+        times = as_datetime64(dates)
+        values = np.asarray(values)
+
+        # Sort by date; an O(n) check lets ordered data skip the sort
+        if len(times) > 1 and not (times[1:] >= times[:-1]).all():
+            order = np.argsort(times, kind="stable")
+            times = times[order]
+            values = values[order]
+
+        self.times, self.values = clean_series(times, values)
+        self.n = len(self.values)
+        self.use_projection = use_projection
+        self.use_neff = use_neff
+        self.projection_target_date = projection_target_date
+        self.trend_backend = trend_backend
+        self.seasonal_period = seasonal_period
+
+        # Work shared by every view of this series (see `with_options`):
+        # date numerics, the trend test and the analysis state per
+        # (trend significance, projection target) outcome.
+        self._cache = {"date_numerics": None, "trend": None, "states": {}}
+        if use_projection:
+            # Run the trend test eagerly so construction carries the cost
+            self.trend
+
+    @classmethod
+    def from_dataframe(cls, df, date_col, value_col, **kwargs):
+        """
+        Builds a PreparedSeries from two columns of a DataFrame.
+        """
+        return cls(df[date_col], df[value_col].values, **kwargs)
+
+    @property
+    def dates(self):
+        """
+        Sorted dates as a pd.Series.
+        """
+        return pd.Series(self.times)
+
+    @property
+    def trend(self):
+        """
+        Trend test result (None if projection is disabled), computed once per series.
+        """
+        if not self.use_projection:
+            return None
+        if self._cache["trend"] is None:
+            self._cache["trend"] = run_trend_test(self._date_numerics(), self.values, backend=self.trend_backend,
+                                                  seasonal_period=self.seasonal_period)
+        return self._cache["trend"]
+
+    def _date_numerics(self):
+        if self._cache["date_numerics"] is None:
+            self._cache["date_numerics"] = datetime64_to_seconds(self.times)
+        return self._cache["date_numerics"]
+
+    def with_options(self, use_projection=None, use_neff=None, projection_target_date=None):
+        """
+        Returns a view of this series with different analysis options.
+
+        The view shares the sorted data, trend test, projected data, n_eff and
+        probit geometry already computed (or computed later) by this series.
+        Options left as None are inherited.
+        """
+        view = copy.copy(self)
+        if use_projection is not None:
+            view.use_projection = use_projection
+        if use_neff is not None:
+            view.use_neff = use_neff
+        if projection_target_date is not None:
+            view.projection_target_date = projection_target_date
+        return view
+
+    def is_trend_significant(self, confidence=0.95):
+        """
+        Whether the trend is significant at alpha = 1 - confidence.
+        """
+        return self.use_projection and is_trend_significant(self.trend['z'], 1.0 - confidence)
+
+    def state(self, confidence=0.95):
+        """
+        Returns the cached analysis state used at the given confidence level.
+
+        The arrays are shared by every query on the series and are read-only.
+
+        Returns:
+            dict: {'analysis_data', 'data_sorted', 'z_scores', 'n_eff', 'trend_detected'}
+        """
+        is_significant = self.is_trend_significant(confidence)
+
+        # Unprojected data do not depend on the projection target
+        key = (is_significant, self.projection_target_date if is_significant else None)
+        states = self._cache["states"]
+        if key not in states:
+            states[key] = self._build_state(is_significant)
+        state = states[key]
+
+        # Effective Sample Size (if enabled)
+        if self.use_neff:
+            if state["neff_sum_corr"] is None:
+                state["neff_sum_corr"] = calculate_neff_sum_corr(state["analysis_data"])
+                warn_low_neff(state["neff_sum_corr"])
+            n_eff = state["neff_sum_corr"]
+        else:
+            n_eff = float(self.n)
+
+        return {
+            "analysis_data": state["analysis_data"],
+            "data_sorted": state["data_sorted"],
+            "z_scores": state["z_scores"],
+            "n_eff": n_eff,
+            "trend_detected": is_significant
+        }
+
+    def _build_state(self, is_significant):
+        """
+        Projected data and sorted probit geometry (n_eff is filled in on demand).
+        """
+        if is_significant:
+            analysis_data = apply_projection(self._date_numerics(), self.values, self.trend['slope'],
+                                             target_date=self.projection_target_date)
+        else:
+            # `values` may be the caller's own array
+            analysis_data = self.values.copy()
+        data_sorted = np.sort(analysis_data)
+        # Shared by every query on this series, so frozen like the Hazen arrays
+        analysis_data.setflags(write=False)
+        data_sorted.setflags(write=False)
+
+        return {
+            "analysis_data": analysis_data,
+            "data_sorted": data_sorted,
+            "z_scores": hazen_z_scores(self.n),
+            "neff_sum_corr": None
+        }
+
+    def probability_of_compliance(self, regulatory_limit, target_percentile=0.95, confidence=0.95):
+        """
+        Probability that the true target percentile is at or below `regulatory_limit`.
+
+        `confidence` only matters through the trend-significance decision.
+        """
+        return state_compliance_probability(self.state(confidence), regulatory_limit, target_percentile)
+
+    def compliance_curve(self, limits, target_percentile=0.95, confidence=0.95):
+        """
+        Probability of compliance over a grid of candidate regulatory limits.
+
+        All limits are ranked against the sorted data in one interpolation and
+        the score test is vectorized, so a curve costs about the same as one
+        `probability_of_compliance` call.
+
+        Returns:
+            pd.DataFrame: Columns 'regulatory_limit', 'observed_rank' and
+                'probability_of_compliance', one row per limit.
+        """
+        return state_compliance_curve(self.state(confidence), limits, target_percentile)
+
+    def tolerance_limit(self, target_percentile=0.95, confidence=0.95, sides=2, regulatory_limit=None,
+                        small_n_threshold=60, medium_n_threshold=120, distance_threshold=5,
+                        min_value=None, max_value=None, return_arrays=True, audit=True):
+        """
+        Evaluates the tolerance limit for one percentile and confidence level.
+
+        Arguments are as in `calculate_tolerance_limit`.
+
+        Returns:
+            ToleranceResult: The same result as `calculate_tolerance_limit` (projection method).
+        """
+        return evaluate_state(
+            self.state(confidence), self.trend, target_percentile, confidence, sides=sides,
+            regulatory_limit=regulatory_limit, small_n_threshold=small_n_threshold,
+            medium_n_threshold=medium_n_threshold, distance_threshold=distance_threshold,
+            min_value=min_value, max_value=max_value, return_arrays=return_arrays, audit=audit
+        )
+
+
+def state_compliance_probability(state, regulatory_limit, target_percentile):
+    """
+    Probability of compliance for a prepared analysis state (see `PreparedSeries.state`).
+    """
+    # A. Find where the limit sits in our projected data
+    obs_rank = inverse_sorted(state["data_sorted"], regulatory_limit)
+
+    # B. Calculate probability that True Target Percentile <= Limit
+    return score_test_probability(
+        p_obs=obs_rank,
+        p_null=target_percentile,
+        n_eff=state["n_eff"]
+    )
+
+
+def state_compliance_curve(state, limits, target_percentile):
+    """
+    Compliance curve for a prepared analysis state (see `PreparedSeries.compliance_curve`).
+    """
+    limits = np.asarray(limits, dtype=float).ravel()
+    obs_rank = inverse_sorted(state["data_sorted"], limits)
+    prob = score_test_probability(p_obs=obs_rank, p_null=target_percentile, n_eff=state["n_eff"])
+    return pd.DataFrame({
+        "regulatory_limit": limits,
+        "observed_rank": obs_rank,
+        "probability_of_compliance": np.broadcast_to(prob, limits.shape)
+    })
+
+
+def evaluate_state(state, trend, target_percentile=0.95, confidence=0.95, sides=2, regulatory_limit=None,
+                   small_n_threshold=60, medium_n_threshold=120, distance_threshold=5,
+                   min_value=None, max_value=None, return_arrays=True, audit=True, interval=None):
+    """
+    Builds the projection-method result for one percentile and confidence level.
+
+    Args:
+        state (dict): Analysis state, as returned by `PreparedSeries.state`.
+        trend (dict or None): Trend statistics ({'slope', 'p_value', 'tau', 'z'}),
+            or None if projection is disabled.
+        interval (tuple, optional): Precomputed (lower_rank, upper_rank, method) from
+            the Wilson score interval, e.g. from `wilson_score_interval_array` for a grid.
+        (remaining arguments as in `calculate_tolerance_limit`)
+
+    Returns:
+        ToleranceResult: The result of `calculate_tolerance_limit`.
+    """
+    is_significant = state["trend_detected"]
+    analysis_data = state["analysis_data"]
+    data_sorted = state["data_sorted"]
+    z_scores = state["z_scores"]
+    n_eff = state["n_eff"]
+    n = len(data_sorted)
+    use_projection = trend is not None
+
+    slope = trend['slope'] if is_significant else 0.0
+    slope_per_year = slope * SECONDS_PER_YEAR
+    tau = trend['tau'] if use_projection else None
+    p_value = trend['p_value'] if use_projection else None
+
+    # 4. Tolerance Limit / Confidence Interval (The "Regulatory Assurance Value")
+    # Get the probability ranks for the interval
+    if interval is None:
+        interval = wilson_score_interval(
+            p_hat=target_percentile,
+            n=n,
+            n_eff=n_eff,
+            conf_level=confidence,
+            small_n_threshold=small_n_threshold,
+            medium_n_threshold=medium_n_threshold,
+            distance_threshold=distance_threshold,
+            sides=sides
+        )
+    lower_rank, upper_rank, wh_method = interval
+
+    # 5. Point Estimate (The "Face Value") and Limits, mapped from ranks to values in one pass
+    values, notes = interpolate_sorted(data_sorted, z_scores, [target_percentile, lower_rank, upper_rank],
+                                       min_value=min_value, max_value=max_value)
+    point_est, lower_limit, upper_limit = values
+    point_clamp_note, lower_clamp_note, upper_clamp_note = notes
+
+    # Determine extrapolation
+    max_hazen_rank = (n - 0.5) / n
+    min_hazen_rank = 0.5 / n
+    is_point_extrapolated = bool(target_percentile > max_hazen_rank or target_percentile < min_hazen_rank)
+    is_upper_extrapolated = bool(upper_rank > max_hazen_rank or upper_rank < min_hazen_rank)
+    is_lower_extrapolated = bool(lower_rank > max_hazen_rank or lower_rank < min_hazen_rank)
+
+    # 6. Probability of Compliance
+    compliance_prob = None
+    if regulatory_limit is not None:
+        compliance_prob = state_compliance_probability(state, regulatory_limit, target_percentile)
+
+    audit_trail = None
+    if audit:
+        audit_trail = {
+            "n_eff_method": "Sum of Correlations (Bayley & Hammersley)",
+            "trend_method": "Mann-Kendall + Theil-Sen" if use_projection else "None",
+            "interpolation_method": "Probit (Z-Score)",
+            "wh_correction_method": wh_method,
+            "clamping_status": {
+                "point_estimate": point_clamp_note,
+                "lower_limit": lower_clamp_note,
+                "upper_limit": upper_clamp_note
+            },
+            "settings": {
+                "sides": sides,
+                "confidence": confidence,
+                "target_percentile": target_percentile,
+                "small_n_threshold": small_n_threshold,
+                "medium_n_threshold": medium_n_threshold,
+                "distance_threshold": distance_threshold,
+                "min_value": min_value,
+                "max_value": max_value
+            }
+        }
+
+    return ToleranceResult(
+        statistic=f"{int(target_percentile*100)}th Percentile",
+        target_percentile=target_percentile,
+        point_estimate=point_est,
+        upper_tolerance_limit=upper_limit,  # Main "Upper" value for compliance
+        lower_tolerance_limit=lower_limit,
+        confidence_level=confidence,
+        interval_sides=sides,
+        n_raw=n,
+        n_eff=n_eff,
+        trend_detected=is_significant,
+        trend_slope=slope,
+        trend_slope_per_year=slope_per_year,
+        probability_of_compliance=compliance_prob,
+        projected_data=analysis_data.copy() if return_arrays else None,
+        tau=tau,
+        p_value=p_value,
+        wh_method_used=wh_method,
+        point_estimate_is_extrapolated=is_point_extrapolated,
+        utl_is_extrapolated=is_upper_extrapolated, # Kept for backward compatibility
+        upper_limit_is_extrapolated=is_upper_extrapolated,
+        lower_limit_is_extrapolated=is_lower_extrapolated,
+        audit_trail=audit_trail
+    )
+
+def clean_series(dates, values):
+    """
+    Drops missing values and applies the sample size checks shared by every method.
+
+    Args:
+        dates (pd.Series or np.array): Datetime values, sorted ascending.
+        values (np.array): Numeric values aligned with `dates` (may contain NaN).
+
+    Returns:
+        tuple: (dates, values) with missing values removed.
+
+    Raises:
+        ValueError: If fewer than 5 values remain.
+    """
+    # Check for missing values
+    missing = pd.isna(values)
+    missing_pct = missing.mean() if len(values) > 0 else 0.0
+    if missing_pct > 0.3:
+        warnings.warn(f"{missing_pct:.1%} of rows dropped due to missing values. Results may be unreliable.")
+
+    # Drop NaNs from value_col
+    if missing.any():
+        dates = dates[~missing]
+        values = values[~missing]
+
+    check_sample(values)
+
+    return dates, values
+
+
+def check_sample(values):
+    """
+    Sample size and variance checks applied to every analysed series.
+
+    Raises:
+        ValueError: If fewer than 5 values are available.
+    """
+    n = len(values)
+
+    # Check for constant data (zero variance)
+    if n > 1 and np.std(values) == 0:
+        warnings.warn("Data has zero variance. Percentile estimates are uninformative.")
+
+    if n < 5:
+        raise ValueError("Sample size too small (n < 5).")
+
+    if n < 10:
+        warnings.warn(
+            f"Sample size is very small (n={n}). "
+            "Statistical results may be unstable or uninformative."
+        )
+
+
+def warn_low_neff(n_eff):
+    """
+    Minimum Record Length Warning.
+    """
+    if n_eff < 10:
+        warnings.warn(
+            f"Effective Sample Size is extremely low ({n_eff:.1f}). "
+            "Compliance results will have very wide confidence intervals "
+            "and may be uninformative."
+        )
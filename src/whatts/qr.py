@@ -1,9 +1,24 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
-from .bootstrap import generate_block_bootstraps
+from .bootstrap import block_bootstrap_indices, resolve_block_size
 
-def fit_qr_current_state(dates, values, target_percentile=0.95, confidence=0.95, target_date=None, seasonal_period=None, n_boot=1000, sides=2):
+# Solvers for the intercept + slope quantile regression (see `fit_quantile_line`)
+QR_SOLVERS = ("exact", "statsmodels")
+
+# Upper bound on pivots of the exact solver before falling back to QuantReg
+_MAX_PIVOTS = 200
+
+# Upper bound on the elements (replicates x n) of one block of bootstrap fits
+_BATCH_ELEMENTS = 1 << 20
+
+# Bootstrap replicates per SeedSequence child in seeded / parallel runs. Fixed,
+# so that the replicates do not depend on the number of workers.
+_SEED_CHUNK = 100
+
+def fit_qr_current_state(dates, values, target_percentile=0.95, confidence=0.95, target_date=None, seasonal_period=None, n_boot=1000, sides=2,
+                         solver="exact", seed=None, n_jobs=1, index_dtype=np.int32):
     """
     Fits Quantile Regression and estimates the Current State (final date)
     using Block Bootstrapping for uncertainty.
@@ -19,6 +34,16 @@ def fit_qr_current_state(dates, values, target_percentile=0.95, confidence=0.95,
         seasonal_period (int): Optional minimum block size to respect seasonality.
         n_boot (int): Number of bootstrap iterations (default 1000).
         sides (int): 1 for One-Sided Limit, 2 for Two-Sided Interval (default 2).
+        solver (str): 'exact' (default) or 'statsmodels' (see `fit_quantile_line`).
+        seed (int or np.random.SeedSequence, optional): Seed of the bootstrap. The
+            replicates are drawn in chunks of `_SEED_CHUNK`, each from its own
+            `SeedSequence.spawn` child, so a seed gives the same bootstrap
+            distribution for any `n_jobs`. The index matrix is cached per series
+            length and block size (see `block_bootstrap_indices`). None (default)
+            uses the global `np.random` state.
+        n_jobs (int): Threads fitting the bootstrap chunks (default 1, -1 for all CPUs).
+        index_dtype (np.dtype): Integer type of the bootstrap index matrix (default
+            np.int32; np.int64 for series longer than 2**31 - 1).
 
     Returns:
         dict: {
@@ -69,41 +94,41 @@ def fit_qr_current_state(dates, values, target_percentile=0.95, confidence=0.95,
         t_final = max_days
 
     # 2. Fit Point Estimate (The "Face Value")
-    # Add constant for intercept: y = a + bx
-    X = sm.add_constant(t_numeric)
-
-    model = sm.QuantReg(y, X)
-    result = model.fit(q=target_percentile)
+    # y = a + bx
+    intercept, slope_point = fit_quantile_line(t_numeric, y, target_percentile, solver=solver)
 
     # Predict at t_final
-    # params[0] is intercept, params[1] is slope
-    point_est = result.params[0] + result.params[1] * t_final
-    slope_point = result.params[1]
+    point_est = intercept + slope_point * t_final
 
     # 3. Bootstrap for Uncertainty (The "Regulatory Assurance")
     # We want the Upper Confidence Limit of this prediction.
-    bootstrap_preds = []
+    # One (n_boot x n) index matrix of all replicates (see `block_bootstrap_indices`)
+    block_size = resolve_block_size(len(y), seasonal_period=seasonal_period)
+    if seed is None:
+        indices = block_bootstrap_indices(len(y), n_boot, block_size, dtype=index_dtype)
+    else:
+        # One SeedSequence child per fixed-size chunk, so the rows do not depend on n_jobs
+        indices = block_bootstrap_indices(len(y), n_boot, block_size, rng=seed, dtype=index_dtype,
+                                          chunk_size=_SEED_CHUNK)
 
-    # Create generator
-    boot_gen = generate_block_bootstraps(y, t_numeric, n_boot=n_boot, seasonal_period=seasonal_period)
+    def bootstrap(rows):
+        return _bootstrap_predictions(y, t_numeric, t_final, target_percentile, rows, solver)
 
-    for y_boot, x_boot in boot_gen:
-        try:
-            # Fit QR on bootstrapped data
-            X_boot = sm.add_constant(x_boot)
-            mod_boot = sm.QuantReg(y_boot, X_boot)
-            res_boot = mod_boot.fit(q=target_percentile)
-
-            # Predict at t_final (ALWAYS predict at the original final time)
-            pred = res_boot.params[0] + res_boot.params[1] * t_final
-            bootstrap_preds.append(pred)
-        except:
-            # QR convergence can fail on small bootstraps with few distinct values
-            continue
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs > 1:
+        # Chunks of rows, fitted in any order
+        chunks = [indices[start:start + _SEED_CHUNK] for start in range(0, n_boot, _SEED_CHUNK)]
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            parts = list(executor.map(bootstrap, chunks))
+        bootstrap_preds = np.concatenate(parts) if parts else np.empty(0)
+    else:
+        bootstrap_preds = bootstrap(indices)
 
     # 4. Calculate Tolerance Limits
     # We want the percentiles of the bootstrap distribution of the point prediction.
-    bootstrap_preds = np.array(bootstrap_preds)
+    # QR convergence can fail on small bootstraps with few distinct values
+    bootstrap_preds = bootstrap_preds[~np.isnan(bootstrap_preds)]
 
     # Check if we have enough successful bootstraps
     if len(bootstrap_preds) < 100 and n_boot >= 100:
@@ -111,6 +136,252 @@ def fit_qr_current_state(dates, values, target_percentile=0.95, confidence=0.95,
     elif len(bootstrap_preds) == 0:
         raise ValueError("Quantile Regression Bootstrap failed to converge (0 successes).")
 
+    lower_limit, upper_limit = bootstrap_limits(bootstrap_preds, confidence, sides)
+
+    return {
+        "point_estimate": point_est,
+        "upper_tolerance_limit": upper_limit,
+        "lower_tolerance_limit": lower_limit,
+        "slope": slope_point * 365.25, # Convert to per-year for reporting
+        "bootstrap_distribution": bootstrap_preds # Useful for plotting
+    }
+
+def _bootstrap_predictions(y, t_numeric, t_final, target_percentile, indices, solver):
+    """
+    Predictions at t_final of the block bootstrap fits whose replicates are the
+    rows of `indices` (NaN where a fit fails).
+    """
+    bootstrap_preds = []
+    y = np.asarray(y, dtype=float)
+    t_numeric = np.asarray(t_numeric, dtype=float)
+
+    # Replicates are fitted together, in blocks of rows to bound the memory
+    block = max(1, _BATCH_ELEMENTS // max(len(y), 1))
+    for start in range(0, len(indices), block):
+        rows = indices[start:start + block]
+        a_boot, b_boot = fit_quantile_lines(t_numeric[rows], y[rows], target_percentile, solver=solver)
+
+        # Predict at t_final (ALWAYS predict at the original final time)
+        bootstrap_preds.append(a_boot + b_boot * t_final)
+
+    return np.concatenate(bootstrap_preds) if bootstrap_preds else np.empty(0)
+
+def fit_quantile_line(x, y, q, solver="exact"):
+    """
+    Quantile regression of y on x with an intercept: minimizes
+    sum(rho_q(y - a - b * x)) with the check loss rho_q(u) = u * (q - [u < 0]).
+
+    The 'exact' solver walks the vertices of this two-parameter linear program
+    (lines through two observations). Rotating the line about one observation
+    is a weighted quantile problem in the slope, solved exactly with one sort;
+    the solver alternates the pivot observation until no rotation lowers the
+    loss, then verifies the optimality (dual) conditions. Each pivot costs
+    O(n log n) and only a few pivots are usually needed, against hundreds of
+    IRLS iterations plus model set-up for `statsmodels.QuantReg`.
+
+    Degenerate problems the exact solver cannot certify (fewer than two distinct
+    x, no convergence) are passed to QuantReg, which is also used with
+    solver='statsmodels'.
+
+    Args:
+        x (np.array): Regressor (e.g. days since the first sample).
+        y (np.array): Response values.
+        q (float): Quantile in (0, 1).
+        solver (str): 'exact' (default) or 'statsmodels'.
+
+    Returns:
+        tuple: (intercept, slope)
+
+    Raises:
+        ValueError: If `solver` is unknown.
+    """
+    if solver not in QR_SOLVERS:
+        raise ValueError(f"Unknown QR solver: {solver}. Choose from {QR_SOLVERS}.")
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if solver == "exact":
+        intercept, slope, solved = _exact_quantile_lines(x[None, :], y[None, :], q)
+        if solved[0]:
+            return intercept[0], slope[0]
+    return _quantreg_line(x, y, q)
+
+def fit_quantile_lines(x, y, q, solver="exact"):
+    """
+    `fit_quantile_line` for many independent problems at once (e.g. bootstrap
+    replicates), one per row.
+
+    The exact solver runs every row in lock step: each pivot is one set of
+    array operations over the rows that are still improving, and rows leave
+    the active set as they converge. Rows it cannot certify are fitted one at
+    a time with QuantReg.
+
+    Args:
+        x (np.array): 2-D regressor (problems x n), or 1-D if shared by all rows.
+        y (np.array): 2-D response values (problems x n).
+        q (float): Quantile in (0, 1).
+        solver (str): 'exact' (default) or 'statsmodels'.
+
+    Returns:
+        tuple: (intercepts, slopes) arrays; NaN for rows QuantReg fails to fit.
+
+    Raises:
+        ValueError: If `solver` is unknown.
+    """
+    if solver not in QR_SOLVERS:
+        raise ValueError(f"Unknown QR solver: {solver}. Choose from {QR_SOLVERS}.")
+
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    x = np.broadcast_to(np.asarray(x, dtype=float), y.shape)
+    if solver == "exact":
+        intercept, slope, solved = _exact_quantile_lines(x, y, q)
+    else:
+        intercept, slope = np.full(len(y), np.nan), np.full(len(y), np.nan)
+        solved = np.zeros(len(y), dtype=bool)
+
+    for i in np.flatnonzero(~solved):
+        try:
+            intercept[i], slope[i] = _quantreg_line(x[i], y[i], q)
+        except Exception:
+            # Left as NaN (e.g. a replicate with a single distinct x)
+            continue
+    return intercept, slope
+
+def _quantreg_line(x, y, q):
+    """
+    Intercept and slope from `statsmodels.QuantReg`.
+    """
+    # Imported on first use: only needed for the fallback
+    import statsmodels.api as sm
+
+    params = sm.QuantReg(y, sm.add_constant(x)).fit(q=q).params
+    return params[0], params[1]
+
+def _exact_quantile_lines(x, y, q):
+    """
+    Exact solver behind `fit_quantile_lines` for 2-D x and y.
+
+    Returns:
+        tuple: (intercepts, slopes, solved), where `solved` flags the rows with
+            a certified solution.
+    """
+    n_rows, n = y.shape
+    intercept = np.full(n_rows, np.nan)
+    slope = np.full(n_rows, np.nan)
+    if n < 2:
+        return intercept, slope, np.zeros(n_rows, dtype=bool)
+
+    # 1. Start from a line through the sample q-quantile of y
+    rows = np.flatnonzero(np.ptp(x, axis=1) > 0)
+    pivot = np.argsort(y, axis=1, kind="stable")[:, min(int(q * n), n - 1)]
+    other = pivot.copy()
+    loss = np.full(n_rows, np.nan)
+    slope[rows], other[rows] = _best_rotations(x[rows], y[rows], q, pivot[rows])
+    loss[rows] = _check_losses(x[rows], y[rows], q, pivot[rows], slope[rows])
+
+    # 2. Alternate the pivot until rotating about either basis point stops helping
+    active = np.zeros(n_rows, dtype=bool)
+    active[rows] = True
+    for _ in range(_MAX_PIVOTS):
+        idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            break
+        new_slope, new_other = _best_rotations(x[idx], y[idx], q, other[idx])
+        new_loss = _check_losses(x[idx], y[idx], q, other[idx], new_slope)
+        better = new_loss < loss[idx] - 1e-12 * np.abs(loss[idx])
+        step = idx[better]
+        pivot[step], other[step] = other[step], new_other[better]
+        slope[step], loss[step] = new_slope[better], new_loss[better]
+        active[idx[~better]] = False
+
+    converged = np.zeros(n_rows, dtype=bool)
+    converged[rows] = ~active[rows]
+    all_rows = np.arange(n_rows)
+    intercept = y[all_rows, pivot] - slope * x[all_rows, pivot]
+    solved = converged & _is_optimal(x, y, q, intercept, slope)
+    return intercept, slope, solved
+
+def _best_rotations(x, y, q, k):
+    """
+    Best slope of each row's line forced through its observation k, and the
+    observation it meets.
+
+    With d_i = x_i - x_k and s_i = (y_i - y_k) / d_i, the loss is
+    sum(|d_i| * rho_(q_i)(s_i - b)) with q_i = q for d_i > 0 and 1 - q for
+    d_i < 0: a weighted quantile of the s_i.
+    """
+    rows = np.arange(len(k))
+    d = x - x[rows, k][:, None]
+    keep = d != 0
+    # Observations at x_k carry no weight; they sort last
+    s = np.where(keep, (y - y[rows, k][:, None]) / np.where(keep, d, 1.0), np.inf)
+    order = np.argsort(s, axis=1, kind="stable")
+    weight = np.take_along_axis(np.abs(d), order, axis=1)
+    q_i = np.take_along_axis(np.where(d > 0, q, 1 - q), order, axis=1)
+
+    # Right derivative of the loss at the m-th smallest s: mass below minus mass above
+    below = np.cumsum(weight * (1 - q_i), axis=1)
+    above = np.sum(weight * q_i, axis=1, keepdims=True) - np.cumsum(weight * q_i, axis=1)
+    col = order[rows, np.argmax(below >= above, axis=1)]
+    return s[rows, col], col
+
+def _check_losses(x, y, q, k, slope):
+    """
+    Quantile (check) loss of each row's line through observation k with the given slope.
+    """
+    rows = np.arange(len(k))
+    r = y - y[rows, k][:, None] - slope[:, None] * (x - x[rows, k][:, None])
+    return np.sum(r * (q - (r < 0)), axis=1)
+
+def _is_optimal(x, y, q, intercept, slope):
+    """
+    Optimality conditions of each fitted line: weights u_i in [q - 1, q] on the
+    observations on the line must balance the gradient of all other
+    observations, sum(u_i) = g0 and sum(u_i * x_i) = g1.
+
+    For a given sum(u_i) the attainable sum(u_i * x_i) is an interval whose
+    ends are found greedily (raise the weights of the smallest, or largest, x
+    first), so the check also covers more than two observations on the line.
+    """
+    n = y.shape[1]
+    with np.errstate(invalid="ignore"):
+        r = y - intercept[:, None] - slope[:, None] * x
+        tol = 1e-9 * np.maximum(np.max(np.abs(y), axis=1), 1.0)
+        on_line = np.abs(r) <= tol[:, None]
+    psi = np.where(on_line, 0.0, np.where(r > 0, q, q - 1))
+    g0 = -np.sum(psi, axis=1)
+    g1 = -np.sum(psi * x, axis=1)
+
+    # x of the observations on the line, ascending and descending
+    count = on_line.sum(axis=1)
+    first = np.arange(n)[None, :] < count[:, None]
+    ascending = np.where(first, np.sort(np.where(on_line, x, np.inf), axis=1), 0.0)
+    descending = np.where(first, -np.sort(np.where(on_line, -x, np.inf), axis=1), 0.0)
+
+    # Every weight starts at q - 1 and can rise by at most 1
+    need = g0 - count * (q - 1)
+    raised = np.where(first, np.clip(need[:, None] - np.arange(n)[None, :], 0.0, 1.0), 0.0)
+    base = (q - 1) * np.sum(ascending, axis=1)
+    lowest = base + np.sum(raised * ascending, axis=1)
+    highest = base + np.sum(raised * descending, axis=1)
+
+    eps = 1e-9 * n
+    scale = eps * np.maximum(np.max(np.abs(ascending), axis=1), 1.0)
+    return ((count >= 2) & (need >= -eps) & (need <= count + eps) &
+            (lowest - scale <= g1) & (g1 <= highest + scale))
+
+def bootstrap_limits(bootstrap_preds, confidence=0.95, sides=2):
+    """
+    Tolerance limits from a bootstrap distribution of predictions.
+
+    Args:
+        bootstrap_preds (np.array): Bootstrapped point predictions.
+        confidence (float): Confidence level (default 0.95).
+        sides (int): 1 for One-Sided Limit, 2 for Two-Sided Interval (default 2).
+
+    Returns:
+        tuple: (lower_limit, upper_limit)
+    """
     alpha = 1.0 - confidence
     alpha_tail = alpha / sides
 
@@ -123,10 +394,4 @@ def fit_qr_current_state(dates, values, target_percentile=0.95, confidence=0.95,
     upper_limit = np.percentile(bootstrap_preds, upper_rank * 100)
     lower_limit = np.percentile(bootstrap_preds, lower_rank * 100)
 
-    return {
-        "point_estimate": point_est,
-        "upper_tolerance_limit": upper_limit,
-        "lower_tolerance_limit": lower_limit,
-        "slope": slope_point * 365.25, # Convert to per-year for reporting
-        "bootstrap_distribution": bootstrap_preds # Useful for plotting
-    }
+    return lower_limit, upper_limit
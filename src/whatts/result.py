@@ -0,0 +1,80 @@
+# Field order of the projection-method result (as returned before results
+# became objects) and of the quantile regression result.
+PROJECTION_FIELDS = (
+    "statistic", "target_percentile", "point_estimate", "upper_tolerance_limit", "lower_tolerance_limit",
+    "confidence_level", "interval_sides", "n_raw", "n_eff", "trend_detected", "trend_slope",
+    "trend_slope_per_year", "probability_of_compliance", "projected_data", "tau", "p_value",
+    "wh_method_used", "point_estimate_is_extrapolated", "utl_is_extrapolated",
+    "upper_limit_is_extrapolated", "lower_limit_is_extrapolated", "audit_trail"
+)
+QR_FIELDS = (
+    "statistic", "target_percentile", "point_estimate", "upper_tolerance_limit", "lower_tolerance_limit",
+    "confidence_level", "interval_sides", "n_raw", "method", "trend_slope", "trend_detected",
+    "trend_slope_per_year", "probability_of_compliance", "projected_data"
+)
+
+# Fields that hold arrays or nested structures. They are left out of
+# tidy (one row per evaluation) result tables.
+NON_SCALAR_KEYS = ("projected_data", "audit_trail", "bootstrap_distribution")
+
+
+class ToleranceResult(dict):
+    """
+    Result of one tolerance limit evaluation.
+
+    A dictionary, as results have always been (`isinstance(res, dict)`,
+    `res.copy()`, `res.update(...)`, item assignment and `json.dumps` of the
+    scalar fields all work), whose fields can also be read as attributes
+    (`res.n_eff`). It has no per-instance `__dict__` beyond the dictionary
+    itself.
+
+    The heavy fields `projected_data` and `audit_trail` are None when the
+    evaluation was run with `return_arrays=False` / `audit=False`, which keeps
+    large batch runs small in memory and cheap to pickle between processes.
+
+    Example:
+        >>> res = calculate_tolerance_limit(df, "Date", "Value", audit=False)
+        >>> res["upper_tolerance_limit"]
+        >>> res.to_row()  # Scalar fields only, for a results table
+    """
+
+    __slots__ = ()
+
+    def __init__(self, fields=PROJECTION_FIELDS, **values):
+        """
+        Args:
+            fields (tuple): Names of the fields this result carries, in order.
+            **values: Field values; fields not given are None.
+        """
+        unknown = set(values) - set(fields)
+        if unknown:
+            raise ValueError(f"Unknown result fields: {sorted(unknown)}")
+        super().__init__((name, values.get(name)) for name in fields)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        shown = ", ".join(f"{name}={value!r}" for name, value in self.items() if name not in NON_SCALAR_KEYS)
+        return f"ToleranceResult({shown})"
+
+    def copy(self):
+        """
+        A shallow copy that is still a ToleranceResult.
+        """
+        return ToleranceResult(tuple(self), **self)
+
+    def to_dict(self):
+        """
+        All fields as a plain dictionary.
+        """
+        return dict(self)
+
+    def to_row(self):
+        """
+        Scalar fields only (no arrays or nested structures), as one row of a results table.
+        """
+        return {name: value for name, value in self.items() if name not in NON_SCALAR_KEYS}
@@ -0,0 +1,560 @@
+import heapq
+import warnings
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from .prepared import clean_series, check_sample, evaluate_state, warn_low_neff
+from .stats import hazen_z_scores, calculate_neff_sum_corr
+from .trend import theil_sen, SEN_DIRECT_PAIRS
+from .utils import (
+    is_trend_significant,
+    resolve_target_time,
+    as_datetime64,
+    datetime64_to_seconds,
+    SECONDS_PER_YEAR
+)
+
+# MannKS tolerances for a zero variance / zero time difference
+_EPSILON = 1e-10
+
+# Trend backends whose statistics `_IncrementalWindow` can maintain
+_INCREMENTAL_BACKENDS = ("mannks", "native")
+
+
+class _IncrementalWindow:
+    """
+    A time-ordered window of observations whose statistics are updated
+    incrementally as observations enter at the newest end (`push`) and leave
+    at the oldest end (`pop`).
+
+    Maintained state:
+        - Mann-Kendall S and the number of tied value pairs (O(n) per update).
+        - The multiset of pairwise Sen slopes, kept sorted, while the window
+          has at most `SEN_DIRECT_PAIRS` pairs (see below).
+        - The window values, kept sorted (Hazen geometry of unprojected data).
+        - Lag-k cross-product sums of values and times for every lag, from
+          which the sum-of-correlations n_eff of the (optionally projected)
+          window is obtained without the O(n^2) lag loop.
+
+    Insertions into and removals from the sorted structures are buffered and
+    merged in one pass when they are next read, so a window that moves by
+    several observations pays for one merge.
+
+    With `append_only=True` the Sen slopes are kept in a two-heap running
+    median instead (O(n log n) per arrival rather than a merge into the sorted
+    slope array), and `pop` is unavailable.
+
+    Keeping every pairwise slope costs O(n^2) memory and an O(n^2) copy per
+    merge. Above `SEN_DIRECT_PAIRS` pairs (about 1,400 observations) that is
+    slower than selecting the median afresh, so, as in `trend.sens_slope`,
+    the slopes are released and `trend` obtains Sen's slope from `theil_sen`
+    (O(n log^2 n)), searching first between bounds around the previous
+    window's slope (see scripts/benchmark_rolling.py). The sorted slopes are
+    rebuilt once the window has shrunk to half that many pairs. Every path
+    gives the exact median.
+
+    `trend_backend` selects the conventions of `trend` as in `run_trend_test`:
+    'mannks' (no tie correction to the variance of S) or 'native' (tie-corrected
+    variance, maintained from the running tie counts). Sen's slope is always
+    the exact median of the window's pairwise slopes.
+
+    Observations must be pushed in time order. Times are in seconds since the
+    epoch. Tied times are ordered by arrival, as MannKS orders them by position.
+    """
+
+    def __init__(self, t_ref=0.0, x_ref=0.0, capacity=64, append_only=False, trend_backend="mannks"):
+        if trend_backend not in _INCREMENTAL_BACKENDS:
+            raise ValueError(f"Trend backend {trend_backend!r} cannot be updated incrementally. "
+                             f"Choose from {_INCREMENTAL_BACKENDS}.")
+        self.trend_backend = trend_backend
+
+        # Values and times are shifted by fixed references before forming the
+        # lag sums; centred quantities are unaffected but precision is kept.
+        self.t_ref = float(t_ref)
+        self.x_ref = float(x_ref)
+
+        self._t = np.empty(capacity)
+        self._x = np.empty(capacity)
+        self._lo = 0
+        self._hi = 0
+
+        self.s = 0
+        self.tied_pairs = 0
+        # sum t(t-1)(2t+5) over groups of t tied values (variance correction)
+        self.tie_term = 0
+        self._tie_counts = {}
+
+        self.append_only = append_only
+        # Previous Sen's slope and its recent change, to bracket the next search
+        self._last_slope = None
+        self._slope_step = 0.0
+        # None while the window has too many pairs to keep them (see above)
+        self._slopes = _SlopeHeaps() if append_only else np.empty(0)
+        self._sorted = np.empty(0)
+        self._pending = {"slopes_in": [], "slopes_out": [], "values_in": [], "values_out": []}
+
+        # Rows: sum x_i x_(i+k), sum x_i u_(i+k), sum u_i x_(i+k), sum u_i u_(i+k)
+        # (x shifted by x_ref, u = years since t_ref); column k is the lag.
+        self._lags = np.zeros((4, capacity))
+
+    @property
+    def n(self):
+        return self._hi - self._lo
+
+    @property
+    def times(self):
+        return self._t[self._lo:self._hi]
+
+    @property
+    def values(self):
+        return self._x[self._lo:self._hi]
+
+    def _shifted(self, t, x):
+        return x - self.x_ref, (t - self.t_ref) / SECONDS_PER_YEAR
+
+    def _reserve(self):
+        n = self.n
+        if self._hi == len(self._t):
+            # Compact to the front, growing if the window itself is full
+            capacity = len(self._t) * 2 if n > len(self._t) // 2 else len(self._t)
+            for name in ("_t", "_x"):
+                buf = np.empty(capacity)
+                buf[:n] = getattr(self, name)[self._lo:self._hi]
+                setattr(self, name, buf)
+            self._lo, self._hi = 0, n
+        if n + 1 > self._lags.shape[1]:
+            lags = np.zeros((4, 2 * (n + 1)))
+            lags[:, :self._lags.shape[1]] = self._lags
+            self._lags = lags
+
+    def push(self, t, x):
+        """
+        Adds the newest observation.
+        """
+        t, x = float(t), float(x)
+        self._reserve()
+        n = self.n
+        t_w, x_w = self.times, self.values
+
+        # Mann-Kendall S: the new value is later than every value in the window
+        self.s += int(np.sign(x - x_w).sum())
+        count = self._tie_counts.get(x, 0)
+        self.tied_pairs += count
+        self.tie_term += _tie_term(count + 1) - _tie_term(count)
+        self._tie_counts[x] = count + 1
+
+        # New pairwise slopes (same operand order as MannKS, so removal is exact)
+        if (n + 1) * n // 2 > SEN_DIRECT_PAIRS:
+            self._release_slopes()
+        elif self._slopes is not None:
+            dt = t - t_w
+            valid = np.abs(dt) > _EPSILON
+            if self.append_only:
+                self._slopes.extend((x - x_w[valid]) / dt[valid])
+            else:
+                self._pending["slopes_in"].append((x - x_w[valid]) / dt[valid])
+        self._pending["values_in"].append(x)
+
+        # Lag k pairs the new value with the one k positions earlier
+        xs, u = self._shifted(t, x)
+        xs_w, u_w = self._shifted(t_w[::-1], x_w[::-1])
+        lags = self._lags
+        lags[0, 1:n + 1] += xs_w * xs
+        lags[1, 1:n + 1] += xs_w * u
+        lags[2, 1:n + 1] += u_w * xs
+        lags[3, 1:n + 1] += u_w * u
+        lags[:, 0] += (xs * xs, xs * u, u * xs, u * u)
+
+        self._t[self._hi] = t
+        self._x[self._hi] = x
+        self._hi += 1
+
+    def pop(self):
+        """
+        Removes the oldest observation.
+        """
+        if self.append_only:
+            raise ValueError("Observations cannot be removed from an append-only window.")
+        n = self.n
+        t0, x0 = self._t[self._lo], self._x[self._lo]
+        t_r, x_r = self._t[self._lo + 1:self._hi], self._x[self._lo + 1:self._hi]
+
+        self.s -= int(np.sign(x_r - x0).sum())
+        count = self._tie_counts[x0]
+        self.tied_pairs -= count - 1
+        self.tie_term -= _tie_term(count) - _tie_term(count - 1)
+        if count == 1:
+            del self._tie_counts[x0]
+        else:
+            self._tie_counts[x0] = count - 1
+
+        if self._slopes is not None:
+            dt = t_r - t0
+            valid = np.abs(dt) > _EPSILON
+            self._pending["slopes_out"].append((x_r[valid] - x0) / dt[valid])
+        self._pending["values_out"].append(x0)
+
+        xs0, u0 = self._shifted(t0, x0)
+        xs_r, u_r = self._shifted(t_r, x_r)
+        lags = self._lags
+        lags[0, 1:n] -= xs0 * xs_r
+        lags[1, 1:n] -= xs0 * u_r
+        lags[2, 1:n] -= u0 * xs_r
+        lags[3, 1:n] -= u0 * u_r
+        lags[:, 0] -= (xs0 * xs0, xs0 * u0, u0 * xs0, u0 * u0)
+        # The longest lag has no pairs left; clear any rounding residue
+        lags[:, n - 1] = 0.0
+        if n == 1:
+            lags[:, 0] = 0.0
+
+        self._lo += 1
+
+    def _sync(self):
+        """
+        Merges buffered insertions and removals into the sorted structures.
+        """
+        pending = self._pending
+        if self._slopes is not None and not self.append_only:
+            self._slopes = _merge_sorted(self._slopes, pending["slopes_in"], pending["slopes_out"])
+        self._sorted = _merge_sorted(self._sorted, [np.asarray(pending["values_in"])],
+                                     [np.asarray(pending["values_out"])])
+        for buffered in pending.values():
+            buffered.clear()
+
+    def _release_slopes(self):
+        self._slopes = None
+        self._pending["slopes_in"].clear()
+        self._pending["slopes_out"].clear()
+
+    def _sen_slope(self):
+        n = self.n
+        if self._slopes is None and not self.append_only and n * (n - 1) // 2 <= SEN_DIRECT_PAIRS // 2:
+            # Shrunk well below the threshold: rebuild the sorted slopes once
+            t_w, x_w = self.times, self.values
+            parts = [np.empty(0)]
+            for k in range(1, n):
+                dt = t_w[k:] - t_w[:-k]
+                valid = np.abs(dt) > _EPSILON
+                parts.append((x_w[k:] - x_w[:-k])[valid] / dt[valid])
+            self._slopes = np.sort(np.concatenate(parts))
+        if self._slopes is not None:
+            if self.append_only:
+                return self._slopes.median()
+            return _sorted_median(self._slopes)
+        bracket = None
+        if self._last_slope is not None:
+            width = 3 * self._slope_step + 1e-2 * abs(self._last_slope)
+            bracket = (self._last_slope - width, self._last_slope + width)
+        slope = theil_sen(self.times, self.values, bracket=bracket)
+        if self._last_slope is not None and np.isfinite(slope):
+            # Recent changes decay slowly, so one quiet step does not shrink the next bracket
+            self._slope_step = max(abs(slope - self._last_slope), 0.5 * self._slope_step)
+        self._last_slope = slope if np.isfinite(slope) else None
+        return slope
+
+    def sorted_values(self):
+        """
+        The window values, sorted ascending.
+        """
+        self._sync()
+        return self._sorted
+
+    def trend(self):
+        """
+        Mann-Kendall / Sen's slope statistics of the window.
+
+        Follows MannKS conventions for uncensored data (continuity-corrected Z,
+        Tau-b with value ties) so that results match `run_trend_test` with the
+        same backend. The variance of S is corrected for tied values only with
+        trend_backend='native'. With 'mannks' the slope matches only up to
+        100,000 pairs (n <= 447), beyond which MannKS samples the pairs.
+
+        Returns:
+            dict: {'slope', 'p_value', 'tau', 'z'} (slope in units per second).
+        """
+        self._sync()
+        n = self.n
+        s = self.s
+
+        n_pairs = n * (n - 1) / 2.0
+        tie_term = self.tie_term if self.trend_backend == "native" else 0
+        var_s = (n * (n - 1) * (2 * n + 5) - tie_term) / 18.0
+        denom = np.sqrt(n_pairs - self.tied_pairs) * np.sqrt(n_pairs)
+        tau = s / denom if abs(denom) > _EPSILON else 0
+
+        if var_s < _EPSILON:
+            z = 0
+        elif s > 0:
+            z = (s - 1) / np.sqrt(var_s)
+        else:
+            z = (s + 1) / np.sqrt(var_s) if s < 0 else 0
+        p_value = 2 * (1 - norm.cdf(abs(z)))
+
+        return {'slope': self._sen_slope(), 'p_value': p_value, 'tau': tau, 'z': z}
+
+    def neff(self, slope=0.0):
+        """
+        Sum-of-correlations n_eff of the window after an unclamped linear
+        projection with `slope` (units per second); slope 0 gives the raw data.
+
+        Equals `calculate_neff_sum_corr` on the projected window up to rounding.
+        The projection target does not matter: a constant shift cancels when
+        the data are centred.
+        """
+        n = self.n
+        if n < 3:
+            return float(n)
+
+        xs_w, u_w = self._shifted(self.times, self.values)
+        b = slope * SECONDS_PER_YEAR
+
+        # Lags 0 .. int(n/2) - 1 are needed
+        k = np.arange(int(n / 2))
+        m = n - k
+        cum_x = np.concatenate(([0.0], np.cumsum(xs_w)))
+        cum_u = np.concatenate(([0.0], np.cumsum(u_w)))
+        head_x, tail_x = cum_x[m], cum_x[n] - cum_x[k]
+        head_u, tail_u = cum_u[m], cum_u[n] - cum_u[k]
+        mx, mu = cum_x[n] / n, cum_u[n] / n
+
+        # Centred lag sums of y = (x - mean x) - b (u - mean u)
+        xx, xu, ux, uu = self._lags[:, :len(k)]
+        aa = xx - mx * (head_x + tail_x) + m * mx * mx
+        ac = xu - mu * head_x - mx * tail_u + m * mx * mu
+        ca = ux - mx * head_u - mu * tail_x + m * mx * mu
+        cc = uu - mu * (head_u + tail_u) + m * mu * mu
+        cov = aa - b * (ac + ca) + b * b * cc
+
+        var = cov[0] / n
+        if not var > 0:
+            return 1.0
+
+        rho = cov[1:] / (n * var)
+        negative = np.flatnonzero(rho < 0)
+        stop = negative[0] if len(negative) else len(rho)
+        sum_rho = np.sum(rho[:stop] * (1 - k[1:stop + 1] / n))
+
+        n_eff = n / (1 + 2 * sum_rho)
+        return max(2.0, min(float(n), n_eff))
+
+
+def _tie_term(t):
+    return t * (t - 1) * (2 * t + 5)
+
+
+def _sorted_median(sorted_arr):
+    m = len(sorted_arr)
+    if m == 0:
+        return np.nan
+    if m % 2:
+        return sorted_arr[m // 2]
+    return (sorted_arr[m // 2 - 1] + sorted_arr[m // 2]) / 2.0
+
+
+class _SlopeHeaps:
+    """
+    Running median of a growing multiset: a max-heap of the lower half (stored
+    negated) and a min-heap of the upper half, with len(lower) - len(upper) in {0, 1}.
+    """
+
+    def __init__(self):
+        self.lower = []
+        self.upper = []
+
+    def __len__(self):
+        return len(self.lower) + len(self.upper)
+
+    def extend(self, new_values):
+        lower, upper = self.lower, self.upper
+        for value in new_values.tolist():
+            if lower and value > -lower[0]:
+                heapq.heappush(upper, value)
+            else:
+                heapq.heappush(lower, -value)
+        # Rebalance
+        while len(lower) > len(upper) + 1:
+            heapq.heappush(upper, -heapq.heappop(lower))
+        while len(upper) > len(lower):
+            heapq.heappush(lower, -heapq.heappop(upper))
+
+    def median(self):
+        if not self.lower:
+            return np.nan
+        if len(self.lower) > len(self.upper):
+            return np.float64(-self.lower[0])
+        return (np.float64(-self.lower[0]) + np.float64(self.upper[0])) / 2.0
+
+
+def _merge_sorted(sorted_arr, inserts, removals):
+    """
+    Inserts and then removes (one instance per value) buffered values.
+    """
+    if inserts:
+        new = np.sort(np.concatenate(inserts))
+        if len(new):
+            sorted_arr = np.insert(sorted_arr, np.searchsorted(sorted_arr, new), new)
+    if removals:
+        old = np.sort(np.concatenate(removals))
+        if len(old):
+            pos = np.searchsorted(sorted_arr, old, side="left")
+            # Repeated values occupy consecutive positions
+            pos += np.arange(len(old)) - np.searchsorted(old, old, side="left")
+            sorted_arr = np.delete(sorted_arr, pos)
+    return sorted_arr
+
+
+def rolling_tolerance_limits(df, date_col, value_col, window=pd.DateOffset(years=5), step="ME", min_periods=10,
+                             target_percentile=0.95, confidence=0.95, regulatory_limit=None,
+                             use_projection=True, use_neff=True, projection_target_date=None,
+                             small_n_threshold=60, medium_n_threshold=120, distance_threshold=5, sides=2,
+                             min_value=None, max_value=None, trend_backend="mannks"):
+    """
+    Tolerance limit and probability of compliance for rolling or expanding windows.
+
+    Each window (end - window, end] is evaluated as `calculate_tolerance_limit`
+    with the same `trend_backend` would evaluate it, but as the window slides
+    the Mann-Kendall S, the Sen slopes, the lag autocovariance sums used for
+    n_eff and the sorted window are updated incrementally instead of being
+    recomputed. Sen's slope is always the exact median of the window's pairwise
+    slopes, so with the default 'mannks' backend the match holds only for
+    windows of up to 447 observations (100,000 pairs); MannKS samples the pairs
+    of larger windows. With trend_backend='native' it holds at any window size.
+
+    Args:
+        df (pd.DataFrame): Input dataframe.
+        date_col (str): Column name for dates.
+        value_col (str): Column name for values.
+        window (pd.DateOffset, pd.Timedelta or str): Window length, e.g.
+            pd.DateOffset(years=5) (default) or "1826D". None for an expanding window.
+        step (str): Frequency of window end dates (default "ME", month ends).
+        min_periods (int): Minimum observations for a window to be evaluated (default 10).
+        projection_target_date (datetime-like or str, optional): As in
+            `calculate_tolerance_limit`; aliases refer to each window's own dates.
+        trend_backend (str): 'mannks' (default) or 'native' (see `run_trend_test`).
+            The 'seasonal' backend is not available incrementally.
+        (remaining arguments as in `calculate_tolerance_limit`)
+
+    Returns:
+        pd.DataFrame: One row per window end date with 'window_start', 'window_end',
+            'n_obs', the scalar result fields, 'warnings' and 'error'. If
+            `target_percentile` or `confidence` is a sequence, one row per window
+            and (target_percentile, confidence) combination.
+
+    Raises:
+        ValueError: If `trend_backend` is not 'mannks' or 'native'.
+    """
+    times = as_datetime64(df[date_col])
+    order = np.argsort(times, kind="stable")
+    times, values = clean_series(times[order], df[value_col].values[order])
+    values = np.asarray(values, dtype=float)
+    date_numerics = datetime64_to_seconds(times)
+
+    if isinstance(window, str):
+        window = pd.Timedelta(window)
+
+    first, last = pd.Timestamp(times[0]), pd.Timestamp(times[-1])
+    ends = pd.date_range(start=first + window if window is not None else first, end=last, freq=step)
+
+    engine = _IncrementalWindow(t_ref=date_numerics[0], x_ref=np.mean(values), trend_backend=trend_backend)
+    percentiles = np.atleast_1d(target_percentile).tolist()
+    confidences = np.atleast_1d(confidence).tolist()
+    settings = {
+        "sides": sides, "regulatory_limit": regulatory_limit, "small_n_threshold": small_n_threshold,
+        "medium_n_threshold": medium_n_threshold, "distance_threshold": distance_threshold,
+        "min_value": min_value, "max_value": max_value
+    }
+
+    rows = []
+    lo = hi = 0
+    for end in ends:
+        start = end - window if window is not None else None
+        new_hi = times.searchsorted(end.to_datetime64(), side="right")
+        new_lo = times.searchsorted(start.to_datetime64(), side="right") if start is not None else 0
+
+        # Enter before leaving, so a window that jumps past the old one still works
+        while hi < new_hi:
+            engine.push(date_numerics[hi], values[hi])
+            hi += 1
+        while lo < new_lo:
+            engine.pop()
+            lo += 1
+
+        window_row = {"window_start": start if start is not None else first, "window_end": end, "n_obs": engine.n}
+        window_rows = [dict(window_row)]
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            try:
+                if engine.n < min_periods:
+                    raise ValueError(f"Window has {engine.n} observations (min_periods={min_periods}).")
+                # One analysis state per confidence level, shared by the percentiles
+                states = {conf: window_state(engine, conf, use_projection, use_neff, projection_target_date)
+                          for conf in confidences}
+                results = [evaluate_state(*states[conf], p, conf, return_arrays=False, audit=False, **settings)
+                           for p in percentiles for conf in confidences]
+                window_rows = [{**window_row, **res.to_row(), "error": None} for res in results]
+            except Exception as exc:
+                window_rows = [{**window_row, "error": f"{type(exc).__name__}: {exc}"}]
+        message = "; ".join(str(w.message) for w in caught)
+        for row in window_rows:
+            row["warnings"] = message
+        rows.extend(window_rows)
+
+    result = pd.DataFrame(rows)
+    leading = [c for c in result.columns if c not in ("warnings", "error")]
+    return result.reindex(columns=leading + ["warnings", "error"])
+
+
+def window_state(engine, confidence, use_projection=True, use_neff=True, projection_target_date=None):
+    """
+    Builds the analysis state of the current window of `engine`.
+
+    Args:
+        engine (_IncrementalWindow): The window.
+        confidence (float): Confidence level; alpha = 1 - confidence decides trend significance.
+        use_projection (bool): Whether to project a significant trend.
+        use_neff (bool): Whether to use the effective sample size.
+        projection_target_date (datetime-like or str, optional): Projection target
+            (aliases refer to the window's own dates).
+
+    Returns:
+        tuple: (state, trend) as used by `evaluate_state`.
+    """
+    t_w, x_w = engine.times, engine.values
+    n = engine.n
+    check_sample(x_w)
+
+    trend = engine.trend() if use_projection else None
+    is_significant = use_projection and is_trend_significant(trend['z'], 1.0 - confidence)
+
+    clamped = False
+    if is_significant:
+        # Same arithmetic as `apply_projection`
+        target_time = resolve_target_time(t_w, projection_target_date)
+        analysis_data = x_w + trend['slope'] * (target_time - t_w)
+        clamped = bool(np.any(analysis_data < 0))
+        analysis_data[analysis_data < 0] = 0.0
+        data_sorted = np.sort(analysis_data)
+    else:
+        analysis_data = x_w.copy()
+        data_sorted = engine.sorted_values()
+
+    if use_neff:
+        if clamped:
+            # The clamp breaks the linear update; compute directly
+            n_eff = calculate_neff_sum_corr(analysis_data)
+        elif n >= 3 and data_sorted[0] == data_sorted[-1]:
+            n_eff = 1.0
+        else:
+            n_eff = engine.neff(trend['slope'] if is_significant else 0.0)
+        warn_low_neff(n_eff)
+    else:
+        n_eff = float(n)
+
+    state = {
+        "analysis_data": analysis_data,
+        "data_sorted": data_sorted,
+        "z_scores": hazen_z_scores(n),
+        "n_eff": n_eff,
+        "trend_detected": is_significant
+    }
+    return state, trend
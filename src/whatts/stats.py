@@ -1,6 +1,17 @@
+from functools import lru_cache
+
 import numpy as np
 from scipy.stats import norm, chi2
 
+# Number of sample sizes whose Hazen ranks and z-scores are kept (see `hazen_z_scores`)
+HAZEN_CACHE_SIZE = 256
+
+# From this sample size, `hazen_interpolate` and `inverse_hazen` select the few
+# order statistics they need (np.partition, O(n)) instead of sorting the data,
+# when at most `SELECTION_MAX_RANKS` ranks (or one value) are requested.
+SELECTION_THRESHOLD = 100_000
+SELECTION_MAX_RANKS = 16
+
 def hazen_interpolate(data, target_rank, min_value=None, max_value=None):
     """
     Interpolates a value from 'data' at the specific 'target_rank' (0 to 1)
@@ -8,7 +19,9 @@ def hazen_interpolate(data, target_rank, min_value=None, max_value=None):
 
     Args:
         data (array-like): Input data values.
-        target_rank (float): The percentile rank to estimate (0-1).
+        target_rank (float or array-like): The percentile rank(s) to estimate (0-1).
+            An array of ranks is evaluated in one vectorized pass over a single
+            sort of the data.
         min_value (float, optional): Minimum allowed physical value (clamping).
         max_value (float, optional): Maximum allowed physical value (clamping).
 
@@ -16,18 +29,106 @@ def hazen_interpolate(data, target_rank, min_value=None, max_value=None):
         tuple: (value, clamped_note)
             value (float): The interpolated/extrapolated value.
             clamped_note (str): "None", "Min Clamped", or "Max Clamped".
+            For an array of ranks, both are arrays of the same shape.
+    """
+    data = np.asarray(data)
+    if len(data) >= SELECTION_THRESHOLD and np.size(target_rank) <= SELECTION_MAX_RANKS:
+        data_sorted, z_scores = _select_order_statistics(data, target_rank)
+    else:
+        data_sorted = np.sort(data)
+        z_scores = hazen_z_scores(len(data_sorted))
+    return interpolate_sorted(data_sorted, z_scores, target_rank,
+                              min_value=min_value, max_value=max_value)
+
+def _select_order_statistics(data, target_rank):
+    """
+    The order statistics (and their Hazen Z-scores) that probit interpolation
+    at `target_rank` can touch, found by partial sorting.
+
+    The interpolation only reads the two points bracketing each target Z and
+    the first / last two points (tail extrapolation). Keeping exactly those,
+    in order, gives the same result as the fully sorted data.
     """
-    data_sorted = np.sort(data)
     n = len(data)
-    hazen_ranks = (np.arange(1, n + 1) - 0.5) / n
+    ranks = np.clip(np.atleast_1d(np.asarray(target_rank, dtype=float)), 1e-9, 1.0 - 1e-9)
+
+    # Bracketing index j has (j + 0.5) / n <= rank; keep a margin of one either side
+    j = np.floor(np.nan_to_num(ranks) * n - 0.5).astype(np.int64)
+    positions = np.concatenate([[0, 1, n - 2, n - 1], (j[:, None] + np.arange(-1, 3)).ravel()])
+    positions = np.unique(np.clip(positions, 0, n - 1))
+
+    selected = _partition_select(data, positions)
+    # Same arithmetic as `hazen_ranks` at these positions
+    z_scores = norm.ppf(((positions + 1) - 0.5) / n)
+    return selected, z_scores
+
+def hazen_z_scores(n):
+    """
+    Probit (Z-score) transform of the Hazen plotting positions (i - 0.5) / n.
+
+    The array is cached per sample size and shared between callers, so it is
+    read-only (see `hazen_cache_info`).
+    """
+    return _hazen_arrays(n)[1]
+
+def hazen_ranks(n):
+    """
+    Hazen plotting positions (i - 0.5) / n for i = 1 .. n (cached, read-only).
+    """
+    return _hazen_arrays(n)[0]
+
+@lru_cache(maxsize=HAZEN_CACHE_SIZE)
+def _hazen_arrays(n):
+    # Shared by every interpolation helper; batch runs and simulations see the
+    # same few sample sizes many times. lru_cache is thread-safe, and the
+    # arrays are frozen so no caller can modify another's copy.
+    ranks = (np.arange(1, n + 1) - 0.5) / n
+    z_scores = norm.ppf(ranks)
+    ranks.setflags(write=False)
+    z_scores.setflags(write=False)
+    return ranks, z_scores
+
+def hazen_cache_info():
+    """
+    Hit/miss counters of the Hazen rank / z-score cache.
+
+    Returns:
+        dict: {'hits', 'misses', 'maxsize', 'currsize'}
+    """
+    return _hazen_arrays.cache_info()._asdict()
+
+def hazen_cache_clear():
+    """
+    Empties the Hazen rank / z-score cache and resets its counters.
+    """
+    _hazen_arrays.cache_clear()
+
+def interpolate_sorted(data_sorted, z_scores, target_rank, min_value=None, max_value=None):
+    """
+    Core of `hazen_interpolate` for data that is already sorted.
+
+    Lets callers that evaluate several ranks on the same data sort it and
+    compute the Hazen Z-scores once.
+
+    Args:
+        data_sorted (np.array): Data sorted ascending.
+        z_scores (np.array): `hazen_z_scores(len(data_sorted))`.
+        target_rank (float or array-like): The percentile rank(s) to estimate (0-1).
+        min_value (float, optional): Minimum allowed physical value (clamping).
+        max_value (float, optional): Maximum allowed physical value (clamping).
+
+    Returns:
+        tuple: (value, clamped_note), as for `hazen_interpolate`.
+    """
+    if np.ndim(target_rank) > 0:
+        return _interpolate_sorted_many(data_sorted, z_scores, target_rank, min_value, max_value)
+
+    n = len(data_sorted)
 
     # --- CHANGE: Probit Interpolation ---
     # Instead of linear interpolation on p (flat tails), we interpolate on Z (curved tails).
     # This also allows extrapolation beyond the data range.
 
-    # Transform Hazen ranks to Z-scores
-    z_scores = norm.ppf(hazen_ranks)
-
     # Transform target rank to target Z
     # Clamp rank to avoid infinity, though Hazen avoids 0/1 for the data ranks.
     # Floating point precision limits: ~1e-16 is epsilon, so 1e-9 is safe.
@@ -62,29 +163,146 @@ def hazen_interpolate(data, target_rank, min_value=None, max_value=None):
 
     return val, clamped_note
 
+def _interpolate_sorted_many(data_sorted, z_scores, target_ranks, min_value=None, max_value=None):
+    """
+    Vectorized `interpolate_sorted` for an array of ranks (same arithmetic per rank).
+    """
+    n = len(data_sorted)
+    safe_ranks = np.clip(np.asarray(target_ranks, dtype=float), 1e-9, 1.0 - 1e-9)
+    z_target = norm.ppf(safe_ranks)
+
+    if n < 2:
+        values = np.full(z_target.shape, data_sorted[0], dtype=float)
+    else:
+        # Interpolation (Piecewise Linear in Z-space)
+        values = np.interp(z_target, z_scores, data_sorted)
+
+        # Upper / Lower Tail Extrapolation from the last / first two points
+        upper = z_target > z_scores[-1]
+        if upper.any():
+            slope = (data_sorted[-1] - data_sorted[-2]) / (z_scores[-1] - z_scores[-2])
+            values[upper] = data_sorted[-1] + slope * (z_target[upper] - z_scores[-1])
+        lower = z_target < z_scores[0]
+        if lower.any():
+            slope = (data_sorted[1] - data_sorted[0]) / (z_scores[1] - z_scores[0])
+            values[lower] = data_sorted[0] + slope * (z_target[lower] - z_scores[0])
+
+    # Apply Clamping (a minimum clamp takes precedence, as in the scalar path)
+    notes = np.full(z_target.shape, "None", dtype=object)
+    if min_value is not None:
+        below = values < min_value
+        values[below] = min_value
+        notes[below] = "Min Clamped"
+    else:
+        below = np.zeros(z_target.shape, dtype=bool)
+    if max_value is not None:
+        above = (values > max_value) & ~below
+        values[above] = max_value
+        notes[above] = "Max Clamped"
+
+    return values, notes
+
 def inverse_hazen(data, value):
     """
     Finds the percentile rank (0 to 1) of a specific value within the data
     using Hazen plotting positions.
+
+    For large samples and a single value, the rank is found from the
+    neighbouring order statistics in O(n) instead of sorting the data.
     """
-    data_sorted = np.sort(data)
-    n = len(data)
+    data = np.asarray(data)
+    if len(data) >= SELECTION_THRESHOLD and np.ndim(value) == 0 and not np.isnan(value) \
+            and not np.isnan(data).any():
+        return _inverse_select(data, value)
+    return inverse_sorted(np.sort(data), value)
+
+def _partition_select(data, positions):
+    """
+    Values at sorted `positions` of the sorted data, without a full sort.
 
-    # Hazen ranks for the sorted data
-    hazen_ranks = (np.arange(1, n + 1) - 0.5) / n
+    Partitions a single copy of the data in place around the middle requested
+    position, then each side around its own positions. This is considerably
+    faster than `np.partition` with many `kth` at once.
+    """
+    work = np.array(data, dtype=float)
+    segments = [(0, len(work), positions)]
+    while segments:
+        lo, hi, wanted = segments.pop()
+        if len(wanted) == 0:
+            continue
+        if hi - lo <= 64:
+            work[lo:hi].sort()
+            continue
+        middle = wanted[len(wanted) // 2]
+        work[lo:hi].partition(middle - lo)
+        segments.append((lo, middle, wanted[wanted < middle]))
+        segments.append((middle + 1, hi, wanted[wanted > middle]))
+    return work[positions]
+
+def _inverse_select(data, value):
+    """
+    `inverse_sorted` from the two order statistics that bracket `value`.
+    """
+    n = len(data)
+    below = data <= value
+    count = int(np.count_nonzero(below))
+
+    # Largest value <= `value` (position count - 1) and smallest above it (position count)
+    xp, fp = [], []
+    if count > 0:
+        xp.append(np.where(below, data, -np.inf).max())
+        fp.append((count - 0.5) / n)
+    if count < n:
+        xp.append(np.where(below, np.inf, data).min())
+        fp.append((count + 1 - 0.5) / n)
+    return np.interp(value, xp, fp, left=0.0, right=1.0)
+
+def inverse_sorted(data_sorted, value):
+    """
+    Core of `inverse_hazen` for data that is already sorted.
+    """
+    # Hazen ranks for the sorted data (cached per sample size)
+    ranks = hazen_ranks(len(data_sorted))
 
     # We use interpolation to find the rank of 'value'
     # Note: np.interp expects x-coordinates to be sorted.
-    # Here, data_sorted are the x-coordinates, hazen_ranks are the y-coordinates.
+    # Here, data_sorted are the x-coordinates, ranks are the y-coordinates.
     # We set left=0.0 and right=1.0 to handle values outside the data range.
-    rank = np.interp(value, data_sorted, hazen_ranks, left=0.0, right=1.0)
+    rank = np.interp(value, data_sorted, ranks, left=0.0, right=1.0)
 
     return rank
 
-def calculate_neff_sum_corr(data):
+# Series at least this long may use the FFT autocovariance in `calculate_neff_sum_corr`
+# (see scripts/benchmark_neff.py for the crossover).
+NEFF_FFT_THRESHOLD = 500
+# Lags tried with the direct loop first; most series without persistent
+# autocorrelation reach a negative lag within them.
+NEFF_DIRECT_LAGS = 8
+
+def calculate_neff_sum_corr(data, method="auto"):
     """
     Calculates Effective Sample Size (n_eff) using Sum of Correlations.
-    (Unchanged from v1)
+
+    n_eff = n / (1 + 2 * sum_k rho_k * (1 - k/n)), summing lags k = 1 .. n/2 - 1
+    up to the first negative autocorrelation, clipped to [2, n]. Constant
+    data give 1.0. The `method` only changes how the autocorrelations are
+    computed, not the estimator.
+
+    Args:
+        data (np.array): The series.
+        method (str): 'direct' computes each lag's autocovariance with a
+            dot product and stops at the first negative one (O(n^2) when the
+            correlation stays positive), 'fft' obtains all lags from one FFT
+            (O(n log n)). 'auto' (default) runs the direct loop, but from
+            `NEFF_FFT_THRESHOLD` points it switches to the FFT if no negative
+            lag is found within the first `NEFF_DIRECT_LAGS` lags. Both give the
+            same estimator; they differ only by floating-point rounding.
+
+    Returns:
+        float: Effective sample size.
+
+    Raises:
+        ValueError: If `method` is not 'auto', 'direct' or 'fft'.
     """
     n = len(data)
     if n < 3: return float(n)
@@ -96,15 +314,49 @@ def calculate_neff_sum_corr(data):
     # Return 1.0 to represent a single effective observation.
     if var == 0: return 1.0
 
-    sum_rho = 0.0
-    for k in range(1, int(n / 2)):
-        rho_k = np.sum(y[:-k] * y[k:]) / (n * var)
-        if rho_k < 0: break
-        sum_rho += rho_k * (1 - k/n)
+    max_direct_lag = int(n / 2)
+    if method == "auto" and n >= NEFF_FFT_THRESHOLD:
+        max_direct_lag = min(max_direct_lag, NEFF_DIRECT_LAGS + 1)
+
+    if method in ("direct", "auto"):
+        sum_rho = 0.0
+        for k in range(1, max_direct_lag):
+            rho_k = np.sum(y[:-k] * y[k:]) / (n * var)
+            if rho_k < 0: break
+            sum_rho += rho_k * (1 - k/n)
+        else:
+            # Every lag tried was positive; finish with the FFT
+            if max_direct_lag < int(n / 2):
+                method = "fft"
+    elif method != "fft":
+        raise ValueError(f"Unknown n_eff method: {method}")
+
+    if method == "fft":
+        # Lag-k sums of y_i * y_(i+k) for k < n/2 from the zero-padded FFT
+        lags = int(n / 2)
+        rho = autocovariance_fft(y, lags)[1:] / (n * var)
+        negative = np.flatnonzero(rho < 0)
+        stop = negative[0] if len(negative) else len(rho)
+        k = np.arange(1, stop + 1)
+        sum_rho = float(np.sum(rho[:stop] * (1 - k / n)))
 
     n_eff = n / (1 + 2 * sum_rho)
     return max(2.0, min(float(n), n_eff))
 
+def autocovariance_fft(y, max_lag):
+    """
+    Unnormalised autocovariance sums sum_i y_i * y_(i+k) for k = 0 .. max_lag - 1.
+
+    Uses a real FFT zero-padded to at least 2n - 1 points, so the circular
+    correlation equals the linear one.
+    """
+    from scipy.fft import rfft, irfft, next_fast_len
+
+    n = len(y)
+    n_fft = next_fast_len(2 * n - 1, real=True)
+    spectrum = rfft(y, n_fft)
+    return irfft(spectrum.real**2 + spectrum.imag**2, n_fft)[:max_lag]
+
 def score_test_probability(p_obs, p_null, n_eff):
     """
     Calculates the one-sided probability that the true proportion is <= p_null
@@ -113,12 +365,12 @@ def score_test_probability(p_obs, p_null, n_eff):
     This is the direct counterpart to the Wilson Interval.
 
     Args:
-        p_obs (float): The rank of the target value in the observed data.
+        p_obs (float or np.array): The rank(s) of the target value(s) in the observed data.
         p_null (float): The regulatory target percentile (e.g., 0.95).
         n_eff (float): Effective sample size.
 
     Returns:
-        float: Probability of compliance (0.0 to 1.0).
+        float or np.array: Probability of compliance (0.0 to 1.0).
     """
     # Prevent division by zero if n_eff is weird
     if n_eff <= 0: return 0.0
@@ -215,6 +467,82 @@ def wilson_score_interval(p_hat, n, n_eff=None, conf_level=0.95, sides=2,
 
     return max(0.0, lower_lim), min(1.0, upper_lim), method_used
 
+# Method names indexed by the codes returned by `wilson_score_interval_array`
+WH_METHODS = ("Standard Wilson-Hazen", "Chi-Square Correction")
+
+def wilson_score_interval_array(p_hat, n, n_eff=None, conf_level=0.95, sides=2,
+                                small_n_threshold=60, medium_n_threshold=120, distance_threshold=5):
+    """
+    Broadcasting version of `wilson_score_interval`.
+
+    Every argument may be a scalar or an array; they are broadcast together
+    and the Wilson bounds and Chi-Square boundary corrections are evaluated
+    with masks. Each element is bit-identical to the scalar function.
+
+    Args:
+        (as in `wilson_score_interval`, each scalar or array-like)
+
+    Returns:
+        tuple: (lower_lim, upper_lim, method_code) arrays of the broadcast shape.
+            method_code indexes `WH_METHODS` (0 = Standard Wilson-Hazen,
+            1 = Chi-Square Correction).
+    """
+    if n_eff is None:
+        n_eff = np.asarray(n, dtype=float)
+
+    p_hat, n_eff, conf_level, sides, small_n, medium_n, distance = np.broadcast_arrays(
+        *(np.asarray(arg, dtype=float) for arg in
+          (p_hat, n_eff, conf_level, sides, small_n_threshold, medium_n_threshold, distance_threshold))
+    )
+    # Masked assignment needs at least 1-D arrays; the result is reshaped at the end
+    shape = p_hat.shape
+    p_hat, n_eff, conf_level, sides, small_n, medium_n, distance = (
+        np.atleast_1d(arg) for arg in (p_hat, n_eff, conf_level, sides, small_n, medium_n, distance)
+    )
+
+    alpha = 1 - conf_level
+    alpha_tail = alpha / sides
+
+    # --- Z-Score based on sides ---
+    z = norm.ppf(1 - alpha_tail)
+
+    # --- Standard Wilson Calculation ---
+    denom = 1 + (z**2 / n_eff)
+    center = (p_hat + (z**2 / (2 * n_eff)))
+
+    term_inside_sqrt = (p_hat * (1 - p_hat) / n_eff) + (z**2 / (4 * n_eff**2))
+    error_margin = np.sqrt(np.maximum(0.0, term_inside_sqrt))
+
+    lower_lim = (center - z * error_margin) / denom
+    upper_lim = (center + z * error_margin) / denom
+
+    # --- Boundary Corrections (Chi-Square) ---
+    is_small = n_eff <= small_n
+    is_med = (small_n < n_eff) & (n_eff <= medium_n)
+
+    # 1. Upper Bound Logic
+    dist_from_top = n_eff * (1 - p_hat)
+    top = (is_small | is_med) & (dist_from_top <= distance)
+    upper_lim[top & (dist_from_top <= 0)] = 1.0
+    chi_top = top & (dist_from_top > 0)
+    if chi_top.any():
+        upper_lim[chi_top] = 1.0 - 0.5 * chi2.ppf(alpha_tail[chi_top], 2 * dist_from_top[chi_top]) / n_eff[chi_top]
+
+    # 2. Lower Bound Logic
+    dist_from_bottom = n_eff * p_hat
+    bottom = (is_small | is_med) & (dist_from_bottom <= distance)
+    lower_lim[bottom & (dist_from_bottom <= 0)] = 0.0
+    chi_bottom = bottom & (dist_from_bottom > 0)
+    if chi_bottom.any():
+        lower_lim[chi_bottom] = 0.5 * chi2.ppf(alpha_tail[chi_bottom], 2 * dist_from_bottom[chi_bottom]) / n_eff[chi_bottom]
+
+    # 3. Handle perfect compliance edge case (p_hat=1.0)
+    upper_lim[p_hat >= 1.0] = 1.0
+
+    method_code = (top | bottom).astype(np.int8)
+    return (np.maximum(0.0, lower_lim).reshape(shape), np.minimum(1.0, upper_lim).reshape(shape),
+            method_code.reshape(shape))
+
 # Alias for backward compatibility if needed, but we update callers.
 def wilson_score_upper_tolerance(*args, **kwargs):
     # This wrapper maintains the return signature of the old function if it was different,
@@ -0,0 +1,157 @@
+import pandas as pd
+from .prepared import evaluate_state, state_compliance_curve, state_compliance_probability
+from .rolling import _INCREMENTAL_BACKENDS, _IncrementalWindow, window_state
+
+
+class StreamingSeries:
+    """
+    A monitoring series that grows one observation at a time.
+
+    Each `append` updates the Mann-Kendall S and tie counts, the Sen's slope
+    running median, the sorted values and the lag cross-product sums used for
+    the sum-of-correlations n_eff, so re-evaluating compliance after an arrival
+    costs O(n log n) instead of a full `calculate_tolerance_limit` call
+    (whose trend test and n_eff loop are O(n^2)).
+
+    Results are the same as `calculate_tolerance_limit` with the same
+    `trend_backend` on all observations received so far: the trend statistics,
+    Sen's slope, projection and point estimates match exactly, and n_eff (hence
+    the Wilson limits and the probability of compliance) matches to
+    floating-point rounding. Sen's slope is always the exact median of all
+    pairwise slopes. With trend_backend='native' this holds at any length; with
+    'mannks' it holds up to 447 observations (100,000 pairs), beyond which
+    MannKS samples the pairs and its slope can differ.
+
+    Observations must arrive in date order. Missing values are skipped.
+
+    Example:
+        >>> series = StreamingSeries()
+        >>> for date, value in feed:
+        ...     series.append(date, value)
+        ...     if series.n >= 10:
+        ...         series.probability_of_compliance(540)
+    """
+
+    def __init__(self, use_projection=True, use_neff=True, projection_target_date=None, trend_backend="mannks"):
+        """
+        Args:
+            use_projection (bool): Whether to project data to current state using trends (default True).
+            use_neff (bool): Whether to adjust for autocorrelation using effective sample size (default True).
+            projection_target_date (datetime-like or str, optional): Date to project the trend to.
+            trend_backend (str): 'mannks' (default) or 'native' (see `run_trend_test`).
+                The 'seasonal' backend is not available incrementally.
+
+        Raises:
+            ValueError: If `trend_backend` is not 'mannks' or 'native'.
+        """
+        if trend_backend not in _INCREMENTAL_BACKENDS:
+            raise ValueError(f"Trend backend {trend_backend!r} cannot be updated incrementally. "
+                             f"Choose from {_INCREMENTAL_BACKENDS}.")
+        self.trend_backend = trend_backend
+        self.use_projection = use_projection
+        self.use_neff = use_neff
+        self.projection_target_date = projection_target_date
+        self.last_date = None
+        self._engine = None
+        self._states = {}
+
+    @classmethod
+    def from_dataframe(cls, df, date_col, value_col, **kwargs):
+        """
+        Builds a StreamingSeries from the existing history in a DataFrame.
+        """
+        series = cls(**kwargs)
+        df = df.sort_values(by=date_col, kind="mergesort")
+        series.extend(df[date_col], df[value_col].values)
+        return series
+
+    @property
+    def n(self):
+        """
+        Number of (non-missing) observations received.
+        """
+        return 0 if self._engine is None else self._engine.n
+
+    @property
+    def trend(self):
+        """
+        Current trend test result {'slope', 'p_value', 'tau', 'z'} (None if projection is disabled).
+        """
+        if not self.use_projection or self._engine is None:
+            return None
+        return self._engine.trend()
+
+    def append(self, date, value):
+        """
+        Adds one observation.
+
+        Raises:
+            ValueError: If `date` is earlier than the last observation.
+        """
+        date = pd.Timestamp(date)
+        if self.last_date is not None and date < self.last_date:
+            raise ValueError(f"Observations must arrive in date order ({date} is before {self.last_date}).")
+        self.last_date = date
+        if pd.isna(value):
+            return
+
+        t = date.timestamp()
+        if self._engine is None:
+            # References keep the running lag sums well conditioned
+            self._engine = _IncrementalWindow(t_ref=t, x_ref=float(value), append_only=True,
+                                              trend_backend=self.trend_backend)
+        self._engine.push(t, value)
+        self._states.clear()
+
+    def extend(self, dates, values):
+        """
+        Adds several observations in date order.
+        """
+        for date, value in zip(pd.to_datetime(dates), values):
+            self.append(date, value)
+
+    def state(self, confidence=0.95):
+        """
+        Analysis state of the current series at the given confidence level.
+
+        Returns:
+            dict: {'analysis_data', 'data_sorted', 'z_scores', 'n_eff', 'trend_detected'}
+        """
+        if self._engine is None:
+            raise ValueError("Sample size too small (n < 5).")
+        if confidence not in self._states:
+            self._states[confidence] = window_state(
+                self._engine, confidence, self.use_projection, self.use_neff,
+                self.projection_target_date
+            )[0]
+        return self._states[confidence]
+
+    def probability_of_compliance(self, regulatory_limit, target_percentile=0.95, confidence=0.95):
+        """
+        Probability that the true target percentile is at or below `regulatory_limit`.
+        """
+        return state_compliance_probability(self.state(confidence), regulatory_limit, target_percentile)
+
+    def compliance_curve(self, limits, target_percentile=0.95, confidence=0.95):
+        """
+        Probability of compliance over a grid of candidate limits (see `PreparedSeries.compliance_curve`).
+        """
+        return state_compliance_curve(self.state(confidence), limits, target_percentile)
+
+    def tolerance_limit(self, target_percentile=0.95, confidence=0.95, sides=2, regulatory_limit=None,
+                        small_n_threshold=60, medium_n_threshold=120, distance_threshold=5,
+                        min_value=None, max_value=None, return_arrays=True, audit=True):
+        """
+        Evaluates the tolerance limit for the observations received so far.
+
+        Arguments are as in `calculate_tolerance_limit`.
+
+        Returns:
+            ToleranceResult: The same result as `calculate_tolerance_limit` (projection method).
+        """
+        return evaluate_state(
+            self.state(confidence), self.trend, target_percentile, confidence, sides=sides,
+            regulatory_limit=regulatory_limit, small_n_threshold=small_n_threshold,
+            medium_n_threshold=medium_n_threshold, distance_threshold=distance_threshold,
+            min_value=min_value, max_value=max_value, return_arrays=return_arrays, audit=audit
+        )
@@ -0,0 +1,660 @@
+import numpy as np
+from scipy.stats import norm
+
+# MannKS tolerances for a zero variance / zero time difference
+_EPSILON = 1e-10
+
+# Series with at most this many pairs get Sen's slope from every pairwise
+# slope; longer ones use the selection in `theil_sen`.
+SEN_DIRECT_PAIRS = 1_000_000
+
+
+def mann_kendall(date_numerics, values):
+    """
+    Mann-Kendall trend test and Sen's slope without the O(n^2) pair loop for S.
+
+    S is obtained from the number of discordant pairs, counted with a
+    bottom-up merge sort (Knight's algorithm) in O(n log n):
+    S = n_pairs - tied_pairs - 2 * discordant.
+
+    Conventions follow MannKS for uncensored data, so S, Tau-b and the
+    continuity-corrected Z agree with `MannKS.trend_test` on the same series:
+    observations are taken in date order (equal dates keep their order) and
+    Tau-b accounts for tied values. The one difference is that the variance of
+    S is corrected for tied values,
+
+        var(S) = [n(n-1)(2n+5) - sum_t t(t-1)(2t+5)] / 18,
+
+    (MannKS applies no tie correction to uncensored data), so Z and the p-value
+    differ slightly for series with repeated values.
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch, ascending.
+        values (np.array): Numeric values (no missing values).
+
+    Returns:
+        dict: {
+            'slope': float,     # Sen's slope in units per second
+            'p_value': float,
+            'tau': float,
+            'z': float,         # Continuity-corrected Mann-Kendall Z
+            's': int,
+            'var_s': float
+        }
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+
+    # 1. Ranks of the values (tied values share a rank) and the tie groups
+    _, ranks, tie_counts = np.unique(values, return_inverse=True, return_counts=True)
+    tie_counts = tie_counts.astype(np.int64)
+
+    # 2. S from the discordant pairs
+    n_pairs = n * (n - 1) // 2
+    tied_pairs = int(np.sum(tie_counts * (tie_counts - 1) // 2))
+    s = n_pairs - tied_pairs - 2 * count_inversions(ranks)
+
+    # 3. Variance of S with the correction for tied values
+    var_s = (n * (n - 1) * (2 * n + 5) - np.sum(tie_counts * (tie_counts - 1) * (2 * tie_counts + 5))) / 18.0
+
+    # 4. Tau-b (no ties in time, which is taken in order)
+    denom = np.sqrt(n_pairs - tied_pairs) * np.sqrt(n_pairs)
+    tau = s / denom if abs(denom) > _EPSILON else 0
+
+    # 5. Continuity-corrected Z and two-sided p-value
+    if var_s < _EPSILON:
+        z = 0
+    elif s > 0:
+        z = (s - 1) / np.sqrt(var_s)
+    else:
+        z = (s + 1) / np.sqrt(var_s) if s < 0 else 0
+    p_value = 2 * (1 - norm.cdf(abs(z)))
+
+    return {
+        'slope': sens_slope(date_numerics, values),
+        'p_value': p_value,
+        'tau': tau,
+        'z': z,
+        's': int(s),
+        'var_s': var_s
+    }
+
+
+def count_inversions(ranks):
+    """
+    Number of pairs i < j with ranks[i] > ranks[j] (equal ranks are not counted).
+
+    Bottom-up merge sort (Knight, 1966), vectorized per merge level: at each
+    level every element of a right half counts the larger elements of its
+    left half with one `searchsorted` over the sorted left halves. O(n log^2 n)
+    array work in log2(n) NumPy passes.
+
+    Args:
+        ranks (np.array): Integer ranks in [0, n).
+
+    Returns:
+        int: Number of inversions.
+    """
+    keys = np.asarray(ranks, dtype=np.int64)
+    n = len(keys)
+    position = np.arange(n)
+    inversions = 0
+
+    width = 1
+    while width < n:
+        # Halves of `width` are sorted; offset each merged block so that the
+        # concatenated left halves are globally sorted
+        block = position // (2 * width)
+        offset = block * n
+        is_right = (position // width) % 2 == 1
+
+        left = keys[~is_right] + offset[~is_right]
+        right = keys[is_right] + offset[is_right]
+        # A left half followed by a right half is full, so block b's ends at index (b + 1) * width of `left`
+        left_end = (block[is_right] + 1) * width
+        inversions += int(np.sum(left_end - np.searchsorted(left, right, side="right")))
+
+        # Merge: sort within blocks of 2 * width
+        keys = np.sort(keys + offset) - offset
+        width *= 2
+
+    return inversions
+
+
+def sens_slope(date_numerics, values):
+    """
+    Sen's slope: the median of all pairwise slopes (x_j - x_i) / (t_j - t_i)
+    over pairs with distinct times (|t_j - t_i| > 1e-10, as in MannKS).
+
+    Unlike MannKS, which samples pairs once there are more than 100,000 of
+    them, the median is always exact. Up to `SEN_DIRECT_PAIRS` pairs every
+    slope is computed; larger series use `theil_sen`.
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch, ascending.
+        values (np.array): Numeric values.
+
+    Returns:
+        float: Slope in units per second (NaN if no pair has distinct times).
+    """
+    t = np.asarray(date_numerics, dtype=float)
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+    if n * (n - 1) // 2 > SEN_DIRECT_PAIRS:
+        return theil_sen(t, x)
+
+    # Pairs at each lag k, one lag at a time to bound the temporary arrays
+    slopes = np.empty(n * (n - 1) // 2)
+    filled = 0
+    for k in range(1, n):
+        dt = t[k:] - t[:-k]
+        valid = np.abs(dt) > _EPSILON
+        m = np.count_nonzero(valid)
+        slopes[filled:filled + m] = (x[k:] - x[:-k])[valid] / dt[valid]
+        filled += m
+
+    if filled == 0:
+        return np.nan
+    return float(np.median(slopes[:filled]))
+
+
+def theil_sen(date_numerics, values, confidence=None, seed=0, bracket=None):
+    """
+    Sen's slope by randomized selection, without materializing all slopes.
+
+    The number of pairwise slopes below a trial slope s is the number of
+    inversions of y = x - s * t (in time order), which `count_inversions`
+    finds in O(n log n). Starting from all pairs, each round samples slopes
+    uniformly from the current slope interval, narrows it around the target
+    rank(s) and checks the new bounds by counting. Once the interval holds a
+    few times n slopes they are enumerated and the exact order statistics
+    selected. Expected cost is O(n log^2 n) time and O(n) memory per round;
+    a 50,000-point record (1.25 billion slopes) needs two or three rounds.
+
+    The result equals the median of all pairwise slopes, except that when the
+    target rank falls in a block of more than `max(4n, 2^20)` slopes which agree
+    to rounding (~1e-13 relative), that common value is returned.
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch.
+        values (np.array): Numeric values (no missing values).
+        confidence (float, optional): If given, also return the two-sided
+            confidence bounds of the slope at this level (Gilbert, 1987): the
+            slopes of rank (N -/+ z * sqrt(var(S))) / 2 among the N pairwise
+            slopes, with var(S) corrected for tied values and ranks rounded as
+            in MannKS ('direct' method).
+        seed (int or np.random.Generator): Randomness for the sampling rounds;
+            the result does not depend on it.
+        bracket (tuple, optional): Slopes (lo, hi) expected to enclose the
+            median, e.g. around the slope of an overlapping window. If they
+            do (checked by counting), the search starts from them instead of
+            from all pairs; the result does not depend on it.
+
+    Returns:
+        float: Slope in units per second (NaN if no pair has distinct times),
+            or (slope, lower, upper) if `confidence` is given.
+    """
+    t = np.asarray(date_numerics, dtype=float)
+    x = np.asarray(values, dtype=float)
+    order = np.lexsort((x, t))
+    selector = _SlopeSelector(t[order], x[order], seed)
+    n_slopes = selector.n_slopes
+
+    if n_slopes == 0:
+        slope = np.nan
+    else:
+        middle = [n_slopes // 2] if n_slopes % 2 else [n_slopes // 2 - 1, n_slopes // 2]
+        slope = float(np.median(selector.select(middle, bracket=bracket)))
+    if confidence is None:
+        return slope
+    if n_slopes == 0:
+        return slope, np.nan, np.nan
+
+    n = len(x)
+    _, tie_counts = np.unique(x, return_counts=True)
+    var_s = (n * (n - 1) * (2 * n + 5) - np.sum(tie_counts * (tie_counts - 1) * (2 * tie_counts + 5))) / 18.0
+    c = norm.ppf(1 - (1 - confidence) / 2) * np.sqrt(var_s)
+    lower_rank = int(np.clip(np.round((n_slopes - c) / 2 - 1), 0, n_slopes - 1))
+    upper_rank = int(np.clip(np.round((n_slopes + c) / 2 - 1), 0, n_slopes - 1))
+    lower = float(selector.select([lower_rank])[0])
+    upper = float(selector.select([upper_rank])[0])
+    return slope, lower, upper
+
+
+class _SlopeSelector:
+    """
+    Order statistics of the pairwise slopes of a series sorted by (time, value).
+
+    Slope intervals are half-open [lo, hi); `count_below(s)` is the number of
+    slopes below s. Pairs with equal times have no slope: they are adjacent
+    with values ascending, so they are never inverted.
+    """
+
+    def __init__(self, t, x, seed=0):
+        self.t, self.x = t, x
+        n = len(x)
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+
+        unique_times, time_counts = np.unique(t, return_counts=True)
+        self.n_slopes = n * (n - 1) // 2 - int(np.sum(time_counts * (time_counts - 1) // 2))
+        if self.n_slopes == 0:
+            return
+
+        # Centred times keep y = x - s * t well conditioned
+        self.t_centred = t - t[n // 2]
+        # Bound on the error of classifying a slope against s through y
+        # (rounding of y and of the slope itself, relative to the closest times)
+        dt_min = np.min(np.diff(unique_times))
+        self._error_scale = 64 * np.finfo(float).eps / dt_min
+        self._x_abs = np.max(np.abs(x))
+        self._t_abs = np.max(np.abs(t))
+
+        # Ranks at s = +inf: every pair with distinct times is inverted
+        top = np.empty(n, dtype=np.int64)
+        top[np.lexsort((x, -t))] = np.arange(n)
+        self._top_ranks = top
+
+    def tolerance(self, s):
+        return self._error_scale * (self._x_abs + abs(s) * self._t_abs) + 64 * np.finfo(float).eps * abs(s)
+
+    def _ranks(self, s):
+        if s == np.inf:
+            return self._top_ranks
+        return np.unique(self.x - s * self.t_centred, return_inverse=True)[1]
+
+    def count_below(self, s):
+        if s == -np.inf:
+            return 0
+        if s == np.inf:
+            return self.n_slopes
+        return count_inversions(self._ranks(s))
+
+    def slopes(self, i, j):
+        # i < j are positions in time order, so t[j] > t[i]
+        return (self.x[j] - self.x[i]) / (self.t[j] - self.t[i])
+
+    def pairs(self, lo, hi, n_pairs, size=None):
+        """
+        Pairs with slope in [lo, hi): all of them, or `size` drawn uniformly
+        with replacement. `n_pairs` is their number (from `count_below`).
+        """
+        if size is not None and lo == -np.inf and hi == np.inf:
+            return self._random_pairs(size)
+
+        # In order of y at lo (ties in time order), the pairs still to cross
+        # before hi are exactly the inversions of the ranks of y at hi
+        ids = np.arange(self.n) if lo == -np.inf else np.argsort(self.x - lo * self.t_centred, kind="stable")
+        keys = self._ranks(hi)[ids]
+
+        firsts, seconds = [], []
+        remaining_total, remaining_draws = n_pairs, size
+        for left_ids, right_ids, start, end in _inversion_ranges(keys, ids):
+            counts = end - start
+            level_total = int(counts.sum())
+            if level_total == 0:
+                continue
+            cumulative = np.cumsum(counts)
+            if size is None:
+                picks = np.arange(level_total)
+            else:
+                # Sequential binomial split of a multinomial draw over levels
+                p = min(1.0, level_total / remaining_total) if remaining_total > 0 else 1.0
+                n_draws = self.rng.binomial(remaining_draws, p)
+                remaining_total -= level_total
+                remaining_draws -= n_draws
+                picks = self.rng.integers(0, level_total, size=n_draws)
+            element = np.searchsorted(cumulative, picks, side="right")
+            offset = picks - (cumulative[element] - counts[element])
+            firsts.append(left_ids[start[element] + offset])
+            seconds.append(right_ids[element])
+
+        if not firsts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        a, b = np.concatenate(firsts), np.concatenate(seconds)
+        return np.minimum(a, b), np.maximum(a, b)
+
+    def _random_pairs(self, size):
+        i_parts, j_parts, found = [], [], 0
+        while found < size:
+            a = self.rng.integers(0, self.n, size=2 * size)
+            b = self.rng.integers(0, self.n, size=2 * size)
+            keep = self.t[a] != self.t[b]
+            i_parts.append(np.minimum(a, b)[keep])
+            j_parts.append(np.maximum(a, b)[keep])
+            found += int(keep.sum())
+        return np.concatenate(i_parts)[:size], np.concatenate(j_parts)[:size]
+
+    def select(self, ranks, sample_size=1 << 16, bracket=None):
+        """
+        Exact slopes at the given 0-based ranks (ascending and close together),
+        starting from the slope interval `bracket` if it holds them.
+        """
+        k_min, k_max = ranks[0], ranks[-1]
+        budget = max(4 * self.n, 1 << 20)
+        intervals = [(-np.inf, np.inf, 0, self.n_slopes)]
+        if bracket is not None and bracket[0] < bracket[1]:
+            below_lo, below_hi = self.count_below(bracket[0]), self.count_below(bracket[1])
+            if below_lo <= k_min and below_hi > k_max:
+                intervals.append((bracket[0], bracket[1], below_lo, below_hi))
+
+        # 1. Narrow the slope interval around the target ranks
+        for _ in range(16):
+            lo, hi, below_lo, below_hi = intervals[-1]
+            n_pairs = below_hi - below_lo
+            if n_pairs <= budget:
+                break
+            sample = np.sort(self.slopes(*self.pairs(lo, hi, n_pairs, size=sample_size)))
+            m = len(sample)
+            margin = 2.0 * np.sqrt(m) + 1
+            i_lo = int(np.floor((k_min - below_lo) / n_pairs * m - margin))
+            i_hi = int(np.ceil((k_max + 1 - below_lo) / n_pairs * m + margin))
+
+            new_lo, new_below_lo = lo, below_lo
+            if i_lo >= 0:
+                new_lo = max(lo, sample[i_lo] - 2 * self.tolerance(sample[i_lo]))
+                new_below_lo = self.count_below(new_lo)
+                if new_below_lo > k_min:
+                    new_lo, new_below_lo = lo, below_lo
+            new_hi, new_below_hi = hi, below_hi
+            if i_hi < m:
+                new_hi = min(hi, sample[i_hi] + 2 * self.tolerance(sample[i_hi]))
+                new_below_hi = self.count_below(new_hi)
+                if new_below_hi <= k_max:
+                    new_hi, new_below_hi = hi, below_hi
+
+            if new_below_hi - new_below_lo >= n_pairs:
+                continue
+            intervals.append((new_lo, new_hi, new_below_lo, new_below_hi))
+            if i_lo >= 0 and i_hi < m and sample[i_lo] == sample[i_hi] and new_lo != lo and new_hi != hi \
+                    and new_below_hi - new_below_lo > budget:
+                # The targets sit in a block of slopes equal to rounding
+                return np.full(len(ranks), sample[i_lo])
+
+        # 2. Enumerate the interval; if a selected slope is within rounding
+        # of a bound (where counting and slopes may disagree), widen
+        while intervals:
+            lo, hi, below_lo, below_hi = intervals.pop()
+            if not intervals:
+                return _all_slopes_at(self, ranks)
+            slopes = self.slopes(*self.pairs(lo, hi, below_hi - below_lo))
+            if len(slopes) != below_hi - below_lo:
+                continue
+            offsets = [k - below_lo for k in ranks]
+            values = np.partition(slopes, offsets)[offsets]
+            if (lo == -np.inf or np.all(values - lo > self.tolerance(lo))) and \
+                    (hi == np.inf or np.all(hi - values > self.tolerance(hi))):
+                return values
+
+
+def _all_slopes_at(selector, ranks):
+    # Fallback: every pairwise slope
+    t, x = selector.t, selector.x
+    slopes = []
+    for k in range(1, len(x)):
+        dt = t[k:] - t[:-k]
+        valid = dt > 0
+        slopes.append((x[k:] - x[:-k])[valid] / dt[valid])
+    slopes = np.concatenate(slopes)
+    return np.partition(slopes, ranks)[ranks]
+
+
+def _inversion_ranges(keys, ids):
+    """
+    The inversions of `keys`, merge level by merge level (see `count_inversions`).
+
+    Yields:
+        tuple: (left_ids, right_ids, start, end) per level; right element r
+            (id right_ids[r]) is inverted with the left elements
+            left_ids[start[r]:end[r]].
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    n = len(keys)
+    position = np.arange(n)
+
+    width = 1
+    while width < n:
+        block = position // (2 * width)
+        offset = block * n
+        is_right = (position // width) % 2 == 1
+
+        shifted = keys + offset
+        start = np.searchsorted(shifted[~is_right], shifted[is_right], side="right")
+        end = (block[is_right] + 1) * width
+        yield ids[~is_right], ids[is_right], start, end
+
+        order = np.argsort(shifted, kind="stable")
+        keys, ids = keys[order], ids[order]
+        width *= 2
+
+
+def mann_kendall_batch(date_numerics, values, max_block_elements=1 << 24):
+    """
+    `mann_kendall` for many sites sampled on one shared time axis.
+
+    The time differences of every pair of sampling dates are computed once per
+    lag and reused for all sites; each site's pairwise value differences are
+    evaluated for a block of sites at a time, so memory is bounded by
+    `max_block_elements` (sites x pairs) regardless of the number of sites.
+    If the pairs of a single site exceed the bound, sites are instead taken
+    one at a time with S counted by `count_inversions` and Sen's slope found
+    by `theil_sen`, in O(n) memory per site.
+
+    Gaps (NaN) are skipped pair by pair, which gives each site the same result
+    as `mann_kendall` on its own observed dates and values.
+
+    Args:
+        date_numerics (np.array): Shared times in seconds since the epoch, ascending.
+        values (np.array): 2-D array (sites x dates), NaN where a site has no sample.
+        max_block_elements (int): Upper bound on sites x pairs held in memory at once.
+
+    Returns:
+        dict: {'slope', 'p_value', 'tau', 'z', 's', 'var_s', 'n'}, each an array
+            with one entry per site (slope in units per second).
+    """
+    t = np.asarray(date_numerics, dtype=float)
+    x = np.atleast_2d(np.asarray(values, dtype=float))
+    if x.shape[1] != len(t):
+        raise ValueError(f"values has {x.shape[1]} columns but there are {len(t)} dates.")
+    if len(t) > 1 and np.any(np.diff(t) < 0):
+        raise ValueError("date_numerics must be in ascending order.")
+
+    n_sites, n_dates = x.shape
+    n_lags = max(n_dates - 1, 0)
+    s = np.zeros(n_sites, dtype=np.int64)
+    slope = np.full(n_sites, np.nan)
+
+    n_time_pairs = sum(int(np.count_nonzero(np.abs(t[k:] - t[:-k]) > _EPSILON)) for k in range(1, n_dates))
+    if n_time_pairs > max_block_elements:
+        # Too many pairs for even one site: nothing of size n^2 is formed
+        for i in range(n_sites):
+            observed = ~np.isnan(x[i])
+            t_obs, x_obs = t[observed], x[i, observed]
+            _, ranks, tie_counts = np.unique(x_obs, return_inverse=True, return_counts=True)
+            n_obs = len(x_obs)
+            s[i] = n_obs * (n_obs - 1) // 2 - int(np.sum(tie_counts * (tie_counts - 1) // 2)) \
+                - 2 * count_inversions(ranks)
+            slope[i] = theil_sen(t_obs, x_obs)
+        return _batch_statistics(x, s, slope)
+
+    # 1. Pairwise time structure, shared by all sites
+    lag_dt = [t[k:] - t[:-k] for k in range(1, n_dates)]
+    lag_valid_dt = [np.abs(dt) > _EPSILON for dt in lag_dt]
+    block = max(1, max_block_elements // max(n_time_pairs, 1))
+
+    for start in range(0, n_sites, block):
+        rows = slice(start, start + block)
+        xb = x[rows]
+        # 2. S and the pairwise slopes of a block of sites (NaN for missing pairs)
+        slopes = np.empty((xb.shape[0], n_time_pairs))
+        filled = 0
+        for k in range(1, n_lags + 1):
+            diff = xb[:, k:] - xb[:, :-k]
+            s[rows] += np.sign(np.nan_to_num(diff)).astype(np.int64).sum(axis=1)
+            valid = lag_valid_dt[k - 1]
+            m = int(valid.sum())
+            slopes[:, filled:filled + m] = diff[:, valid] / lag_dt[k - 1][valid]
+            filled += m
+
+        # 3. Sen's slope: median of each row's observed slopes (NaNs sort last)
+        slopes.sort(axis=1)
+        count = np.sum(~np.isnan(slopes), axis=1)
+        has = count > 0
+        idx = np.arange(xb.shape[0])[has]
+        upper = slopes[idx, count[has] // 2]
+        lower = slopes[idx, (count[has] - 1) // 2]
+        # slope[rows] is a view, so this writes into `slope`
+        slope[rows][has] = np.where(count[has] % 2 == 1, upper, (lower + upper) / 2)
+
+    return _batch_statistics(x, s, slope)
+
+
+def _batch_statistics(x, s, slope):
+    """
+    Completes `mann_kendall_batch` from the per-site S and Sen's slope.
+    """
+    # 4. Sample sizes and tied values per site
+    n = np.sum(~np.isnan(x), axis=1).astype(np.int64)
+    tied_pairs, tie_term = _tie_sums(x)
+
+    n_pairs = n * (n - 1) // 2
+    var_s = (n * (n - 1) * (2 * n + 5) - tie_term) / 18.0
+    denom = np.sqrt(n_pairs - tied_pairs) * np.sqrt(n_pairs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tau = np.where(np.abs(denom) > _EPSILON, s / denom, 0.0)
+        root = np.sqrt(var_s)
+        z = np.where(var_s < _EPSILON, 0.0,
+                     np.where(s > 0, (s - 1) / root, np.where(s < 0, (s + 1) / root, 0.0)))
+    p_value = 2 * (1 - norm.cdf(np.abs(z)))
+
+    return {'slope': slope, 'p_value': p_value, 'tau': tau, 'z': z, 's': s, 'var_s': var_s, 'n': n}
+
+
+def _tie_sums(x):
+    """
+    Per row: the number of tied value pairs, sum t(t-1)/2, and the variance
+    correction sum t(t-1)(2t+5) over groups of t equal values (NaN ignored).
+    """
+    ordered = np.sort(x, axis=1)
+    n_rows, n_cols = ordered.shape
+    if n_cols == 0:
+        return np.zeros(n_rows, dtype=np.int64), np.zeros(n_rows, dtype=np.int64)
+
+    # Position of each value within its run of equal values
+    new_run = np.ones(ordered.shape, dtype=bool)
+    new_run[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    columns = np.broadcast_to(np.arange(n_cols), ordered.shape)
+    run_start = np.maximum.accumulate(np.where(new_run, columns, 0), axis=1)
+    r = (columns - run_start).astype(np.int64)
+    observed = ~np.isnan(ordered)
+
+    # The element at position r of a run adds f(r + 1) - f(r), so a run of t adds f(t)
+    pairs = np.where(observed, r, 0).sum(axis=1)
+    term = np.where(observed, (r + 1) * r * (2 * r + 7) - r * (r - 1) * (2 * r + 5), 0).sum(axis=1)
+    return pairs, term
+
+
+def seasonal_mann_kendall(date_numerics, values, seasonal_period):
+    """
+    Seasonal Kendall test (Hirsch et al., 1982) and seasonal Sen's slope.
+
+    Pairs are compared only within a season (see `season_of_year`), so the
+    pair work is about n^2 / (2 * seasons). The seasons are packed into a
+    NaN-padded (season x observation) array and every lag is evaluated for
+    all seasons at once.
+
+    S and the variance of S are the sums over seasons of the per-season
+    statistics of `mann_kendall` (tie-corrected variance, no covariance between
+    seasons); Tau is S over the summed per-season Tau-b denominators, and the
+    slope is the median of all within-season pairwise slopes.
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch.
+        values (np.array): Numeric values.
+        seasonal_period (int): Number of seasons per year (12 for months, 4 for quarters).
+
+    Returns:
+        dict: {'slope', 'p_value', 'tau', 'z', 's', 'var_s'} as in `mann_kendall`.
+    """
+    t = np.asarray(date_numerics, dtype=float)
+    x = np.asarray(values, dtype=float)
+    season = season_of_year(t, seasonal_period)
+
+    # 1. Pack each season's observations (in their original order) into one row
+    order = np.argsort(season, kind="stable")
+    counts = np.bincount(season, minlength=int(seasonal_period))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    position = np.arange(len(x)) - starts[season[order]]
+    width = int(counts.max()) if len(x) else 0
+    xs = np.full((len(counts), width), np.nan)
+    ts = np.full((len(counts), width), np.nan)
+    xs[season[order], position] = x[order]
+    ts[season[order], position] = t[order]
+
+    # 2. S per season and the within-season slopes, one lag at a time
+    s = np.zeros(len(counts), dtype=np.int64)
+    slopes = []
+    for k in range(1, width):
+        diff = xs[:, k:] - xs[:, :-k]
+        dt = ts[:, k:] - ts[:, :-k]
+        s += np.sign(np.nan_to_num(diff)).astype(np.int64).sum(axis=1)
+        with np.errstate(invalid="ignore"):
+            valid = np.abs(dt) > _EPSILON
+        slopes.append(diff[valid] / dt[valid])
+    slopes = np.concatenate(slopes) if slopes else np.empty(0)
+    slope = np.median(slopes) if len(slopes) else np.nan
+
+    # 3. Combine the seasons
+    n = counts.astype(np.int64)
+    tied_pairs, tie_term = _tie_sums(xs)
+    n_pairs = n * (n - 1) // 2
+    s_total = int(s.sum())
+    var_s = float(np.sum(n * (n - 1) * (2 * n + 5) - tie_term) / 18.0)
+    denom = float(np.sum(np.sqrt(n_pairs - tied_pairs) * np.sqrt(n_pairs)))
+    tau = s_total / denom if abs(denom) > _EPSILON else 0.0
+
+    if var_s < _EPSILON:
+        z = 0.0
+    elif s_total > 0:
+        z = (s_total - 1) / np.sqrt(var_s)
+    elif s_total < 0:
+        z = (s_total + 1) / np.sqrt(var_s)
+    else:
+        z = 0.0
+    p_value = 2 * (1 - norm.cdf(abs(z)))
+
+    return {'slope': slope, 'p_value': p_value, 'tau': tau, 'z': z, 's': s_total, 'var_s': var_s}
+
+
+def season_of_year(date_numerics, seasonal_period):
+    """
+    Season index (0 .. seasonal_period - 1) of each time.
+
+    Periods that divide 12 follow calendar months (12: months, 4: quarters
+    starting in January, ...). Other periods split each calendar year into
+    equal fractions (52: weeks of about 7 days).
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch.
+        seasonal_period (int): Number of seasons per year.
+
+    Returns:
+        np.array: Integer season of every time.
+
+    Raises:
+        ValueError: If `seasonal_period` is not a positive integer.
+    """
+    period = int(seasonal_period) if seasonal_period is not None else 0
+    if period < 1 or period != seasonal_period:
+        raise ValueError(f"seasonal_period must be a positive integer (got {seasonal_period}).")
+
+    micros = np.round(np.asarray(date_numerics, dtype=float) * 1e6).astype(np.int64)
+    times = micros.astype("datetime64[us]")
+    if 12 % period == 0:
+        month = times.astype("datetime64[M]").astype(np.int64) % 12
+        return month // (12 // period)
+
+    year = times.astype("datetime64[Y]")
+    start = year.astype("datetime64[us]")
+    fraction = (times - start) / ((year + 1).astype("datetime64[us]") - start)
+    return np.minimum((fraction * period).astype(np.int64), period - 1)
@@ -1,8 +1,16 @@
 import numpy as np
 import pandas as pd
-import MannKS  # The external dependency (Package name is mannks, but module is MannKS)
+from scipy.stats import norm
+from .trend import mann_kendall, seasonal_mann_kendall
 
-def project_to_current_state(dates, values, alpha=0.05, target_date=None):
+# 365.25 days * 24 * 3600
+SECONDS_PER_YEAR = 31557600.0
+
+# Implementations of the Mann-Kendall test / Sen's slope (see `run_trend_test`)
+TREND_BACKENDS = ("mannks", "native", "seasonal")
+
+def project_to_current_state(dates, values, alpha=0.05, target_date=None, trend_backend="mannks",
+                             seasonal_period=None):
     """
     Detects trend and projects data to the current (max) date or a specified target date.
 
@@ -16,6 +24,8 @@ def project_to_current_state(dates, values, alpha=0.05, target_date=None):
             - "start": Projects to the minimum date in the series.
             - "end" / "max" / "current": Projects to the maximum date.
             - "middle" / "center": Projects to the midpoint between min and max dates.
+        trend_backend (str): 'mannks' (default), 'native' or 'seasonal' (see `run_trend_test`).
+        seasonal_period (int, optional): Seasons per year for the 'seasonal' backend.
 
     Returns:
         dict: {
@@ -26,76 +36,181 @@ def project_to_current_state(dates, values, alpha=0.05, target_date=None):
             'p_value': float
         }
     """
-    # 1. Run Mann-Kendall Test using MannKS package
-    # MannKS.trend_test requires (values, times)
-    # Times needs to be numeric. We'll use ordinal or similar relative to start.
-    # To be precise, let's use seconds from epoch or ordinals.
-    # The MannKS package handles time as numeric.
+    date_numerics = datetime64_to_seconds(dates)
+
+    trend = run_trend_test(date_numerics, values, backend=trend_backend, seasonal_period=seasonal_period)
+    is_significant = is_trend_significant(trend['z'], alpha)
+
+    if is_significant:
+        slope = trend['slope']
+        projected_values = apply_projection(date_numerics, values, slope, target_date=target_date)
+    else:
+        slope = 0.0
+        projected_values = values.copy()
+
+    # Calculate slope per year for readability
+    slope_per_year = slope * SECONDS_PER_YEAR
+
+    return {
+        'projected_data': projected_values,
+        'slope': slope, # Note: this is slope per SECOND
+        'slope_per_year': slope_per_year,
+        'is_significant': is_significant,
+        'p_value': trend['p_value'],
+        'tau': trend['tau']
+    }
+
+def run_trend_test(date_numerics, values, backend="mannks", seasonal_period=None):
+    """
+    Runs the Mann-Kendall test and Sen's slope estimate.
+
+    The returned statistics do not depend on the significance level, so a
+    single run can be shared by evaluations at several confidence levels
+    (see `is_trend_significant`).
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch.
+        values (np.array): Numeric values.
+        backend (str): 'mannks' (default) calls `MannKS.trend_test`, whose pairwise
+            comparisons are O(n^2). 'native' uses `trend.mann_kendall`, which counts
+            S in O(n log n) and corrects the variance of S for tied values (so Z and
+            the p-value differ slightly from MannKS when values repeat).
+            'seasonal' uses `trend.seasonal_mann_kendall`: the seasonal Kendall test
+            and seasonal Sen's slope, comparing pairs only within each season.
+        seasonal_period (int, optional): Seasons per year (12 for months); required
+            by the 'seasonal' backend and ignored by the others.
+
+    Returns:
+        dict: {
+            'slope': float,     # Sen's slope in units per second
+            'p_value': float,
+            'tau': float,
+            'z': float          # Continuity-corrected Mann-Kendall Z
+        }
 
-    date_numerics = dates.map(pd.Timestamp.timestamp).values
+    Raises:
+        ValueError: If `backend` is unknown, or 'seasonal' without a `seasonal_period`.
+    """
+    if backend == "seasonal":
+        if seasonal_period is None:
+            raise ValueError("The 'seasonal' trend backend requires seasonal_period.")
+        res = seasonal_mann_kendall(date_numerics, values, seasonal_period)
+        return {key: res[key] for key in ('slope', 'p_value', 'tau', 'z')}
+    if backend == "native":
+        res = mann_kendall(date_numerics, values)
+        return {key: res[key] for key in ('slope', 'p_value', 'tau', 'z')}
+    if backend != "mannks":
+        raise ValueError(f"Unknown trend backend: {backend}. Choose from {TREND_BACKENDS}.")
 
-    # Run the test
+    # MannKS.trend_test requires (values, times)
+    # Times needs to be numeric. We use seconds from epoch.
     # mk_test_method='robust' is default, handles ties etc.
-    mk_result = MannKS.trend_test(values, date_numerics, alpha=alpha)
+    # alpha only affects the significance flag and slope CIs, neither of
+    # which is used here.
+    # Imported on first use: MannKS (and its plotting stack) is slow to load
+    import MannKS  # The external dependency (Package name is mannks, but module is MannKS)
 
-    # Extract results
-    # Based on exploration:
-    # mk_result has attributes: p, slope, h (boolean significance)
-    # The slope is in units per unit of time (seconds in our case).
+    mk_result = MannKS.trend_test(values, date_numerics)
 
-    p_value = mk_result.p
-    is_significant = bool(mk_result.h)
-    slope_per_second = mk_result.slope # This is per unit of t (second)
-    tau = mk_result.Tau
+    return {
+        'slope': mk_result.slope, # This is per unit of t (second)
+        'p_value': mk_result.p,
+        'tau': mk_result.Tau,
+        'z': mk_result.z
+    }
 
-    projected_values = values.copy()
+def is_trend_significant(z, alpha):
+    """
+    Two-sided Mann-Kendall significance decision at level alpha.
 
-    if is_significant:
-        # Projection
-        # P_t = V_t + Slope * (Time_Target - Time_t)
-
-        min_time = np.min(date_numerics)
-        max_time = np.max(date_numerics)
-
-        if target_date is not None:
-            if isinstance(target_date, str):
-                target_date_lower = target_date.lower().strip()
-                if target_date_lower == "start":
-                    target_time = min_time
-                elif target_date_lower in ["end", "max", "current"]:
-                    target_time = max_time
-                elif target_date_lower in ["middle", "center"]:
-                    target_time = min_time + (max_time - min_time) / 2.0
-                else:
-                    # Try to parse string as date
-                    target_time = pd.Timestamp(target_date).timestamp()
-            else:
-                target_time = pd.Timestamp(target_date).timestamp()
-        else:
-            target_time = max_time
+    Mirrors MannKS: significant when |Z| > z_(1 - alpha/2).
+    """
+    return bool(abs(z) > norm.ppf(1 - alpha / 2))
+
+def apply_projection(date_numerics, values, slope, target_date=None):
+    """
+    Projects values along a linear trend to a target time.
+
+    P_t = V_t + Slope * (Time_Target - Time_t), clamped at 0.
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch.
+        values (np.array): Numeric values.
+        slope (float): Trend slope in units per second.
+        target_date (datetime-like or str, optional): See `project_to_current_state`.
+
+    Returns:
+        np.array: Projected values.
+    """
+    target_time = resolve_target_time(date_numerics, target_date)
+
+    time_diffs = target_time - date_numerics
 
-        time_diffs = target_time - date_numerics
+    projected_values = values + slope * time_diffs
 
-        projected_values = values + slope_per_second * time_diffs
+    # Physical clamp: Concentration cannot be < 0
+    projected_values[projected_values < 0] = 0.0
 
-        # Physical clamp: Concentration cannot be < 0
-        projected_values[projected_values < 0] = 0.0
+    return projected_values
 
-        slope = slope_per_second
+def resolve_target_time(date_numerics, target_date=None):
+    """
+    Resolves a projection target (date or alias) to seconds since the epoch.
+
+    Args:
+        date_numerics (np.array): Times in seconds since the epoch.
+        target_date (datetime-like or str, optional): See `project_to_current_state`.
 
+    Returns:
+        float: Target time in seconds.
+    """
+    min_time = np.min(date_numerics)
+    max_time = np.max(date_numerics)
+
+    if target_date is not None:
+        if isinstance(target_date, str):
+            target_date_lower = target_date.lower().strip()
+            if target_date_lower == "start":
+                target_time = min_time
+            elif target_date_lower in ["end", "max", "current"]:
+                target_time = max_time
+            elif target_date_lower in ["middle", "center"]:
+                target_time = min_time + (max_time - min_time) / 2.0
+            else:
+                # Try to parse string as date
+                target_time = pd.Timestamp(target_date).timestamp()
+        else:
+            target_time = pd.Timestamp(target_date).timestamp()
     else:
-        slope = 0.0
+        target_time = max_time
 
-    # Calculate slope per year for readability
-    # 365.25 days * 24 * 3600 = 31,557,600 seconds
-    seconds_per_year = 31557600.0
-    slope_per_year = slope * seconds_per_year
+    return target_time
 
-    return {
-        'projected_data': projected_values,
-        'slope': slope, # Note: this is slope per SECOND
-        'slope_per_year': slope_per_year,
-        'is_significant': is_significant,
-        'p_value': p_value,
-        'tau': tau
-    }
+def as_datetime64(dates):
+    """
+    Converts dates to a numpy datetime64 array (timezone-aware dates to naive UTC).
+
+    A datetime64 ndarray is returned as is.
+    """
+    if isinstance(dates, (pd.Series, pd.Index)) and isinstance(dates.dtype, np.dtype):
+        dates = dates.values
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+        return dates
+    index = pd.DatetimeIndex(pd.to_datetime(dates))
+    if index.tz is not None:
+        index = index.tz_convert(None)
+    return index.values
+
+def datetime64_to_seconds(dates):
+    """
+    Vectorized equivalent of `pd.Timestamp.timestamp` (seconds since the epoch,
+    at microsecond resolution) for an array of dates.
+
+    Args:
+        dates (np.array or pd.Series): Datetime values.
+
+    Returns:
+        np.array: Seconds since the epoch (float).
+    """
+    micros = as_datetime64(dates).astype("datetime64[us]", copy=False).view("int64")
+    return micros / 1e6
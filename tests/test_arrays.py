@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, tolerance_limit_arrays
+from whatts.utils import datetime64_to_seconds
+
+
+class TestArrayKernel(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(31)
+        n = 80
+        self.times = pd.date_range("2016-01-01", periods=n, freq="ME").values
+        self.values = 12 - 0.03 * np.arange(n) + np.random.normal(0, 1, n)
+        self.df = pd.DataFrame({"Date": self.times, "Value": self.values, "Notes": "x"})
+
+    def test_matches_dataframe_entry_point(self):
+        for kwargs in [dict(regulatory_limit=13), dict(use_projection=False, sides=1),
+                       dict(target_percentile=0.5, projection_target_date="start", min_value=0.0)]:
+            expected = calculate_tolerance_limit(self.df, "Date", "Value", **kwargs)
+            got = tolerance_limit_arrays(self.times, self.values, **kwargs)
+            for key in ["point_estimate", "upper_tolerance_limit", "lower_tolerance_limit", "n_eff",
+                        "trend_slope", "probability_of_compliance", "p_value"]:
+                self.assertEqual(got[key], expected[key], key)
+
+    def test_unsorted_input_and_grid(self):
+        order = np.random.permutation(len(self.times))
+        got = tolerance_limit_arrays(self.times[order], self.values[order], regulatory_limit=13)
+        expected = tolerance_limit_arrays(self.times, self.values, regulatory_limit=13)
+        self.assertEqual(got["upper_tolerance_limit"], expected["upper_tolerance_limit"])
+
+        table = tolerance_limit_arrays(self.times, self.values, target_percentile=[0.5, 0.95])
+        self.assertEqual(len(table), 2)
+
+    def test_rejects_non_datetime_times(self):
+        with self.assertRaises(ValueError):
+            tolerance_limit_arrays(np.arange(10.0), np.arange(10.0))
+
+    def test_seconds_match_timestamp(self):
+        times = pd.DatetimeIndex(["1969-07-20 20:17:40", "2000-02-29", "2024-06-01 12:00:00.250"])
+        expected = [t.timestamp() for t in times]
+        for unit in ["ms", "us", "ns"]:
+            self.assertEqual(datetime64_to_seconds(times.as_unit(unit).values).tolist(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
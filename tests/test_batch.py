@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, calculate_tolerance_limits_batch
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(7)
+        frames = []
+        for site, level in [("A", 100.0), ("B", 50.0), ("C", 20.0)]:
+            dates = pd.date_range("2018-01-01", periods=40, freq="ME")
+            values = level - 0.3 * np.arange(40) + np.random.normal(0, 3, 40)
+            frames.append(pd.DataFrame({"Site": site, "Param": "NO3", "Date": dates, "Value": values}))
+
+        # Site D is too short and must fail without aborting the run
+        frames.append(pd.DataFrame({
+            "Site": "D", "Param": "NO3",
+            "Date": pd.date_range("2018-01-01", periods=3, freq="ME"),
+            "Value": [1.0, 2.0, 3.0]
+        }))
+
+        # Shuffle so the batch has to sort
+        self.df = pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=1)
+
+    def test_matches_single_site_calls(self):
+        table = calculate_tolerance_limits_batch(
+            self.df, ["Site", "Param"], "Date", "Value", regulatory_limit=60
+        )
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table.columns[:2]), ["Site", "Param"])
+
+        for site in ["A", "B", "C"]:
+            single = calculate_tolerance_limit(
+                self.df[self.df["Site"] == site], "Date", "Value", regulatory_limit=60
+            )
+            row = table[table["Site"] == site].iloc[0]
+            self.assertTrue(pd.isna(row["error"]))
+            self.assertAlmostEqual(row["upper_tolerance_limit"], single["upper_tolerance_limit"])
+            self.assertAlmostEqual(row["n_eff"], single["n_eff"])
+            self.assertAlmostEqual(row["probability_of_compliance"], single["probability_of_compliance"])
+
+        self.assertNotIn("projected_data", table.columns)
+        self.assertNotIn("audit_trail", table.columns)
+
+    def test_errors_and_warnings_captured(self):
+        table = calculate_tolerance_limits_batch(self.df, "Site", "Date", "Value")
+        row_d = table[table["Site"] == "D"].iloc[0]
+        self.assertIn("Sample size too small", row_d["error"])
+        self.assertTrue(np.isnan(row_d["upper_tolerance_limit"]))
+
+        # Short records produce a low n_eff warning rather than an error
+        self.assertIsInstance(table[table["Site"] == "A"].iloc[0]["warnings"], str)
+
+    def test_percentile_grid_expands_rows(self):
+        table = calculate_tolerance_limits_batch(self.df, "Site", "Date", "Value",
+                                                 target_percentile=[0.5, 0.95], confidence=[0.9, 0.95])
+        self.assertEqual(len(table), 3 * 4 + 1)
+        self.assertEqual(list(table.columns[:1]), ["Site"])
+
+        site_a = table[table["Site"] == "A"]
+        self.assertTrue(site_a["error"].isna().all())
+        single = calculate_tolerance_limit(self.df[self.df["Site"] == "A"], "Date", "Value",
+                                           target_percentile=[0.5, 0.95], confidence=[0.9, 0.95])
+        np.testing.assert_allclose(site_a["upper_tolerance_limit"].values, single["upper_tolerance_limit"].values)
+        np.testing.assert_array_equal(site_a["target_percentile"].values, single["target_percentile"].values)
+
+        # A failing site still has a single error row
+        self.assertIn("Sample size too small", table[table["Site"] == "D"].iloc[0]["error"])
+
+    def test_process_pool_matches_serial(self):
+        serial = calculate_tolerance_limits_batch(self.df, "Site", "Date", "Value")
+        pooled = calculate_tolerance_limits_batch(self.df, "Site", "Date", "Value", n_jobs=2)
+        pd.testing.assert_frame_equal(serial, pooled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit
+from whatts.bootstrap import (
+    INDEX_CACHE_SIZE,
+    block_bootstrap_indices,
+    bootstrap_cache_info,
+    bootstrap_cache_clear,
+    generate_block_bootstraps,
+    resolve_block_size,
+    set_bootstrap_cache_size
+)
+
+
+def loop_indices(n, n_boot, block_size, draw):
+    # One block start at a time, as the bootstrap was originally written
+    num_blocks = n - block_size + 1
+    out = []
+    for _ in range(n_boot):
+        indices = []
+        while len(indices) < n:
+            start_idx = draw(0, num_blocks)
+            indices.extend(range(start_idx, start_idx + block_size))
+        out.append(indices[:n])
+    return np.array(out)
+
+
+class TestBlockBootstrapIndices(unittest.TestCase):
+    def setUp(self):
+        bootstrap_cache_clear()
+
+    def test_matches_one_block_at_a_time(self):
+        for n, block_size in [(10, 2), (60, 4), (61, 12), (7, 7)]:
+            np.random.seed(3)
+            expected = loop_indices(n, 25, block_size, np.random.randint)
+            np.random.seed(3)
+            np.testing.assert_array_equal(block_bootstrap_indices(n, 25, block_size), expected)
+
+            expected = loop_indices(n, 25, block_size, np.random.default_rng(8).integers)
+            np.testing.assert_array_equal(block_bootstrap_indices(n, 25, block_size, rng=np.random.default_rng(8)),
+                                          expected)
+
+    def test_generator_rows(self):
+        values = np.arange(100.0) * 2
+        dates = np.arange(100)
+        block_size = resolve_block_size(100, seasonal_period=6)
+        self.assertEqual(block_size, 6)
+        indices = block_bootstrap_indices(100, 5, block_size, rng=1)
+        for row, (v, d) in zip(indices, generate_block_bootstraps(values, dates, n_boot=5, seasonal_period=6, rng=1)):
+            np.testing.assert_array_equal(v, values[row])
+            np.testing.assert_array_equal(d, dates[row])
+
+    def test_seeded_matrices_are_cached(self):
+        first = block_bootstrap_indices(80, 200, 4, rng=11)
+        again = block_bootstrap_indices(80, 200, 4, rng=11)
+        self.assertIs(first, again)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(first.dtype, np.int32)
+        self.assertEqual(bootstrap_cache_info()["hits"], 1)
+
+        child = np.random.SeedSequence(11).spawn(2)[1]
+        same_child = np.random.SeedSequence(11).spawn(2)[1]
+        self.assertIs(block_bootstrap_indices(80, 200, 4, rng=child),
+                      block_bootstrap_indices(80, 200, 4, rng=same_child))
+
+        # Generators and the global state are not cached
+        self.assertEqual(block_bootstrap_indices(80, 200, 4, dtype=np.int64).dtype, np.int64)
+        self.assertEqual(bootstrap_cache_info()["currsize"], 2)
+
+    def test_chunks_from_spawned_children(self):
+        seed = np.random.SeedSequence(21)
+        indices = block_bootstrap_indices(50, 250, 3, rng=seed, chunk_size=100)
+        children = np.random.SeedSequence(21).spawn(3)
+        for i, (child, size) in enumerate(zip(children, [100, 100, 50])):
+            np.testing.assert_array_equal(indices[100 * i:100 * i + size],
+                                          block_bootstrap_indices(50, size, 3, rng=child))
+        # The seed is not advanced
+        self.assertEqual(seed.n_children_spawned, 0)
+
+    def test_cache_size_is_configurable(self):
+        try:
+            set_bootstrap_cache_size(2)
+            for n in [40, 41, 42]:
+                block_bootstrap_indices(n, 10, 3, rng=0)
+            info = bootstrap_cache_info()
+            self.assertEqual((info["maxsize"], info["currsize"], info["misses"]), (2, 2, 3))
+            # The oldest matrix was evicted
+            block_bootstrap_indices(40, 10, 3, rng=0)
+            self.assertEqual(bootstrap_cache_info()["misses"], 4)
+        finally:
+            set_bootstrap_cache_size(INDEX_CACHE_SIZE)
+        self.assertEqual(bootstrap_cache_info()["maxsize"], INDEX_CACHE_SIZE)
+
+    def test_seeded_fit_caches_one_matrix(self):
+        dates = pd.date_range("2015-01-01", periods=60, freq="ME")
+        values = 10 + 0.05 * np.arange(60) + np.random.default_rng(2).gamma(2, 1, 60)
+        df = pd.DataFrame({"Date": dates, "Value": values})
+
+        kwargs = dict(method="quantile_regression", n_boot=500, seed=3)
+        first = calculate_tolerance_limit(df, "Date", "Value", **kwargs)
+        self.assertEqual(bootstrap_cache_info()["currsize"], 1)
+        # index_dtype reaches the index matrix (a second cache entry)
+        wide = calculate_tolerance_limit(df, "Date", "Value", index_dtype=np.int64, **kwargs)
+        self.assertEqual(wide["upper_tolerance_limit"], first["upper_tolerance_limit"])
+        self.assertEqual(bootstrap_cache_info()["currsize"], 2)
+        # The int32 matrix serves the threaded fit
+        threaded = calculate_tolerance_limit(df, "Date", "Value", n_boot_jobs=2, **kwargs)
+        self.assertEqual(threaded["upper_tolerance_limit"], first["upper_tolerance_limit"])
+        self.assertEqual(bootstrap_cache_info()["currsize"], 2)
+
+    def test_dtype_must_hold_indices(self):
+        with self.assertRaises(ValueError):
+            block_bootstrap_indices(300, 5, 4, rng=0, dtype=np.int8)
+
+
+if __name__ == "__main__":
+    unittest.main()
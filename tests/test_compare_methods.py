@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, compare_compliance_methods
+from whatts import prepared
+
+
+class TestCompareMethods(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        n = 60
+        dates = pd.date_range("2019-01-01", periods=n, freq="ME")
+        values = 90 - 0.4 * np.arange(n) + np.random.normal(0, 4, n)
+        # Shuffled input must give the same answer as sorted input
+        self.df = pd.DataFrame({"Date": dates, "Value": values}).sample(frac=1.0, random_state=2)
+
+    def test_shares_trend_test(self):
+        with mock.patch.object(prepared, "run_trend_test", wraps=prepared.run_trend_test) as trend_spy, \
+             mock.patch.object(prepared, "calculate_neff_sum_corr", wraps=prepared.calculate_neff_sum_corr) as neff_spy:
+            table = compare_compliance_methods(self.df, "Date", "Value", regulatory_limit=80)
+
+        self.assertEqual(trend_spy.call_count, 1)
+        self.assertEqual(neff_spy.call_count, 1)
+        self.assertEqual(table["Method"].tolist(), ["Naive", "Detrended Only", "Full whatts"])
+
+        full = calculate_tolerance_limit(self.df, "Date", "Value", regulatory_limit=80)
+        row = table[table["Method"] == "Full whatts"].iloc[0]
+        self.assertEqual(row["Upper Tolerance Limit"], full["upper_tolerance_limit"])
+        self.assertEqual(row["Probability of Compliance"], full["probability_of_compliance"])
+
+    def test_per_scenario_trend_options(self):
+        scenarios = [
+            {"name": "MannKS"},
+            {"name": "Native", "trend_backend": "native"},
+            {"name": "Native raw", "trend_backend": "native", "use_neff": False},
+            {"name": "Seasonal", "trend_backend": "seasonal", "seasonal_period": 12},
+        ]
+        with mock.patch.object(prepared, "run_trend_test", wraps=prepared.run_trend_test) as trend_spy:
+            table = compare_compliance_methods(self.df, "Date", "Value", regulatory_limit=80, scenarios=scenarios)
+        # Scenarios with the same trend options share a trend test
+        self.assertEqual(trend_spy.call_count, 3)
+
+        for sc, (_, row) in zip(scenarios, table.iterrows()):
+            kwargs = {k: v for k, v in sc.items() if k != "name"}
+            expected = calculate_tolerance_limit(self.df, "Date", "Value", regulatory_limit=80, **kwargs)
+            self.assertEqual(row["Trend Slope"], expected["trend_slope"], sc["name"])
+            self.assertEqual(row["Upper Tolerance Limit"], expected["upper_tolerance_limit"], sc["name"])
+
+    def test_rejects_percentile_grid(self):
+        with self.assertRaises(ValueError):
+            compare_compliance_methods(self.df, "Date", "Value", target_percentile=[0.5, 0.95])
+        with self.assertRaises(ValueError):
+            compare_compliance_methods(self.df, "Date", "Value", scenarios=[{"name": "Grid", "confidence": [0.9, 0.95]}])
+
+    def test_custom_scenarios_with_qr_in_pool(self):
+        scenarios = [
+            {"name": "Full whatts"},
+            {"name": "One-sided", "sides": 1},
+            {"name": "QR", "method": "quantile_regression", "n_boot": 50},
+            {"name": "QR seasonal", "method": "quantile_regression", "n_boot": 50, "seasonal_period": 12},
+        ]
+        table = compare_compliance_methods(self.df, "Date", "Value", scenarios=scenarios, n_jobs=2)
+
+        self.assertEqual(table["Method"].tolist(), ["Full whatts", "One-sided", "QR", "QR seasonal"])
+        self.assertTrue(table["Upper Tolerance Limit"].notna().all())
+        self.assertTrue(pd.isna(table.loc[2, "N_eff"]))
+        # A one-sided 95% limit sits below the two-sided (97.5%) one
+        self.assertLess(table.loc[1, "Upper Tolerance Limit"], table.loc[0, "Upper Tolerance Limit"])
+
+
+if __name__ == '__main__':
+    unittest.main()
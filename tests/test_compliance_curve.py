@@ -0,0 +1,44 @@
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, compliance_curve, PreparedSeries, StreamingSeries
+
+
+class TestComplianceCurve(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(11)
+        n = 90
+        dates = pd.date_range("2015-01-01", periods=n, freq="ME")
+        values = 500 - 0.8 * np.arange(n) + np.random.normal(0, 20, n)
+        self.df = pd.DataFrame({"Date": dates, "Value": values})
+        self.limits = np.array([300.0, 420.0, 455.5, 480.0, 510.0, 700.0])
+
+    def test_matches_single_limit_calls(self):
+        curve = compliance_curve(self.df, "Date", "Value", self.limits, target_percentile=0.9)
+        self.assertEqual(list(curve.columns), ["regulatory_limit", "observed_rank", "probability_of_compliance"])
+        np.testing.assert_array_equal(curve["regulatory_limit"], self.limits)
+        for limit, prob in zip(self.limits, curve["probability_of_compliance"]):
+            res = calculate_tolerance_limit(self.df, "Date", "Value", target_percentile=0.9, regulatory_limit=limit)
+            self.assertEqual(prob, res["probability_of_compliance"])
+
+    def test_monotone_in_limit(self):
+        prepared = PreparedSeries.from_dataframe(self.df, "Date", "Value")
+        curve = prepared.compliance_curve(np.linspace(350, 600, 1000))
+        self.assertEqual(len(curve), 1000)
+        self.assertTrue(np.all(np.diff(curve["probability_of_compliance"]) >= 0))
+        self.assertEqual(curve["observed_rank"].iloc[0], 0.0)
+        self.assertEqual(curve["observed_rank"].iloc[-1], 1.0)
+
+    def test_streaming_curve(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            series = StreamingSeries.from_dataframe(self.df, "Date", "Value")
+            prepared = PreparedSeries.from_dataframe(self.df, "Date", "Value")
+        got = series.compliance_curve(self.limits)["probability_of_compliance"]
+        expected = prepared.compliance_curve(self.limits)["probability_of_compliance"]
+        np.testing.assert_allclose(got, expected, rtol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
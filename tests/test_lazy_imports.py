@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import unittest
+
+CHECK = """
+import sys
+import whatts
+heavy = ("matplotlib", "statsmodels", "MannKS")
+print(",".join(sorted({m.split(".")[0] for m in sys.modules if m.split(".")[0] in heavy})))
+"""
+
+
+class TestLazyImports(unittest.TestCase):
+    def _loaded_after(self, code):
+        out = subprocess.run([sys.executable, "-c", CHECK + code], capture_output=True, text=True, check=True)
+        lines = out.stdout.splitlines()
+        return lines[-1] if lines else ""
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        self.assertEqual(self._loaded_after(""), "")
+
+    def test_projection_without_trend_stays_light(self):
+        code = """
+import numpy as np, pandas as pd
+df = pd.DataFrame({"D": pd.date_range("2020-01-01", periods=20, freq="ME"), "V": np.arange(20.0)})
+whatts.calculate_tolerance_limit(df, "D", "V", use_projection=False)
+print(",".join(sorted({m.split(".")[0] for m in sys.modules if m.split(".")[0] in heavy})))
+"""
+        self.assertEqual(self._loaded_after(code), "")
+
+    def test_dependencies_load_on_first_use(self):
+        code = """
+whatts.plot_compliance_explainer
+print(",".join(sorted({m.split(".")[0] for m in sys.modules if m.split(".")[0] in heavy})))
+"""
+        self.assertEqual(self._loaded_after(code), "matplotlib")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+from whatts.neff import neff_batch, stack_series
+from whatts.stats import calculate_neff_sum_corr
+
+
+def ar1_series(rng, n, phi):
+    e = rng.normal(size=n)
+    x = np.zeros(n)
+    for t in range(n):
+        x[t] = (phi * x[t - 1] if t else 0) + e[t]
+    return x
+
+
+class TestNeffBatch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.series = [ar1_series(rng, n, phi) for n, phi in
+                       [(1, 0.0), (2, 0.5), (3, 0.5), (40, -0.4), (120, 0.8), (600, 0.3), (257, 0.95)]]
+        self.series.append(np.full(50, 4.2))
+        gappy = ar1_series(rng, 80, 0.6)
+        gappy[[0, 7, 8, 79]] = np.nan
+        self.series.append(gappy)
+
+    def test_sum_corr_matches_scalar_per_row(self):
+        got = neff_batch(stack_series(self.series))
+        expected = [calculate_neff_sum_corr(s[~np.isnan(s)]) for s in self.series]
+        np.testing.assert_allclose(got, expected, rtol=1e-10)
+
+    def test_masked_input(self):
+        padded = stack_series(self.series)
+        masked = np.ma.masked_invalid(padded)
+        masked.data[masked.mask] = -999.0
+        np.testing.assert_allclose(neff_batch(masked), neff_batch(padded))
+
+    def test_ar1_formula(self):
+        x = ar1_series(np.random.default_rng(1), 500, 0.7)
+        y = x - x.mean()
+        rho_1 = np.sum(y[:-1] * y[1:]) / np.sum(y * y)
+        got = neff_batch(x[None, :], method="ar1")[0]
+        self.assertAlmostEqual(got, 500 * (1 - rho_1) / (1 + rho_1))
+
+    def test_batch_means(self):
+        rng = np.random.default_rng(2)
+        white = rng.normal(size=(200, 400))
+        # Independent data: about n on average
+        self.assertAlmostEqual(np.mean(neff_batch(white, method="batch_means")) / 400, 1.0, delta=0.15)
+
+        x = ar1_series(rng, 400, 0.8)
+        got = neff_batch(np.vstack([x, x]), method="batch_means", batch_size=20)
+        batch_means = x.reshape(20, 20).mean(axis=1)
+        expected = 400 * np.var(x) / (20 * np.var(batch_means, ddof=1))
+        np.testing.assert_allclose(got, max(2.0, min(400.0, expected)))
+
+    def test_estimators_agree_on_strong_autocorrelation(self):
+        rng = np.random.default_rng(3)
+        data = np.vstack([ar1_series(rng, 1000, 0.8) for _ in range(20)])
+        for method in ["sum_corr", "ar1", "batch_means"]:
+            n_eff = neff_batch(data, method=method)
+            self.assertTrue(np.all(n_eff < 400), method)
+            self.assertTrue(np.all(n_eff >= 2), method)
+
+    def test_edge_rows(self):
+        data = stack_series([[1.0], [1.0, 2.0], [5.0, 5.0, 5.0, 5.0], []])
+        for method in ["sum_corr", "ar1", "batch_means"]:
+            np.testing.assert_array_equal(neff_batch(data, method=method), [1.0, 2.0, 1.0, 0.0])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            neff_batch(np.zeros((2, 10)), method="kish")
+
+
+if __name__ == "__main__":
+    unittest.main()
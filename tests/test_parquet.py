@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limits_batch
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from whatts.parquet import iter_parquet_sites, calculate_tolerance_limits_parquet
+except ImportError:
+    pa = None
+
+
+@unittest.skipIf(pa is None, "pyarrow not installed")
+class TestParquetIngestion(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(12)
+        frames = []
+        for i, site in enumerate(["A", "B", "C", "D"]):
+            dates = pd.date_range("2015-01-01", periods=50, freq="ME")
+            values = 40 + 10 * i + 0.1 * np.arange(50) + np.random.normal(0, 3, 50)
+            frames.append(pd.DataFrame({"Site": site, "Date": dates, "Value": values, "Lab": "X"}))
+        # Clustered by site, but dates within a site shuffled
+        self.df = pd.concat([f.sample(frac=1.0, random_state=0) for f in frames], ignore_index=True)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "export.parquet")
+        # Small row groups so sites span several of them
+        pq.write_table(pa.Table.from_pandas(self.df, preserve_index=False), self.path, row_group_size=30)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_yields_complete_sorted_sites(self):
+        seen = {}
+        for key, dates, values in iter_parquet_sites(self.path, "Site", "Date", "Value"):
+            self.assertNotIn(key, seen)
+            self.assertTrue(np.all(np.diff(dates.astype("int64")) >= 0))
+            seen[key] = len(values)
+        self.assertEqual(seen, {"A": 50, "B": 50, "C": 50, "D": 50})
+
+    def test_matches_in_memory_batch(self):
+        expected = calculate_tolerance_limits_batch(self.df, "Site", "Date", "Value", regulatory_limit=60)
+        for n_jobs in [1, 2]:
+            table = calculate_tolerance_limits_parquet(self.path, "Site", "Date", "Value",
+                                                       n_jobs=n_jobs, regulatory_limit=60)
+            table = table.sort_values("Site").reset_index(drop=True)
+            pd.testing.assert_frame_equal(table, expected.sort_values("Site").reset_index(drop=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
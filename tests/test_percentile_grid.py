@@ -0,0 +1,70 @@
+import unittest
+from collections.abc import Mapping
+from unittest import mock
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit
+from whatts import prepared
+
+
+class TestPercentileGrid(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(11)
+        n = 60
+        dates = pd.date_range("2019-01-01", periods=n, freq="ME")
+        values = 80 - 0.2 * np.arange(n) + np.random.normal(0, 4, n)
+        self.df = pd.DataFrame({"Date": dates, "Value": values})
+        self.percentiles = [0.5, 0.8, 0.95, 0.99]
+        self.confidences = [0.9, 0.95]
+
+    def test_grid_matches_individual_calls(self):
+        table = calculate_tolerance_limit(
+            self.df, "Date", "Value",
+            target_percentile=self.percentiles, confidence=self.confidences,
+            regulatory_limit=85
+        )
+        self.assertIsInstance(table, pd.DataFrame)
+        self.assertEqual(len(table), 8)
+        self.assertNotIn("projected_data", table.columns)
+
+        for _, row in table.iterrows():
+            single = calculate_tolerance_limit(
+                self.df, "Date", "Value",
+                target_percentile=row["target_percentile"], confidence=row["confidence_level"],
+                regulatory_limit=85
+            )
+            self.assertEqual(row["upper_tolerance_limit"], single["upper_tolerance_limit"])
+            self.assertEqual(row["lower_tolerance_limit"], single["lower_tolerance_limit"])
+            self.assertEqual(row["point_estimate"], single["point_estimate"])
+            self.assertEqual(row["probability_of_compliance"], single["probability_of_compliance"])
+            self.assertEqual(row["trend_detected"], single["trend_detected"])
+
+    def test_trend_and_neff_computed_once(self):
+        with mock.patch.object(prepared, "run_trend_test", wraps=prepared.run_trend_test) as trend_spy, \
+             mock.patch.object(prepared, "calculate_neff_sum_corr", wraps=prepared.calculate_neff_sum_corr) as neff_spy:
+            calculate_tolerance_limit(
+                self.df, "Date", "Value",
+                target_percentile=self.percentiles, confidence=self.confidences
+            )
+        self.assertEqual(trend_spy.call_count, 1)
+        # At most one n_eff per significance outcome
+        self.assertLessEqual(neff_spy.call_count, 2)
+
+    def test_scalar_inputs_still_return_single_result(self):
+        res = calculate_tolerance_limit(self.df, "Date", "Value")
+        self.assertIsInstance(res, Mapping)
+        self.assertNotIsInstance(res, pd.DataFrame)
+
+    def test_qr_grid_shares_bootstrap(self):
+        table = calculate_tolerance_limit(
+            self.df, "Date", "Value", method="quantile_regression", n_boot=50,
+            target_percentile=0.9, confidence=[0.8, 0.95]
+        )
+        self.assertEqual(len(table), 2)
+        # Same fit, so same point estimate; a higher confidence widens the interval
+        self.assertEqual(table["point_estimate"].iloc[0], table["point_estimate"].iloc[1])
+        self.assertLessEqual(table["upper_tolerance_limit"].iloc[0], table["upper_tolerance_limit"].iloc[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, tolerance_limit_arrays, PreparedSeries
+from whatts import prepared as prepared_module
+
+
+class TestPreparedSeries(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(21)
+        n = 72
+        dates = pd.date_range("2017-01-01", periods=n, freq="ME")
+        values = 40 + 0.15 * np.arange(n) + np.random.normal(0, 3, n)
+        self.df = pd.DataFrame({"Date": dates, "Value": values})
+
+    def test_queries_match_calculate_tolerance_limit(self):
+        prepared = PreparedSeries.from_dataframe(self.df, "Date", "Value")
+
+        for kwargs in [
+            dict(target_percentile=0.95, confidence=0.95, sides=2),
+            dict(target_percentile=0.9, confidence=0.9, sides=1, regulatory_limit=55),
+            dict(target_percentile=0.5, confidence=0.99, min_value=0.0, small_n_threshold=100),
+        ]:
+            expected = calculate_tolerance_limit(self.df, "Date", "Value", **kwargs)
+            got = prepared.tolerance_limit(**kwargs)
+            for key in ["point_estimate", "upper_tolerance_limit", "lower_tolerance_limit",
+                        "n_eff", "trend_slope", "probability_of_compliance", "wh_method_used"]:
+                self.assertEqual(got[key], expected[key], key)
+
+        self.assertEqual(
+            prepared.probability_of_compliance(55, target_percentile=0.9, confidence=0.9),
+            calculate_tolerance_limit(self.df, "Date", "Value", target_percentile=0.9,
+                                      confidence=0.9, regulatory_limit=55)["probability_of_compliance"]
+        )
+
+    def test_trend_computed_once(self):
+        with mock.patch.object(prepared_module, "run_trend_test",
+                               wraps=prepared_module.run_trend_test) as trend_spy:
+            prepared = PreparedSeries(self.df["Date"], self.df["Value"])
+            for limit in [45, 50, 55, 60]:
+                for conf in [0.8, 0.9, 0.95]:
+                    prepared.probability_of_compliance(limit, confidence=conf)
+                    prepared.tolerance_limit(0.95, confidence=conf, sides=1)
+        self.assertEqual(trend_spy.call_count, 1)
+        self.assertLessEqual(len(prepared._cache["states"]), 2)
+
+    def test_trend_statistics_exposed(self):
+        prepared = PreparedSeries(self.df["Date"], self.df["Value"])
+        self.assertEqual(set(prepared.trend), {"slope", "p_value", "tau", "z"})
+        self.assertTrue(prepared.is_trend_significant(0.95))
+
+        state = prepared.state(0.95)
+        self.assertTrue(np.all(np.diff(state["data_sorted"]) >= 0))
+        self.assertEqual(len(state["z_scores"]), prepared.n)
+
+        unprojected = PreparedSeries(self.df["Date"], self.df["Value"], use_projection=False)
+        self.assertIsNone(unprojected.trend)
+        self.assertFalse(unprojected.is_trend_significant(0.95))
+
+    def test_unsorted_input_and_missing_values(self):
+        df = self.df.copy()
+        df.loc[3, "Value"] = np.nan
+        shuffled = df.sample(frac=1.0, random_state=3)
+
+        prepared = PreparedSeries(shuffled["Date"], shuffled["Value"])
+        self.assertEqual(prepared.n, len(df) - 1)
+        self.assertTrue(prepared.dates.is_monotonic_increasing)
+
+        expected = calculate_tolerance_limit(df, "Date", "Value")
+        self.assertEqual(prepared.tolerance_limit()["upper_tolerance_limit"], expected["upper_tolerance_limit"])
+
+
+    def test_projected_data_is_owned_by_caller(self):
+        times = self.df["Date"].values
+        values = self.df["Value"].values.copy()
+        original = values.copy()
+
+        # Unprojected data were once returned as the input array itself
+        for use_projection in [False, True]:
+            prepared = PreparedSeries(times, values, use_projection=use_projection, use_neff=False)
+            first = prepared.tolerance_limit(regulatory_limit=55)
+            first["projected_data"][:] = 0.0
+            second = prepared.tolerance_limit(regulatory_limit=55)
+            np.testing.assert_array_equal(values, original)
+            self.assertEqual(second["upper_tolerance_limit"], first["upper_tolerance_limit"])
+            self.assertEqual(second["probability_of_compliance"], first["probability_of_compliance"])
+            self.assertTrue(np.all(second["projected_data"] > 0))
+
+            state = prepared.state()
+            with self.assertRaises(ValueError):
+                state["analysis_data"][0] = 0.0
+            with self.assertRaises(ValueError):
+                state["data_sorted"][0] = 0.0
+
+        result = tolerance_limit_arrays(times, values, use_projection=False, use_neff=False)
+        self.assertFalse(np.shares_memory(result["projected_data"], values))
+
+
+if __name__ == '__main__':
+    unittest.main()
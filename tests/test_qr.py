@@ -120,3 +120,128 @@ class TestQR:
 
         # End estimate ~ 20 + epsilon
         assert 19.0 < res_end['point_estimate'] < 22.0
+
+def _check_loss(x, y, q, intercept, slope):
+    r = y - intercept - slope * x
+    return np.sum(r * (q - (r < 0)))
+
+class TestExactSolver:
+    def test_matches_quantreg(self):
+        import statsmodels.api as sm
+        from whatts.qr import fit_quantile_line
+
+        rng = np.random.default_rng(7)
+        for n in [12, 50, 300]:
+            for q in [0.5, 0.9, 0.95]:
+                x = np.sort(rng.integers(0, 3 * n, n)).astype(float)
+                y = 10 + 0.05 * x + rng.lognormal(0, 1, n)
+                intercept, slope = fit_quantile_line(x, y, q)
+                params = sm.QuantReg(y, sm.add_constant(x)).fit(q=q).params
+                np.testing.assert_allclose([intercept, slope], params, rtol=1e-4, atol=1e-6)
+                # Exact: never a higher loss than the IRLS solution
+                assert _check_loss(x, y, q, intercept, slope) <= _check_loss(x, y, q, *params) * (1 + 1e-12)
+
+    def test_degenerate_and_tied_data(self):
+        from whatts.qr import fit_quantile_line, fit_quantile_lines
+
+        # Duplicated rows and rounded values, as in block bootstrap replicates
+        rng = np.random.default_rng(3)
+        x = np.repeat(np.arange(40.0), 2)
+        y = np.round(5 + 0.1 * x + rng.normal(0, 1, 80))
+        for q in [0.5, 0.95]:
+            line = fit_quantile_line(x, y, q)
+            other = fit_quantile_line(x, y, q, solver="statsmodels")
+            assert _check_loss(x, y, q, *line) <= _check_loss(x, y, q, *other) * (1 + 1e-12)
+
+            # Batched: the tied row matches the single fit and a row with a
+            # single distinct x (no line can be fitted) is left as NaN
+            intercepts, slopes = fit_quantile_lines(np.vstack([x, np.full(80, 7.0)]), np.vstack([y, y]), q)
+            assert (intercepts[0], slopes[0]) == line
+            assert np.isnan(intercepts[1]) and np.isnan(slopes[1])
+
+        with pytest.raises(ValueError, match="Unknown QR solver"):
+            fit_quantile_line(x, y, 0.5, solver="simplex")
+
+    def test_solver_option(self):
+        n = 60
+        dates = pd.date_range(start='2023-01-01', periods=n, freq='D')
+        values = np.linspace(10, 20, n) + np.random.default_rng(1).normal(0, 1, n)
+        df = pd.DataFrame({'date': dates, 'value': values})
+
+        results = {}
+        for solver in ["exact", "statsmodels"]:
+            np.random.seed(5)
+            results[solver] = calculate_tolerance_limit(df, 'date', 'value', method='quantile_regression',
+                                                        n_boot=200, qr_solver=solver)
+        assert results["exact"]["point_estimate"] == pytest.approx(results["statsmodels"]["point_estimate"], rel=1e-4)
+        assert results["exact"]["upper_tolerance_limit"] == pytest.approx(
+            results["statsmodels"]["upper_tolerance_limit"], rel=1e-3)
+
+    def test_batched_rows_match_single_fits(self):
+        from whatts.qr import fit_quantile_line, fit_quantile_lines
+
+        rng = np.random.default_rng(11)
+        x = np.arange(80.0)
+        y = 3 + 0.02 * x + rng.gamma(2.0, 1.0, size=(40, 80))
+        y[::5] = np.round(y[::5])
+        xs = np.tile(x, (41, 1))
+        # A row with one distinct x cannot be fitted at all
+        xs[-1] = 7.0
+        ys = np.vstack([y, y[:1]])
+
+        intercepts, slopes = fit_quantile_lines(xs, ys, 0.9)
+        for i in range(40):
+            expected = fit_quantile_line(x, y[i], 0.9)
+            assert intercepts[i] == pytest.approx(expected[0], rel=1e-9, abs=1e-12)
+            assert slopes[i] == pytest.approx(expected[1], rel=1e-9, abs=1e-12)
+        assert np.isnan(intercepts[-1]) and np.isnan(slopes[-1])
+
+class TestSeededBootstrap:
+    def _series(self):
+        n = 90
+        dates = pd.Series(pd.date_range(start='2020-01-01', periods=n, freq='W'))
+        values = 20 + 0.02 * np.arange(n) + np.random.default_rng(4).gamma(2.0, 2.0, n)
+        return dates, values
+
+    def test_generator_is_reproducible(self):
+        from whatts.bootstrap import generate_block_bootstraps
+
+        values = np.arange(50.0)
+        first = [v for v, _ in generate_block_bootstraps(values, values, n_boot=5, rng=12)]
+        second = [v for v, _ in generate_block_bootstraps(values, values, n_boot=5, rng=np.random.default_rng(12))]
+        np.testing.assert_array_equal(first, second)
+
+    def test_seed_is_independent_of_worker_count(self):
+        from whatts.qr import fit_qr_current_state
+
+        dates, values = self._series()
+        runs = [fit_qr_current_state(dates, values, n_boot=350, seed=2024, n_jobs=n_jobs)
+                for n_jobs in [1, 2, 4]]
+        for other in runs[1:]:
+            np.testing.assert_array_equal(other["bootstrap_distribution"], runs[0]["bootstrap_distribution"])
+            assert other["upper_tolerance_limit"] == runs[0]["upper_tolerance_limit"]
+
+        different = fit_qr_current_state(dates, values, n_boot=350, seed=2025)
+        assert not np.array_equal(different["bootstrap_distribution"], runs[0]["bootstrap_distribution"])
+
+    def test_seed_sequence_is_not_consumed(self):
+        from whatts.qr import fit_qr_current_state
+
+        dates, values = self._series()
+        seed = np.random.SeedSequence(42)
+        first = fit_qr_current_state(dates, values, n_boot=200, seed=seed)
+        second = fit_qr_current_state(dates, values, n_boot=200, seed=seed)
+        assert first["upper_tolerance_limit"] == second["upper_tolerance_limit"]
+        assert first["lower_tolerance_limit"] == second["lower_tolerance_limit"]
+        # Same replicates as the equivalent int seed
+        np.testing.assert_array_equal(
+            first["bootstrap_distribution"],
+            fit_qr_current_state(dates, values, n_boot=200, seed=42)["bootstrap_distribution"])
+
+    def test_seed_through_calculate_tolerance_limit(self):
+        dates, values = self._series()
+        df = pd.DataFrame({'date': dates, 'value': values})
+        results = [calculate_tolerance_limit(df, 'date', 'value', method='quantile_regression', n_boot=200,
+                                             seed=7, n_boot_jobs=n_jobs) for n_jobs in [1, 3]]
+        assert results[0]["upper_tolerance_limit"] == results[1]["upper_tolerance_limit"]
+        assert results[0]["lower_tolerance_limit"] == results[1]["lower_tolerance_limit"]
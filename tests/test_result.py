@@ -0,0 +1,71 @@
+import json
+import pickle
+import unittest
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, ToleranceResult
+
+
+class TestToleranceResult(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(4)
+        n = 50
+        dates = pd.date_range("2019-01-01", periods=n, freq="ME")
+        self.df = pd.DataFrame({"Date": dates, "Value": 10 + 0.1 * np.arange(n) + np.random.normal(0, 1, n)})
+
+    def test_dict_style_access(self):
+        res = calculate_tolerance_limit(self.df, "Date", "Value", regulatory_limit=15)
+        self.assertIsInstance(res, ToleranceResult)
+        self.assertEqual(res["n_raw"], 50)
+        self.assertEqual(res.get("n_eff"), res.n_eff)
+        self.assertIsNone(res.get("missing_key"))
+        self.assertIn("audit_trail", res)
+        self.assertEqual(list(res)[:3], ["statistic", "target_percentile", "point_estimate"])
+        self.assertEqual(res["audit_trail"]["settings"]["confidence"], 0.95)
+        self.assertEqual(len(res["projected_data"]), 50)
+        self.assertEqual(set(dict(res)), set(res.keys()))
+
+        res["probability_of_compliance"] = 0.5
+        self.assertEqual(res["probability_of_compliance"], 0.5)
+
+    def test_plain_dict_surface(self):
+        # Results were plain dicts before they became ToleranceResult
+        res = calculate_tolerance_limit(self.df, "Date", "Value", regulatory_limit=15)
+        self.assertIsInstance(res, dict)
+        self.assertEqual(res.n_eff, res["n_eff"])
+        with self.assertRaises(AttributeError):
+            res.not_a_field
+
+        copied = res.copy()
+        self.assertIsInstance(copied, ToleranceResult)
+        copied["site"] = "A"
+        copied.update(n_raw=0)
+        self.assertNotIn("site", res)
+        self.assertEqual(res["n_raw"], 50)
+        self.assertEqual(copied.to_row()["site"], "A")
+
+        lite = calculate_tolerance_limit(self.df, "Date", "Value", return_arrays=False, audit=False)
+        self.assertEqual(json.loads(json.dumps(lite)), lite.to_dict())
+        self.assertEqual(json.loads(json.dumps(lite.to_row())), lite.to_row())
+
+    def test_heavy_fields_are_optional(self):
+        full = calculate_tolerance_limit(self.df, "Date", "Value")
+        lite = calculate_tolerance_limit(self.df, "Date", "Value", return_arrays=False, audit=False)
+        self.assertIsNone(lite["projected_data"])
+        self.assertIsNone(lite["audit_trail"])
+        self.assertEqual(lite.to_row(), full.to_row())
+        self.assertNotIn("projected_data", lite.to_row())
+        self.assertLess(len(pickle.dumps(lite)), len(pickle.dumps(full)))
+
+        restored = pickle.loads(pickle.dumps(lite))
+        self.assertEqual(restored.to_row(), lite.to_row())
+
+    def test_quantile_regression_fields(self):
+        res = calculate_tolerance_limit(self.df, "Date", "Value", method="quantile_regression", n_boot=50)
+        self.assertEqual(res["method"], "Quantile Regression with Block Bootstrap")
+        self.assertNotIn("n_eff", res)
+        self.assertIsNone(res.get("n_eff"))
+
+
+if __name__ == '__main__':
+    unittest.main()
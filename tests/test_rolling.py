@@ -0,0 +1,181 @@
+import unittest
+import warnings
+from unittest import mock
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, rolling_tolerance_limits, rolling
+from whatts.rolling import _IncrementalWindow
+from whatts.stats import calculate_neff_sum_corr
+from whatts.trend import mann_kendall
+from whatts.utils import run_trend_test
+
+
+class TestRollingToleranceLimits(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(8)
+        n = 200
+        dates = pd.date_range("2005-01-01", periods=n, freq="W")
+        values = 20 + 0.03 * np.arange(n) + 2 * np.sin(np.arange(n) / 5) + np.random.normal(0, 2, n)
+        # Rounded values create ties
+        self.df = pd.DataFrame({"Date": dates, "Value": np.round(values, 1)})
+
+    def _assert_matches_direct(self, table, expanding=False):
+        for _, row in table.iterrows():
+            mask = self.df["Date"] <= row["window_end"]
+            if not expanding:
+                mask &= self.df["Date"] > row["window_start"]
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                expected = calculate_tolerance_limit(self.df[mask], "Date", "Value", regulatory_limit=24)
+
+            self.assertEqual(row["n_obs"], mask.sum())
+            self.assertEqual(row["trend_detected"], expected["trend_detected"])
+            for key in ["point_estimate", "upper_tolerance_limit", "n_eff", "trend_slope", "probability_of_compliance"]:
+                self.assertAlmostEqual(row[key], expected[key], places=8, msg=key)
+
+    def test_rolling_matches_direct_calls(self):
+        table = rolling_tolerance_limits(self.df, "Date", "Value", window=pd.DateOffset(years=2),
+                                         step="QE", regulatory_limit=24)
+        self.assertEqual(len(table), len(pd.date_range("2007-01-01", self.df["Date"].iloc[-1], freq="QE")))
+        self.assertTrue(table["error"].isna().all())
+        self._assert_matches_direct(table)
+
+    def test_expanding_window(self):
+        table = rolling_tolerance_limits(self.df, "Date", "Value", window=None, step="QE", regulatory_limit=24)
+        self.assertTrue(table["window_end"].is_monotonic_increasing)
+        self.assertTrue((np.diff(table["n_obs"]) >= 0).all())
+        valid = table[table["error"].isna()]
+        self._assert_matches_direct(valid, expanding=True)
+
+    def test_percentile_grid_rows(self):
+        table = rolling_tolerance_limits(self.df, "Date", "Value", window=pd.DateOffset(years=2), step="YE",
+                                         target_percentile=[0.5, 0.95], confidence=[0.9, 0.95], regulatory_limit=24)
+        ends = table["window_end"].unique()
+        self.assertEqual(len(table), 4 * len(ends))
+
+        window = table[table["window_end"] == ends[-1]]
+        mask = (self.df["Date"] <= ends[-1]) & (self.df["Date"] > window["window_start"].iloc[0])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = calculate_tolerance_limit(self.df[mask], "Date", "Value", regulatory_limit=24,
+                                                 target_percentile=[0.5, 0.95], confidence=[0.9, 0.95])
+        np.testing.assert_array_equal(window["target_percentile"].values, expected["target_percentile"].values)
+        np.testing.assert_array_equal(window["confidence_level"].values, expected["confidence_level"].values)
+        np.testing.assert_allclose(window["upper_tolerance_limit"].values,
+                                   expected["upper_tolerance_limit"].values, rtol=1e-10)
+
+    def test_large_windows_native_backend(self):
+        # Daily data: 600-observation windows (179,700 pairs, beyond MannKS's pair sampling) with ties
+        rng = np.random.default_rng(12)
+        dates = pd.date_range("2015-01-01", periods=900, freq="D")
+        values = np.round(20 + 0.005 * np.arange(900) + rng.normal(0, 2, 900), 0)
+        df = pd.DataFrame({"Date": dates, "Value": values})
+
+        table = rolling_tolerance_limits(df, "Date", "Value", window="600D", step="QE", regulatory_limit=26,
+                                         trend_backend="native")
+        self.assertTrue(table["error"].isna().all())
+        self.assertTrue((table["n_obs"] == 600).all())
+        for _, row in table.iterrows():
+            mask = (df["Date"] <= row["window_end"]) & (df["Date"] > row["window_start"])
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                expected = calculate_tolerance_limit(df[mask], "Date", "Value", regulatory_limit=26,
+                                                     trend_backend="native")
+            self.assertEqual(row["trend_slope"], expected["trend_slope"])
+            self.assertEqual(row["p_value"], expected["p_value"])
+            for key in ["point_estimate", "upper_tolerance_limit", "n_eff", "probability_of_compliance"]:
+                self.assertAlmostEqual(row[key], expected[key], places=8, msg=key)
+
+        with self.assertRaises(ValueError):
+            rolling_tolerance_limits(df, "Date", "Value", trend_backend="seasonal")
+
+    def test_short_windows_reported_not_raised(self):
+        table = rolling_tolerance_limits(self.df, "Date", "Value", window="60D", step="QE", min_periods=10)
+        self.assertTrue(table["error"].str.contains("min_periods").all())
+
+
+class TestIncrementalWindow(unittest.TestCase):
+    def test_push_pop_matches_from_scratch(self):
+        rng = np.random.default_rng(4)
+        t = np.cumsum(rng.integers(1, 5, 80)) * 86400.0
+        x = np.round(rng.normal(10, 2, 80), 0)
+
+        engine = _IncrementalWindow(t_ref=t[0], x_ref=x.mean())
+        lo = 0
+        for hi in range(80):
+            engine.push(t[hi], x[hi])
+            while hi + 1 - lo > 30:
+                engine.pop()
+                lo += 1
+            if engine.n < 5:
+                continue
+
+            expected = run_trend_test(t[lo:hi + 1], x[lo:hi + 1])
+            got = engine.trend()
+            self.assertEqual(got["slope"], expected["slope"])
+            self.assertAlmostEqual(got["z"], expected["z"], places=12)
+            self.assertAlmostEqual(got["tau"], expected["tau"], places=12)
+            np.testing.assert_array_equal(engine.sorted_values(), np.sort(x[lo:hi + 1]))
+            self.assertAlmostEqual(engine.neff(), calculate_neff_sum_corr(x[lo:hi + 1]), places=8)
+
+    def test_native_backend_matches_mann_kendall(self):
+        # Windows of up to 500 values with many ties, past MannKS's 100,000-pair sampling
+        rng = np.random.default_rng(6)
+        t = np.cumsum(rng.integers(1, 4, 620)) * 86400.0
+        x = np.round(rng.normal(10, 2, 620), 0)
+
+        engine = _IncrementalWindow(t_ref=t[0], x_ref=x.mean(), trend_backend="native")
+        lo = 0
+        for hi in range(620):
+            engine.push(t[hi], x[hi])
+            while hi + 1 - lo > 500:
+                engine.pop()
+                lo += 1
+            if hi % 40 != 39:
+                continue
+
+            expected = mann_kendall(t[lo:hi + 1], x[lo:hi + 1])
+            got = engine.trend()
+            self.assertEqual(got["slope"], expected["slope"])
+            self.assertEqual(got["z"], expected["z"])
+            self.assertEqual(got["tau"], expected["tau"])
+
+        with self.assertRaises(ValueError):
+            _IncrementalWindow(trend_backend="seasonal")
+
+    def test_slopes_released_above_threshold(self):
+        # With a small threshold the window grows past it, slides with Sen's
+        # slope selected around the previous one (through a level shift the
+        # bracket misses), then shrinks until the sorted slopes are rebuilt
+        rng = np.random.default_rng(9)
+        t = np.cumsum(rng.integers(0, 3, 200)) * 86400.0
+        x = np.round(rng.normal(10, 2, 200), 0) + 0.05 * np.arange(200)
+        x[120:] += 8
+
+        with mock.patch.object(rolling, "SEN_DIRECT_PAIRS", 2_000):
+            for append_only in [False, True]:
+                engine = _IncrementalWindow(t_ref=t[0], x_ref=x.mean(), append_only=append_only,
+                                            trend_backend="native")
+                steps = [(1, 0)] * 90 + ([] if append_only else [(1, 1)] * 80 + [(0, 1)] * 50)
+                lo = hi = 0
+                for push, pop in steps:
+                    for _ in range(push):
+                        engine.push(t[hi], x[hi])
+                        hi += 1
+                    for _ in range(pop):
+                        engine.pop()
+                        lo += 1
+                    if hi - lo < 5:
+                        continue
+
+                    expected = mann_kendall(t[lo:hi], x[lo:hi])
+                    got = engine.trend()
+                    self.assertEqual(got["slope"], expected["slope"])
+                    self.assertEqual(got["z"], expected["z"])
+                    self.assertEqual(got["tau"], expected["tau"])
+                # 40 values: 780 pairs, below half the threshold
+                self.assertEqual(engine._slopes is None, append_only)
+
+
+if __name__ == '__main__':
+    unittest.main()
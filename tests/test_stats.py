@@ -6,8 +6,17 @@ from whatts.stats import (
     score_test_probability,
     wilson_score_upper_tolerance,
     wilson_score_interval, # Import the new function
-    calculate_neff_sum_corr
+    wilson_score_interval_array,
+    WH_METHODS,
+    calculate_neff_sum_corr,
+    hazen_z_scores,
+    hazen_cache_info,
+    hazen_cache_clear,
+    inverse_sorted,
+    interpolate_sorted,
+    SELECTION_THRESHOLD
 )
+from scipy.stats import norm
 
 class TestStats(unittest.TestCase):
     def test_hazen_interpolate_and_inverse(self):
@@ -35,6 +44,93 @@ class TestStats(unittest.TestCase):
         self.assertEqual(inverse_hazen(data, -100), 0.0)
         self.assertEqual(inverse_hazen(data, 100), 1.0)
 
+    def test_hazen_interpolate_array_of_ranks(self):
+        rng = np.random.default_rng(2)
+        data = rng.normal(5, 2, 40)
+        # Interior ranks plus both extrapolated tails and the rank clip
+        ranks = np.array([0.0, 0.001, 0.01, 0.25, 0.5, 0.9, 0.99, 0.999, 1.0])
+
+        for min_value, max_value in [(None, None), (3.0, 7.0)]:
+            values, notes = hazen_interpolate(data, ranks, min_value=min_value, max_value=max_value)
+            self.assertEqual(values.shape, ranks.shape)
+            for rank, val, note in zip(ranks, values, notes):
+                self.assertEqual((val, note), hazen_interpolate(data, rank, min_value=min_value,
+                                                                max_value=max_value))
+
+        values, notes = hazen_interpolate(data, ranks, min_value=3.0, max_value=7.0)
+        self.assertEqual(notes[0], "Min Clamped")
+        self.assertEqual(notes[-1], "Max Clamped")
+
+    def test_wilson_score_interval_array_matches_scalar(self):
+        # Covers the small / medium Chi-Square regions, both boundaries and p_hat = 1
+        p_hat = np.array([0.0, 0.02, 0.5, 0.9, 0.95, 0.99, 1.0])[:, None, None, None]
+        n_eff = np.array([3.0, 20.0, 60.0, 90.0, 120.0, 400.0])[None, :, None, None]
+        conf = np.array([0.8, 0.95, 0.99])[None, None, :, None]
+        sides = np.array([1, 2])[None, None, None, :]
+
+        lower, upper, codes = wilson_score_interval_array(p_hat, 100, n_eff, conf, sides)
+        self.assertEqual(lower.shape, (7, 6, 3, 2))
+        for idx in np.ndindex(lower.shape):
+            expected = wilson_score_interval(p_hat[idx[0], 0, 0, 0], 100, n_eff[0, idx[1], 0, 0],
+                                             conf[0, 0, idx[2], 0], sides[0, 0, 0, idx[3]])
+            self.assertEqual((lower[idx], upper[idx], WH_METHODS[codes[idx]]), expected)
+
+    def test_wilson_score_interval_array_scalars(self):
+        # Standard, Chi-Square (both tails) and p_hat = 1 cases with all-scalar inputs
+        for p_hat, n_eff in [(0.95, 100.0), (0.5, 400.0), (0.98, 30.0), (0.03, 30.0), (1.0, 50.0)]:
+            lower, upper, code = wilson_score_interval_array(p_hat, 100, n_eff)
+            self.assertEqual(np.shape(lower), ())
+            self.assertEqual((float(lower), float(upper), WH_METHODS[int(code)]),
+                             wilson_score_interval(p_hat, 100, n_eff))
+
+    def test_neff_fft_matches_direct(self):
+        rng = np.random.default_rng(9)
+        noise = rng.normal(size=1500)
+        persistent = np.empty_like(noise)
+        persistent[0] = noise[0]
+        for i in range(1, len(noise)):
+            persistent[i] = 0.9 * persistent[i - 1] + noise[i]
+
+        for data in [noise, persistent, persistent[:40], 0.01 * np.arange(700) + noise[:700]]:
+            direct = calculate_neff_sum_corr(data, method="direct")
+            self.assertAlmostEqual(calculate_neff_sum_corr(data, method="fft"), direct, places=9)
+            self.assertAlmostEqual(calculate_neff_sum_corr(data), direct, places=9)
+
+        # Short lag loops are unchanged
+        self.assertEqual(calculate_neff_sum_corr(noise), calculate_neff_sum_corr(noise, method="direct"))
+        with self.assertRaises(ValueError):
+            calculate_neff_sum_corr(noise, method="spectral")
+
+    def test_hazen_cache(self):
+        hazen_cache_clear()
+        data = np.arange(37.0)
+        hazen_interpolate(data, 0.95)
+        inverse_hazen(data, 20.5)
+        info = hazen_cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["currsize"]), (1, 1, 1))
+
+        z = hazen_z_scores(37)
+        self.assertIs(z, hazen_z_scores(37))
+        np.testing.assert_array_equal(z, norm.ppf((np.arange(1, 38) - 0.5) / 37))
+        # Shared arrays are read-only
+        with self.assertRaises(ValueError):
+            z[0] = 0.0
+
+    def test_selection_path_matches_sort(self):
+        rng = np.random.default_rng(4)
+        n = SELECTION_THRESHOLD + 7
+        for data in [rng.lognormal(size=n), rng.integers(0, 40, size=n).astype(float)]:
+            data_sorted = np.sort(data)
+            z_scores = norm.ppf((np.arange(1, n + 1) - 0.5) / n)
+            ranks = [0.0, 1e-7, 0.05, 0.5, 0.95, (n - 3.5) / n, 1 - 1e-7, 1.0]
+            for rank in ranks:
+                self.assertEqual(hazen_interpolate(data, rank, max_value=30.0),
+                                 interpolate_sorted(data_sorted, z_scores, rank, max_value=30.0))
+            np.testing.assert_array_equal(hazen_interpolate(data, ranks)[0],
+                                          interpolate_sorted(data_sorted, z_scores, ranks)[0])
+            for value in [-1.0, data_sorted[0], data_sorted[n // 3], 12.5, data_sorted[-1], 1e9]:
+                self.assertEqual(inverse_hazen(data, value), inverse_sorted(data_sorted, value))
+
     def test_wilson_score_upper_tolerance(self):
         # This tests the backward compatibility alias which now only returns the upper limit (float)
         n = 30
@@ -0,0 +1,74 @@
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from whatts import calculate_tolerance_limit, StreamingSeries
+
+
+class TestStreamingSeries(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(17)
+        n = 120
+        dates = pd.date_range("2012-01-01", periods=n, freq="ME")
+        values = 30 + 0.05 * np.arange(n) + np.random.normal(0, 2, n)
+        values[[10, 50]] = np.nan
+        self.df = pd.DataFrame({"Date": dates, "Value": np.round(values, 1)})
+
+    def test_matches_from_scratch_after_each_arrival(self):
+        series = StreamingSeries()
+        for i, (date, value) in enumerate(zip(self.df["Date"], self.df["Value"])):
+            series.append(date, value)
+            if i < 12 or i % 9:
+                continue
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                expected = calculate_tolerance_limit(self.df.iloc[:i + 1], "Date", "Value", regulatory_limit=34)
+                got = series.tolerance_limit(regulatory_limit=34)
+
+            self.assertEqual(series.n, expected["n_raw"])
+            for key in ["point_estimate", "trend_slope", "trend_detected", "p_value", "wh_method_used"]:
+                self.assertEqual(got[key], expected[key], key)
+            for key in ["n_eff", "upper_tolerance_limit", "lower_tolerance_limit", "probability_of_compliance"]:
+                self.assertAlmostEqual(got[key], expected[key], places=9, msg=key)
+            self.assertAlmostEqual(series.probability_of_compliance(34), expected["probability_of_compliance"],
+                                   places=9)
+
+    def test_native_backend_matches_beyond_sampled_pairs(self):
+        # 520 observations (134,940 pairs, above MannKS's 100,000-pair sampling) with repeated values
+        rng = np.random.default_rng(8)
+        dates = pd.date_range("1980-01-01", periods=520, freq="W")
+        values = np.round(20 + 0.01 * np.arange(520) + rng.normal(0, 2, 520), 0)
+        df = pd.DataFrame({"Date": dates, "Value": values})
+
+        series = StreamingSeries.from_dataframe(df, "Date", "Value", trend_backend="native")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = calculate_tolerance_limit(df, "Date", "Value", regulatory_limit=26, trend_backend="native")
+            got = series.tolerance_limit(regulatory_limit=26)
+
+        for key in ["point_estimate", "trend_slope", "trend_detected", "p_value", "wh_method_used"]:
+            self.assertEqual(got[key], expected[key], key)
+        for key in ["n_eff", "upper_tolerance_limit", "probability_of_compliance"]:
+            self.assertAlmostEqual(got[key], expected[key], places=9, msg=key)
+
+        with self.assertRaises(ValueError):
+            StreamingSeries(trend_backend="seasonal")
+
+    def test_from_dataframe_and_options(self):
+        series = StreamingSeries.from_dataframe(self.df, "Date", "Value", use_projection=False, use_neff=False)
+        expected = calculate_tolerance_limit(self.df, "Date", "Value", use_projection=False, use_neff=False)
+        self.assertIsNone(series.trend)
+        self.assertEqual(series.tolerance_limit()["upper_tolerance_limit"], expected["upper_tolerance_limit"])
+
+    def test_rejects_out_of_order_and_small_samples(self):
+        series = StreamingSeries()
+        series.append("2020-02-01", 1.0)
+        with self.assertRaises(ValueError):
+            series.append("2020-01-01", 2.0)
+        with self.assertRaises(ValueError):
+            series.tolerance_limit()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+import MannKS
+from scipy.stats import norm
+from whatts import calculate_tolerance_limit
+from whatts.trend import (mann_kendall, mann_kendall_batch, seasonal_mann_kendall, season_of_year,
+                          count_inversions, theil_sen)
+from whatts.utils import run_trend_test, datetime64_to_seconds
+
+
+def brute_force_inversions(ranks):
+    ranks = np.asarray(ranks)
+    return int(sum(np.sum(ranks[:i] > ranks[i]) for i in range(len(ranks))))
+
+
+def all_slopes(t, x):
+    slopes = []
+    for k in range(1, len(x)):
+        dt = t[k:] - t[:-k]
+        valid = dt > 0
+        slopes.append((x[k:] - x[:-k])[valid] / dt[valid])
+    return np.sort(np.concatenate(slopes))
+
+
+class TestNativeMannKendall(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        n = 150
+        dates = pd.date_range("2010-01-01", periods=n, freq="ME")
+        seasonal = 5 * np.sin(2 * np.pi * np.arange(n) / 12)
+        self.cases = {
+            "linear": (pd.date_range("2023-01-01", periods=10, freq="D"), np.linspace(10, 28, 10)),
+            "trend": (dates, 100 + 0.3 * np.arange(n) + rng.normal(0, 10, n)),
+            "seasonal": (dates, 50 + seasonal + rng.normal(0, 2, n)),
+            "no_trend": (dates[:60], rng.lognormal(3, 0.5, 60)),
+            "down": (dates[:40], 80 - 0.5 * np.arange(40) + rng.normal(0, 3, 40)),
+        }
+        # Repeated values (lab results reported to one decimal place) and equal dates
+        tied_dates = dates.values.copy()
+        tied_dates[[20, 21]] = tied_dates[20]
+        self.tied = (tied_dates, np.round(30 + 0.02 * np.arange(n) + rng.normal(0, 1, n), 0))
+
+    def test_count_inversions(self):
+        rng = np.random.default_rng(0)
+        for n in [0, 1, 2, 3, 8, 33, 64, 129]:
+            ranks = rng.integers(0, max(n // 3, 1), size=n)
+            self.assertEqual(count_inversions(ranks), brute_force_inversions(ranks))
+
+    def test_matches_mannks_without_ties(self):
+        for name, (dates, values) in self.cases.items():
+            t = datetime64_to_seconds(np.asarray(dates))
+            expected = MannKS.trend_test(values, t)
+            got = mann_kendall(t, values)
+            self.assertEqual(got["s"], expected.s, name)
+            self.assertAlmostEqual(got["var_s"], expected.var_s, msg=name)
+            self.assertAlmostEqual(got["tau"], expected.Tau, places=12, msg=name)
+            self.assertAlmostEqual(got["z"], expected.z, places=12, msg=name)
+            self.assertAlmostEqual(got["p_value"], expected.p, places=12, msg=name)
+            self.assertEqual(got["slope"], expected.slope, name)
+
+    def test_tie_corrected_variance(self):
+        dates, values = self.tied
+        t = datetime64_to_seconds(dates)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = MannKS.trend_test(values, t)
+        got = mann_kendall(t, values)
+
+        # S, Tau-b and Sen's slope are unchanged by the correction
+        self.assertEqual(got["s"], expected.s)
+        self.assertAlmostEqual(got["tau"], expected.Tau, places=12)
+        self.assertEqual(got["slope"], expected.slope)
+
+        n = len(values)
+        _, counts = np.unique(values, return_counts=True)
+        var_s = (n * (n - 1) * (2 * n + 5) - np.sum(counts * (counts - 1) * (2 * counts + 5))) / 18.0
+        self.assertAlmostEqual(got["var_s"], var_s)
+        self.assertLess(got["var_s"], expected.var_s)
+        self.assertAlmostEqual(got["z"], (got["s"] - 1) / np.sqrt(var_s))
+
+    def test_theil_sen_selection_is_exact(self):
+        # Over 2^20 pairs, so the interval-shrinking rounds run
+        rng = np.random.default_rng(8)
+        n = 1600
+        t = 1.6e9 + np.arange(n) * 86400.0
+        t[100:104] = t[100]
+        for x in [rng.normal(size=n) + 1e-7 * (t - t[0]), np.round(rng.normal(size=n) * 3 + 0.002 * np.arange(n))]:
+            slopes = all_slopes(t, x)
+            slope, lower, upper = theil_sen(t, x, confidence=0.9)
+            self.assertEqual(slope, np.median(slopes))
+
+            n_slopes = len(slopes)
+            _, counts = np.unique(x, return_counts=True)
+            var_s = (n * (n - 1) * (2 * n + 5) - np.sum(counts * (counts - 1) * (2 * counts + 5))) / 18.0
+            c = norm.ppf(0.95) * np.sqrt(var_s)
+            self.assertEqual(lower, slopes[int(np.round((n_slopes - c) / 2 - 1))])
+            self.assertEqual(upper, slopes[int(np.round((n_slopes + c) / 2 - 1))])
+
+        self.assertTrue(np.isnan(theil_sen(np.zeros(5), np.arange(5.0))))
+
+    def test_theil_sen_bracket_does_not_change_result(self):
+        rng = np.random.default_rng(12)
+        n = 1600
+        t = 1.6e9 + np.arange(n) * 86400.0
+        x = np.round(rng.normal(size=n) * 3 + 0.002 * np.arange(n))
+        slope, lower, upper = theil_sen(t, x, confidence=0.9)
+        self.assertEqual(slope, np.median(all_slopes(t, x)))
+        # Enclosing, narrowly enclosing, missing and empty brackets
+        for bracket in [(slope - 1e-7, slope + 1e-7), (slope - 1e-12, slope + 1e-12), (slope + 1e-7, slope + 2e-7),
+                        (slope + 1e-7, slope - 1e-7), (-np.inf, np.inf)]:
+            self.assertEqual(theil_sen(t, x, confidence=0.9, bracket=bracket), (slope, lower, upper))
+
+    def test_batch_matches_per_site(self):
+        rng = np.random.default_rng(4)
+        t = datetime64_to_seconds(pd.date_range("2005-01-01", periods=90, freq="ME").values)
+        values = np.round(rng.normal(size=(25, 90)) + 2e-9 * (t - t[0]), 1)
+        values[rng.random(values.shape) < 0.2] = np.nan
+        values[3] = np.nan
+        values[4, 1:] = np.nan
+
+        # A small block bound forces several blocks of sites; below one site's
+        # 4,005 pairs, sites are taken one at a time by selection
+        for max_block_elements in [10_000, 1_000]:
+            got = mann_kendall_batch(t, values, max_block_elements=max_block_elements)
+            for i, row in enumerate(values):
+                observed = ~np.isnan(row)
+                self.assertEqual(got["n"][i], observed.sum())
+                if observed.sum() < 2:
+                    self.assertTrue(np.isnan(got["slope"][i]))
+                    self.assertEqual(got["p_value"][i], 1.0)
+                    continue
+                expected = mann_kendall(t[observed], row[observed])
+                for key, value in expected.items():
+                    self.assertEqual(got[key][i], value, f"{key} (site {i}, bound {max_block_elements})")
+
+        with self.assertRaises(ValueError):
+            mann_kendall_batch(t[::-1], values)
+
+    def test_seasonal_matches_mannks(self):
+        dates, values = self.cases["seasonal"]
+        # Drop a few samples so the seasons have different sizes
+        dates, values = dates.delete([5, 17, 40]), np.delete(values, [5, 17, 40])
+        t = datetime64_to_seconds(dates.values)
+        expected = MannKS.seasonal_trend_test(values, dates.values, period=12)
+        got = seasonal_mann_kendall(t, values, 12)
+        self.assertEqual(got["s"], expected.s)
+        self.assertAlmostEqual(got["var_s"], expected.var_s)
+        self.assertAlmostEqual(got["tau"], expected.Tau, places=12)
+        self.assertAlmostEqual(got["z"], expected.z, places=12)
+        self.assertEqual(got["slope"], expected.slope_per_second)
+
+    def test_season_of_year(self):
+        t = datetime64_to_seconds(pd.date_range("2001-01-01", periods=24, freq="MS").values)
+        np.testing.assert_array_equal(season_of_year(t, 12), np.tile(np.arange(12), 2))
+        np.testing.assert_array_equal(season_of_year(t, 4), np.tile(np.repeat(np.arange(4), 3), 2))
+        weeks = datetime64_to_seconds(pd.to_datetime(["2001-01-01", "2001-01-09", "2001-12-31"]).values)
+        np.testing.assert_array_equal(season_of_year(weeks, 52), [0, 1, 51])
+        with self.assertRaises(ValueError):
+            season_of_year(t, 0)
+
+    def test_backend_option(self):
+        dates, values = self.cases["trend"]
+        df = pd.DataFrame({"Date": dates, "Value": values})
+        default = calculate_tolerance_limit(df, "Date", "Value", regulatory_limit=150)
+        native = calculate_tolerance_limit(df, "Date", "Value", regulatory_limit=150, trend_backend="native")
+        for key in ["trend_slope", "tau", "p_value", "upper_tolerance_limit", "probability_of_compliance"]:
+            self.assertAlmostEqual(native[key], default[key], places=10, msg=key)
+
+        with self.assertRaises(ValueError):
+            run_trend_test(datetime64_to_seconds(dates.values), values, backend="fortran")
+
+        seasonal = calculate_tolerance_limit(df, "Date", "Value", regulatory_limit=150,
+                                             trend_backend="seasonal", seasonal_period=12)
+        expected = seasonal_mann_kendall(datetime64_to_seconds(dates.values), values, 12)
+        self.assertEqual(seasonal["trend_slope"], expected["slope"])
+        self.assertEqual(seasonal["tau"], expected["tau"])
+        with self.assertRaises(ValueError):
+            calculate_tolerance_limit(df, "Date", "Value", trend_backend="seasonal")
+
+
+if __name__ == "__main__":
+    unittest.main()